@@ -0,0 +1,246 @@
+// Package CSR_IP_Map_pkg - Automatically generated in 2026-10-16 22:36:15
+// Typedef structures for CSR interface
+
+package CSR_IP_Map_pkg;
+
+    // Enum definitions
+    typedef enum logic [1:0] {
+        v_100Hz = 0,
+        v_500Hz = 1
+    } ctrl_prescaler_e;
+
+    typedef enum logic [1:0] {
+        Mode_A = 0,
+        Mode_B = 1
+    } ctrl_mode_e;
+
+    typedef enum logic [1:0] {
+        Inter = 0,
+        NoInter = 1
+    } intctrl_intlvl_e;
+
+    typedef enum logic [1:0] {
+        Idle = 0,
+        Run = 1,
+        Sleep = 2
+    } ctrl2_mode2_e;
+
+    typedef enum logic [1:0] {
+        Low = 0,
+        Med = 1,
+        High = 2
+    } ctrl2_priority2_e;
+
+    // Input structures (Hardware -> Register)
+    typedef struct {
+        logic next;
+        logic we;
+    } CSR_IP_Map__ctrl__master__in_t;
+
+    typedef struct {
+        logic next;
+        logic we;
+    } CSR_IP_Map__status__wrcol__in_t;
+
+    typedef struct {
+        logic next;
+        logic we;
+    } CSR_IP_Map__status__if_field__in_t;
+
+    typedef struct {
+        logic [8:0] next;
+        logic we;
+    } CSR_IP_Map__data__rdata__in_t;
+
+    typedef struct {
+        logic next;
+        logic we;
+    } CSR_IP_Map__ctrl2__resetn__in_t;
+
+    typedef struct {
+        logic next;
+        logic we;
+    } CSR_IP_Map__stat2__err__in_t;
+
+    typedef struct {
+        logic next;
+        logic we;
+    } CSR_IP_Map__stat2__ready__in_t;
+
+    typedef struct {
+        logic [15:0] next;
+        logic we;
+    } CSR_IP_Map__data2__out__in_t;
+
+    typedef struct {
+        CSR_IP_Map__ctrl__master__in_t master;
+    } CSR_IP_Map__ctrl__in_t;
+
+    typedef struct {
+        CSR_IP_Map__status__wrcol__in_t wrcol;
+        CSR_IP_Map__status__if_field__in_t if_field;
+    } CSR_IP_Map__status__in_t;
+
+    typedef struct {
+        CSR_IP_Map__data__rdata__in_t rdata;
+    } CSR_IP_Map__data__in_t;
+
+    typedef struct {
+        CSR_IP_Map__ctrl2__resetn__in_t resetn;
+    } CSR_IP_Map__ctrl2__in_t;
+
+    typedef struct {
+        CSR_IP_Map__stat2__err__in_t err;
+        CSR_IP_Map__stat2__ready__in_t ready;
+    } CSR_IP_Map__stat2__in_t;
+
+    typedef struct {
+        CSR_IP_Map__data2__out__in_t out;
+    } CSR_IP_Map__data2__in_t;
+
+    typedef struct {
+        CSR_IP_Map__ctrl__in_t ctrl;
+        CSR_IP_Map__status__in_t status;
+        CSR_IP_Map__data__in_t data;
+        CSR_IP_Map__ctrl2__in_t ctrl2;
+        CSR_IP_Map__stat2__in_t stat2;
+        CSR_IP_Map__data2__in_t data2;
+    } CSR_IP_Map__in_t;
+
+    // Output structures (Register -> Hardware)
+    typedef struct {
+        ctrl_prescaler_e value;
+    } CSR_IP_Map__ctrl__prescaler__out_t;
+
+    typedef struct {
+        ctrl_mode_e value;
+    } CSR_IP_Map__ctrl__mode__out_t;
+
+    typedef struct {
+        logic value;
+    } CSR_IP_Map__ctrl__master__out_t;
+
+    typedef struct {
+        logic value;
+    } CSR_IP_Map__ctrl__dord__out_t;
+
+    typedef struct {
+        logic value;
+    } CSR_IP_Map__ctrl__enable__out_t;
+
+    typedef struct {
+        logic value;
+    } CSR_IP_Map__ctrl__clk2x__out_t;
+
+    typedef struct {
+        intctrl_intlvl_e value;
+    } CSR_IP_Map__intctrl__intlvl__out_t;
+
+    typedef struct {
+        logic value;
+    } CSR_IP_Map__status__wrcol__out_t;
+
+    typedef struct {
+        logic value;
+    } CSR_IP_Map__status__if_field__out_t;
+
+    typedef struct {
+        logic [8:0] value;
+    } CSR_IP_Map__data__wdata__out_t;
+
+    typedef struct {
+        logic [8:0] value;
+    } CSR_IP_Map__data__rdata__out_t;
+
+    typedef struct {
+        ctrl2_mode2_e value;
+    } CSR_IP_Map__ctrl2__mode2__out_t;
+
+    typedef struct {
+        ctrl2_priority2_e value;
+    } CSR_IP_Map__ctrl2__priority2__out_t;
+
+    typedef struct {
+        logic value;
+    } CSR_IP_Map__ctrl2__enable2__out_t;
+
+    typedef struct {
+        logic value;
+    } CSR_IP_Map__ctrl2__resetn__out_t;
+
+    typedef struct {
+        logic [7:0] value;
+    } CSR_IP_Map__cfg__clockdiv__out_t;
+
+    typedef struct {
+        logic value;
+    } CSR_IP_Map__stat2__err__out_t;
+
+    typedef struct {
+        logic value;
+    } CSR_IP_Map__stat2__ready__out_t;
+
+    typedef struct {
+        logic [15:0] value;
+    } CSR_IP_Map__data2__in__out_t;
+
+    typedef struct {
+        logic [15:0] value;
+    } CSR_IP_Map__data2__out__out_t;
+
+    typedef struct {
+        CSR_IP_Map__ctrl__prescaler__out_t prescaler;
+        CSR_IP_Map__ctrl__mode__out_t mode;
+        CSR_IP_Map__ctrl__master__out_t master;
+        CSR_IP_Map__ctrl__dord__out_t dord;
+        CSR_IP_Map__ctrl__enable__out_t enable;
+        CSR_IP_Map__ctrl__clk2x__out_t clk2x;
+    } CSR_IP_Map__ctrl__out_t;
+
+    typedef struct {
+        CSR_IP_Map__intctrl__intlvl__out_t intlvl;
+    } CSR_IP_Map__intctrl__out_t;
+
+    typedef struct {
+        CSR_IP_Map__status__wrcol__out_t wrcol;
+        CSR_IP_Map__status__if_field__out_t if_field;
+    } CSR_IP_Map__status__out_t;
+
+    typedef struct {
+        CSR_IP_Map__data__wdata__out_t wdata;
+        CSR_IP_Map__data__rdata__out_t rdata;
+    } CSR_IP_Map__data__out_t;
+
+    typedef struct {
+        CSR_IP_Map__ctrl2__mode2__out_t mode2;
+        CSR_IP_Map__ctrl2__priority2__out_t priority2;
+        CSR_IP_Map__ctrl2__enable2__out_t enable2;
+        CSR_IP_Map__ctrl2__resetn__out_t resetn;
+    } CSR_IP_Map__ctrl2__out_t;
+
+    typedef struct {
+        CSR_IP_Map__cfg__clockdiv__out_t clockdiv;
+    } CSR_IP_Map__cfg__out_t;
+
+    typedef struct {
+        CSR_IP_Map__stat2__err__out_t err;
+        CSR_IP_Map__stat2__ready__out_t ready;
+    } CSR_IP_Map__stat2__out_t;
+
+    typedef struct {
+        CSR_IP_Map__data2__in__out_t in;
+        CSR_IP_Map__data2__out__out_t out;
+    } CSR_IP_Map__data2__out_t;
+
+    typedef struct {
+        CSR_IP_Map__ctrl__out_t ctrl;
+        CSR_IP_Map__intctrl__out_t intctrl;
+        CSR_IP_Map__status__out_t status;
+        CSR_IP_Map__data__out_t data;
+        CSR_IP_Map__ctrl2__out_t ctrl2;
+        CSR_IP_Map__cfg__out_t cfg;
+        CSR_IP_Map__stat2__out_t stat2;
+        CSR_IP_Map__data2__out_t data2;
+    } CSR_IP_Map__out_t;
+
+endpackage
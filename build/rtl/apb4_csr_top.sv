@@ -0,0 +1,96 @@
+//------------------------------------------------------------------------------
+// Module: apb4_csr_top
+// Description: Top-level module for APB4 CSR interface
+// Generated automatically by Python script
+//------------------------------------------------------------------------------
+ 
+module apb4_csr_top #(
+    parameter DATA_WIDTH = 32,
+    parameter ADDR_WIDTH = 8,
+    parameter CSR_ADDR_WIDTH = 6
+) (
+    input wire clk,
+    input wire rst,
+    
+    // APB4 Interface
+    Bus2Master_intf apb42Master_intf,
+    
+    // Hardware Interface
+    input  CSR_IP_Map__in_t  hwif_in,
+    output CSR_IP_Map__out_t hwif_out
+);
+ 
+    //--------------------------------------------------------------------------
+    // Local Parameters
+    //--------------------------------------------------------------------------
+    localparam P_DATA_WIDTH = DATA_WIDTH;
+    localparam P_DMEM_ADDR_WIDTH = ADDR_WIDTH;
+    localparam P_CSR_ADDR_WIDTH = CSR_ADDR_WIDTH;
+ 
+    //--------------------------------------------------------------------------
+    // Bus Interface Instance
+    //--------------------------------------------------------------------------
+    Bus2Reg_intf #(
+        .DATA_WIDTH(P_DATA_WIDTH),
+        .ADDR_WIDTH(P_DMEM_ADDR_WIDTH)
+    ) apb42Reg_intf (
+        .clk(clk),
+        .rst(rst)
+    );
+ 
+    //--------------------------------------------------------------------------
+    // APB4 Slave Instance
+    //--------------------------------------------------------------------------
+    apb4_slave #(
+        .ADDR_WIDTH(ADDR_WIDTH),
+        .DATA_WIDTH(DATA_WIDTH)
+    ) u_apb4_slave (
+        // APB4 Interface
+        .s_apb4(apb42Master_intf),
+        
+        // Internal Bus Interface
+        .intf(apb42Reg_intf.BUS)
+    );
+ 
+    //--------------------------------------------------------------------------
+    // CSR_IP_Map Instance
+    //--------------------------------------------------------------------------
+    CSR_IP_Map u_csr_ip_map (
+        // Bus Interface
+        .intf(apb42Reg_intf.REG_MAP),
+        
+        // Hardware Interface
+        .hwif_in(hwif_in),
+        .hwif_out(hwif_out)
+    );
+ 
+    //--------------------------------------------------------------------------
+    // Assertions and Coverage (optional)
+    //--------------------------------------------------------------------------
+    `ifdef ASSERT_ON
+        // Add assertions here for verification
+        initial begin
+            assert (DATA_WIDTH >= 8) else $error("DATA_WIDTH must be >= 8");
+            assert (ADDR_WIDTH >= 3) else $error("ADDR_WIDTH must be >= 3");
+            assert (CSR_ADDR_WIDTH >= 3) else $error("CSR_ADDR_WIDTH must be >= 3");
+        end
+    `endif
+
+
+    //--------------------------------------------------------------------------
+    // Monitoring using interface
+    //--------------------------------------------------------------------------
+    /*
+    initial begin
+        $timeformat(-9, 0, " ns", 6);
+        forever begin
+            @(posedge clk);
+            apb42Reg_intf.display_transaction();
+        end
+    end
+    */
+endmodule
+ 
+//------------------------------------------------------------------------------
+// End of apb4_csr_top
+//------------------------------------------------------------------------------
\ No newline at end of file
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Run the pipeline of several LaTeX specs in parallel.
+
+Each spec gets its own output root (<output-root>/<name>, with the csv,
+ipxact, rtl and .cache dirs of pipeline.py) and runs in a worker process,
+so the specs of a SoC are generated on all cores. The log of each spec is
+written to <output-root>/<name>/pipeline.log and a timing table is printed
+when every spec is done.
+
+With --shared-enums the enum types of every spec are collected first; the
+types used by several specs are declared once in a shared package,
+<output-root>/csr_types_pkg.sv, that the packages of the specs refer to.
+"""
+import io
+import os
+import sys
+import time
+import contextlib
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from pipeline import run_pipeline, load_component, STAGES
+from tools.instrument import set_quiet
+from tools.enum_library import DEFAULT_PACKAGE, build_enum_library, library_savings, write_enum_library
+
+
+LOG_NAME = "pipeline.log"
+
+
+def read_spec_list(list_file):
+    """Spec files listed in `list_file`, one per line, relative to it; blank lines and # comments are skipped"""
+    list_file = Path(list_file)
+    specs = []
+    with open(list_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                specs.append(list_file.parent / line)
+    return specs
+
+
+def output_names(specs):
+    """
+    Name of the output root of each spec
+
+    The stem of the spec file, prefixed with the name of its directory when
+    two specs share a stem (chiplet_a/ipMap.tex, chiplet_b/ipMap.tex), and
+    suffixed with its position when that is still not enough.
+    """
+    specs = [Path(spec).resolve() for spec in specs]
+    names = [spec.stem for spec in specs]
+    names = [f"{spec.parent.name}_{name}" if names.count(name) > 1 else name
+             for spec, name in zip(specs, names)]
+    return [f"{name}_{i}" if names.count(name) > 1 else name for i, name in enumerate(names)]
+
+
+def _run_spec(task):
+    """Worker: run the pipeline of one spec with its log written to its output root"""
+    tex_file, output_dir, quiet, options = task
+    set_quiet(quiet)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    log = io.StringIO()
+    start = time.perf_counter()
+    error = None
+    try:
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            timings = run_pipeline(tex_file, output_dir, **options)
+        if timings is None:
+            error = "generation failed"
+    except (OSError, ValueError) as e:
+        timings, error = None, str(e)
+    elapsed = time.perf_counter() - start
+    with open(output_dir / LOG_NAME, 'w', encoding='utf-8') as f:
+        f.write(log.getvalue())
+    return timings, elapsed, error
+
+
+def _scan_enums(task):
+    """Worker: enum types of one spec, none if it cannot be read (its pipeline run reports why)"""
+    spec, bus_width, multirow_columns = task
+    set_quiet(True)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            component, _ = load_component(spec, bus_width, multirow_columns)
+    except (OSError, ValueError):
+        return {}
+    return component.enums
+
+
+def _map(function, tasks, jobs):
+    """[function(task) for task in tasks], on `jobs` worker processes (0 for one per CPU)"""
+    workers = min(jobs or os.cpu_count() or 1, len(tasks))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(function, tasks))
+    return [function(task) for task in tasks]
+
+
+def shared_enums(specs, output_root="build", jobs=0, package=DEFAULT_PACKAGE, bus_width=32, multirow_columns=None):
+    """
+    Library of the enum types used by several specs, written to
+    <output_root>/<package>.sv; pass it to run_batch as `enum_library`.
+
+    Returns:
+        (EnumLibrary, savings): savings as tools.enum_library.library_savings
+    """
+    enum_sets = _map(_scan_enums, [(str(spec), bus_width, multirow_columns) for spec in specs], jobs)
+    library = build_enum_library(enum_sets, package)
+    write_enum_library(library, Path(output_root).resolve())
+    return library, library_savings(library, enum_sets)
+
+
+def run_batch(specs, output_root="build", jobs=0, quiet=False, **options):
+    """
+    Run the pipeline of every spec, each in its own output root
+
+    Args:
+        specs : root LaTeX files
+        output_root : the outputs of a spec go to <output_root>/<name>,
+                      see output_names
+        jobs : worker processes, 0 for one per CPU
+        quiet : leave the per-row and per-file messages out of the logs
+        options : keyword arguments of run_pipeline
+
+    Returns:
+        list of (spec, output dir, timings, seconds, error) in the order of
+        `specs`; timings is None and error set when the spec failed
+    """
+    output_root = Path(output_root).resolve()
+    output_dirs = [output_root / name for name in output_names(specs)]
+    tasks = [(str(spec), str(output_dir), quiet, options) for spec, output_dir in zip(specs, output_dirs)]
+
+    results = _map(_run_spec, tasks, jobs)
+    return [(spec, output_dir, *result) for spec, output_dir, result in zip(specs, output_dirs, results)]
+
+
+def _format_report(results):
+    """Table of the total and per-stage time of each spec"""
+    header = ["spec", "total"] + list(STAGES)
+    rows = []
+    for spec, _, timings, elapsed, error in results:
+        row = [str(spec), f"{elapsed * 1000:.1f}ms"]
+        if error is not None:
+            row.append(f"❌ {error}")
+        else:
+            row += ["-" if stage not in timings else
+                    "cached" if timings[stage][1] else f"{timings[stage][0] * 1000:.1f}ms"
+                    for stage in STAGES]
+        rows.append(row)
+    # a failed spec has a single message cell after its total, left out of the widths
+    widths = [max(len(row[i]) for row in [header] + rows if len(row) == len(header) or i < 2)
+              for i in range(len(header))]
+    return "\n".join("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+                     for row in [header] + rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate the CSR RTL of several LaTeX specs in parallel')
+    parser.add_argument('specs', nargs='*', help='root LaTeX files')
+    parser.add_argument('-l', '--list', metavar='FILE',
+                        help='file listing root LaTeX files, one per line, relative to it')
+    parser.add_argument('-o', '--output-root', default='build',
+                        help='the outputs of each spec go to <output-root>/<spec name> (default: build)')
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help='worker processes, 0 for one per CPU (default: 0)')
+    parser.add_argument('-b', '--bus-width', type=int, default=32, help='bus width (default: 32)')
+    parser.add_argument('-a', '--addr-width', type=int, default=3, help='address width (default: 3)')
+    parser.add_argument('-p', '--bus', choices=['apb4', 'axi4lite'], default='apb4',
+                        help='bus protocol (default: apb4)')
+    parser.add_argument('--multirow-columns', type=int, nargs='+', metavar='COL',
+                        help='0-based columns whose \\multirow values are carried down (default: all)')
+    parser.add_argument('--write-csv', action='store_true', help='also write the CSV intermediates')
+    parser.add_argument('--write-ipxact', action='store_true', help='also write the IP-XACT intermediate')
+    parser.add_argument('--write-db', action='store_true', help='also write the SQLite register database')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='run every stage, without reading or filling the .cache of each output root')
+    parser.add_argument('--shared-enums', nargs='?', const=DEFAULT_PACKAGE, metavar='PACKAGE',
+                        help='declare the enum types used by several specs once, in <output-root>/PACKAGE.sv '
+                             f'(default: {DEFAULT_PACKAGE})')
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='leave the per-row and per-file messages out of the logs')
+
+    args = parser.parse_args()
+
+    specs = [Path(spec) for spec in args.specs]
+    if args.list:
+        try:
+            specs += read_spec_list(args.list)
+        except OSError as e:
+            print(f"❌ Error: {e}")
+            return 1
+    if not specs:
+        parser.error("no spec given")
+
+    start = time.perf_counter()
+    library = savings = None
+    if args.shared_enums:
+        try:
+            library, savings = shared_enums(specs, args.output_root, args.jobs, args.shared_enums,
+                                            args.bus_width, args.multirow_columns)
+        except OSError as e:
+            print(f"❌ Error: {e}")
+            return 1
+    results = run_batch(specs, args.output_root, args.jobs, args.quiet, bus_width=args.bus_width,
+                        addr_width=args.addr_width, bus_protocol=args.bus,
+                        multirow_columns=args.multirow_columns, write_csv=args.write_csv,
+                        write_ipxact=args.write_ipxact, write_db=args.write_db, use_cache=not args.no_cache,
+                        enum_library=library)
+    elapsed = time.perf_counter() - start
+
+    print(_format_report(results))
+    if library is not None:
+        print(f"\n{savings['types']} enum type(s) shared in {library.package}: "
+              f"{savings['declarations']} -> {savings['declarations_shared']} enum declarations to elaborate, "
+              f"{savings['bytes'] / 1024:.1f} -> {savings['bytes_shared'] / 1024:.1f} KiB of enum declarations")
+    failed = sum(1 for result in results if result[4] is not None)
+    print(f"\n{len(results) - failed}/{len(results)} specs generated in {elapsed:.2f}s "
+          f"(sum of spec times {sum(result[3] for result in results):.2f}s), logs in <output root>/{LOG_NAME}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the register generation pipeline.
+
+Each sub-command builds a synthetic input of increasing size, times one
+stage of the pipeline and prints the cost per element so that scaling
+regressions are easy to spot.
+"""
+import io
+import re
+import os
+import sys
+import csv
+import json
+import time
+import platform
+import subprocess
+import random
+import tempfile
+import contextlib
+import tracemalloc
+import xml.etree.ElementTree as ET
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from tools.latex_parser import LatexSpec, build_table_index, extract_table_with_label, iter_table_rows
+from tools.ipxact_builder import IPXACT2022Generator
+from tools.register_db import RegisterDB, export_component
+from latex2csv import iter_csv_rows, process_latex_tables
+from csv2ipxact import build_ipxact, build_component, convert_all_csv_to_ipxact
+from ipxact2rtl import parse_ipxact, parse_ipxact_component, generate_package, generate_module, generate_rtl
+import gen_spec
+from gen_spec import SpecShape
+
+
+def _synthetic_body(n_rows: int) -> str:
+    """Return the tabular body of a register table laid out as src/ipMap.tex"""
+    rows = [
+        "\\textbf{Register} & \\textbf{Offset} & \\textbf{Field} & \\textbf{Bits} & "
+        "\\textbf{Access\\_Policy} & \\textbf{Volatile} & \\textbf{reset} & "
+        "\\textbf{Description} & \\textbf{Enum Values} \\\\ \\hline"
+    ]
+    for i in range(n_rows):
+        rows.append(
+            f"\\multirow{{1}}{{*}}{{REG{i}}} & \\multirow{{1}}{{*}}{{0x{4 * i:04X}}} & "
+            f"FIELD{i} & [7:0] & RW & false & 'h0 & \\textbf{{\\texttt{{Field}}}} {i} & 0:Off; 1:On \\\\ \\hline"
+        )
+    return "\n".join(rows) + "\n"
+
+
+def _synthetic_table(label: str, n_rows: int) -> str:
+    """Return a LaTeX register table in the same layout as src/ipMap.tex"""
+    return (
+        "\\begin{table}[h]\n"
+        "\\centering\n"
+        f"\\caption{{tabela {label}}}\n"
+        f"\\label{{table:{label}}}\n"
+        "\\begin{tabular}{|l|l|l|l|l|l|l|l|l|}\n"
+        "\\hline\n" + _synthetic_body(n_rows) +
+        "\\end{tabular}\n"
+        "\\end{table}\n"
+    )
+
+
+def _synthetic_document(n_tables: int, n_rows: int) -> tuple[str, list[str]]:
+    labels = [f"IP-{i}" for i in range(n_tables)]
+    body = "\n".join(_synthetic_table(label, n_rows) for label in labels)
+    doc = "\\documentclass{article}\n\\begin{document}\n" + body + "\\end{document}\n"
+    return doc, [f"table:{label}" for label in labels]
+
+
+def _legacy_lookup(latex_content: str, target_label: str) -> str | None:
+    """Per-label regex scan used before the label index existed."""
+    pattern = (
+        r'\\begin{table}.*?'
+        r'\\label{' + re.escape(target_label) + r'}.*?'
+        r'\\begin{tabular}\{[^}]*\}'
+        r'(.*?)'
+        r'\\end{tabular}.*?'
+        r'\\end{table}'
+    )
+    match = re.search(pattern, latex_content, re.DOTALL)
+    return match.group(1) if match else None
+
+
+def bench_label_index(args) -> None:
+    """Time label lookups for every table of documents of growing size."""
+    print(f"{'tables':>8} {'doc KiB':>9} {'index s':>10} {'us/table':>10}"
+          + (f" {'legacy s':>10} {'us/table':>10}" if args.legacy else ""))
+
+    for n_tables in args.sizes:
+        doc, labels = _synthetic_document(n_tables, args.rows)
+
+        start = time.perf_counter()
+        index = build_table_index(doc)
+        for label in labels:
+            extract_table_with_label(doc, label, index)
+        elapsed = time.perf_counter() - start
+
+        line = (f"{n_tables:>8} {len(doc) / 1024:>9.1f} {elapsed:>10.4f} "
+                f"{elapsed / n_tables * 1e6:>10.1f}")
+
+        if args.legacy:
+            start = time.perf_counter()
+            for label in labels:
+                _legacy_lookup(doc, label)
+            legacy = time.perf_counter() - start
+            line += f" {legacy:>10.4f} {legacy / n_tables * 1e6:>10.1f}"
+
+        print(line)
+
+
+def bench_rows(args) -> None:
+    """Throughput of the row tokenizer alone and feeding the CSV writer."""
+    body = _synthetic_body(args.rows)
+    print(f"table: {args.rows} rows, {len(body) / 1024:.1f} KiB")
+
+    start = time.perf_counter()
+    count = sum(1 for _ in iter_table_rows(body))
+    elapsed = time.perf_counter() - start
+    print(f"  tokenizer:        {count:>8} rows in {elapsed:.3f}s  ({count / elapsed:,.0f} rows/s)")
+
+    start = time.perf_counter()
+    writer = csv.writer(io.StringIO())
+    count = 0
+    for row in iter_csv_rows(body):
+        writer.writerow(row)
+        count += 1
+    elapsed = time.perf_counter() - start
+    print(f"  tokenizer + csv:  {count:>8} rows in {elapsed:.3f}s  ({count / elapsed:,.0f} rows/s)")
+
+
+def _model_shape(args) -> SpecShape:
+    """Synthetic map of about `args.fields` fields"""
+    ips = max(1, args.fields // (args.regs * args.fields_per_reg))
+    return SpecShape(ips, args.regs, args.fields_per_reg)
+
+
+def _qualify_tags(root: ET.Element) -> ET.Element:
+    """
+    Rewrite the `ipxact:tag` names of a tree built by IPXACT2022Generator
+    to the `{namespace}tag` form that ET.parse returns, so that
+    parse_ipxact_component can take the tree straight from memory. The
+    tree is modified in place.
+    """
+    prefixes = {f"{prefix}:": f"{{{uri}}}" for prefix, uri in IPXACT2022Generator().namespaces.items()}
+    for elem in root.iter():
+        prefix, sep, local = elem.tag.partition(':')
+        if sep:
+            elem.tag = prefixes.get(prefix + sep, prefix + sep) + local
+    return root
+
+
+def bench_model(args) -> None:
+    """Memory of the register model and RTL emit time for a component of `--fields` fields."""
+    shape = _model_shape(args)
+    instances = gen_spec.instances(shape)
+    load = lambda ip: gen_spec.register_data(shape, ip)
+    n_fields = len(instances) * args.regs * args.fields_per_reg
+    print(f"component: {len(instances)} IPs, {len(instances) * args.regs} registers, {n_fields} fields")
+
+    root = _qualify_tags(_quiet(build_ipxact, instances, load, "32"))
+
+    start = time.perf_counter()
+    component = parse_ipxact_component(root)
+    elapsed = time.perf_counter() - start
+    del component
+    # a second parse under tracemalloc, which slows allocations down
+    tracemalloc.start()
+    component = parse_ipxact_component(root)
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  parse IP-XACT:   {elapsed:8.3f}s  model {size / 2**20:8.1f} MiB  "
+          f"({size / n_fields:.0f} B/field)  peak {peak / 2**20:8.1f} MiB")
+    del root
+
+    start = time.perf_counter()
+    _quiet(build_component, instances, load, "32")
+    elapsed = time.perf_counter() - start
+    print(f"  build from CSV:  {elapsed:8.3f}s")
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        ok = _quiet(generate_package, component, output_dir) and _quiet(generate_module, component, output_dir)
+        elapsed = time.perf_counter() - start
+        size = sum(p.stat().st_size for p in Path(output_dir).iterdir())
+    if not ok:
+        print("  emit failed")
+        return
+    print(f"  emit RTL:        {elapsed:8.3f}s  {size / 2**20:8.1f} MiB  ({n_fields / elapsed:,.0f} fields/s)")
+
+
+def bench_emit(args) -> None:
+    """RTL emit throughput, in fields per second, for a component of `--fields` fields."""
+    shape = _model_shape(args)
+    instances = gen_spec.instances(shape)
+    component = _quiet(build_component, instances, lambda ip: gen_spec.register_data(shape, ip), "32")
+    n_fields = sum(len(reg.fields) for reg in component.registers.values())
+    print(f"component: {len(component.blocks)} IPs, {len(component.registers)} registers, {n_fields} fields")
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        serial = 0.0
+        for name, func in (('package', generate_package), ('module', generate_module)):
+            times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                if not _quiet(func, component, output_dir):
+                    print(f"  {name} failed")
+                    return
+                times.append(time.perf_counter() - start)
+            best = min(times)
+            serial += best
+            file_name = f"{component.name}_pkg.sv" if name == 'package' else f"{component.name}.sv"
+            size = (Path(output_dir) / file_name).stat().st_size
+            line = (f"  {name:<8} {best:8.3f}s  {size / 2**20:8.1f} MiB  {n_fields / best:>10,.0f} fields/s  "
+                    f"{size / 2**20 / best:6.1f} MiB/s")
+            if not args.no_memory:
+                _, _, peak = _measure(True, func, component, output_dir)
+                line += f"  peak {peak / 2**20:6.1f} MiB"
+            print(line)
+
+        if args.jobs != 1:
+            # both files, the address blocks spread over the worker processes
+            times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                if not _quiet(generate_rtl, component, output_dir, None, args.jobs):
+                    print("  parallel emit failed")
+                    return
+                times.append(time.perf_counter() - start)
+            best = min(times)
+            print(f"  both -j{args.jobs:<3} {best:8.3f}s  {n_fields / best:>26,.0f} fields/s  "
+                  f"x{serial / best:.2f} over one process")
+
+
+def bench_regdb(args) -> None:
+    """Export time and lookup latency of the SQLite register database for `--fields` fields."""
+    shape = _model_shape(args)
+    instances = gen_spec.instances(shape)
+    load = lambda ip: gen_spec.register_data(shape, ip)
+    component = _quiet(build_component, instances, load, "32")
+    registers = [(block.name, reg) for block in component.blocks for reg in block.registers]
+    n_fields = sum(len(reg.fields) for _, reg in registers)
+    print(f"component: {len(component.blocks)} IPs, {len(registers)} registers, {n_fields} fields")
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        db_file = Path(output_dir) / "ipMap.db"
+        start = time.perf_counter()
+        export_component(component, db_file)
+        elapsed = time.perf_counter() - start
+        print(f"  export:          {elapsed:8.3f}s  {db_file.stat().st_size / 2**20:8.1f} MiB")
+        del component
+
+        rng = random.Random(0)
+        samples = [rng.choice(registers) for _ in range(args.lookups)]
+        with RegisterDB(db_file) as db:
+            queries = [
+                ("fields_at(addr)", lambda s: db.fields_at(s[1].address)),
+                ("fields_at(addr[b])", lambda s: db.fields_at(s[1].address, next(iter(s[1].fields.values())).bit_offset)),
+                ("field(path)", lambda s: db.field(f"{s[0]}.{s[1].name}.{next(iter(s[1].fields))}")),
+            ]
+            for name, query in queries:
+                times = []
+                for sample in samples:
+                    start = time.perf_counter()
+                    found = query(sample)
+                    times.append(time.perf_counter() - start)
+                    if not found:
+                        print(f"  {name}: no result for {sample[0]}.{sample[1].name}")
+                        return
+                times.sort()
+                print(f"  {name:<18} median {times[len(times) // 2] * 1e6:7.1f}us  "
+                      f"p99 {times[int(len(times) * 0.99)] * 1e6:7.1f}us  ({len(times)} lookups)")
+
+
+# Stages timed by the `stages` sub-command, in pipeline order
+STAGE_NAMES = ('process_latex_tables', 'convert_all_csv_to_ipxact', 'parse_ipxact',
+               'generate_package', 'generate_module')
+RESULTS_VERSION = 1
+
+
+def _latex_to_csv(tex_file, csv_dir):
+    with LatexSpec(tex_file) as spec:
+        return process_latex_tables(spec, str(csv_dir), incremental=False)
+
+
+def _measure(memory, func, *args):
+    """
+    (result, seconds, peak bytes) of a call with its output silenced. The
+    peak comes from a second call under tracemalloc, which slows the
+    allocations down; it is None when `memory` is off.
+    """
+    start = time.perf_counter()
+    result = _quiet(func, *args)
+    elapsed = time.perf_counter() - start
+    peak = None
+    if memory:
+        tracemalloc.start()
+        _quiet(func, *args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_stages(args) -> None:
+    """Time and peak memory of each stage for maps of `--sizes` IPs; results saved as JSON."""
+    print(f"{'IPs':>6} {'fields':>9} {'tex MiB':>8}  " +
+          "  ".join(f"{name:>26}" for name in STAGE_NAMES))
+    sizes = []
+    for ips in args.sizes:
+        shape = SpecShape(ips, args.regs, args.fields, args.enum_density, not args.no_multirow, args.seed)
+        stages = {}
+        with tempfile.TemporaryDirectory() as work:
+            work = Path(work)
+            tex_file = gen_spec.write_latex(shape, work / "spec.tex")
+            csv_dir, xml_file, rtl_dir = work / "csv", work / "ipxact" / "ipMap.xml", work / "rtl"
+
+            def run(name, func, *func_args):
+                result, elapsed, peak = _measure(not args.no_memory, func, *func_args)
+                if result is None or result is False:
+                    raise RuntimeError(f"{name} failed on {ips} IPs")
+                stages[name] = {'seconds': elapsed, 'peak_bytes': peak}
+                return result
+
+            run('process_latex_tables', _latex_to_csv, tex_file, csv_dir)
+            run('convert_all_csv_to_ipxact', convert_all_csv_to_ipxact, "32", csv_dir, xml_file)
+            component = run('parse_ipxact', parse_ipxact, xml_file)
+            run('generate_package', generate_package, component, rtl_dir)
+            run('generate_module', generate_module, component, rtl_dir)
+            tex_bytes = tex_file.stat().st_size
+
+        n_fields = ips * args.regs * args.fields
+        sizes.append({'ips': ips, 'registers': ips * args.regs, 'fields': n_fields,
+                      'tex_bytes': tex_bytes, 'stages': stages})
+        print(f"{ips:>6} {n_fields:>9} {tex_bytes / 2**20:>8.2f}  " + "  ".join(
+            f"{stages[name]['seconds']:>10.3f}s" +
+            (f" {stages[name]['peak_bytes'] / 2**20:>9.1f} MiB" if stages[name]['peak_bytes'] is not None
+             else " " * 14)
+            for name in STAGE_NAMES))
+
+    if args.output:
+        results = {
+            'version': RESULTS_VERSION,
+            'commit': _git_commit(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'shape': {'regs': args.regs, 'fields': args.fields, 'enum_density': args.enum_density,
+                      'multirow': not args.no_multirow, 'seed': args.seed},
+            'sizes': sizes,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+
+def bench_compare(args) -> None:
+    """Per-stage time and memory ratio of two result files of the `stages` sub-command."""
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.current, encoding='utf-8') as f:
+        current = json.load(f)
+    print(f"baseline {baseline.get('commit')} ({baseline['date']}), current {current.get('commit')} ({current['date']})")
+    if baseline['shape'] != current['shape']:
+        print(f"  warning: different shapes {baseline['shape']} / {current['shape']}")
+
+    previous = {size['ips']: size for size in baseline['sizes']}
+    print(f"{'IPs':>6} {'stage':<26} {'baseline s':>11} {'current s':>10} {'ratio':>7} {'mem ratio':>10}")
+    for size in current['sizes']:
+        before = previous.get(size['ips'])
+        if before is None:
+            continue
+        for name in STAGE_NAMES:
+            old, new = before['stages'].get(name), size['stages'].get(name)
+            if old is None or new is None:
+                continue
+            ratio = new['seconds'] / old['seconds'] if old['seconds'] else float('inf')
+            mem = (f"{new['peak_bytes'] / old['peak_bytes']:>9.2f}x"
+                   if new['peak_bytes'] and old['peak_bytes'] else f"{'-':>10}")
+            flag = "  <-- slower" if ratio > 1 + args.threshold else ""
+            print(f"{size['ips']:>6} {name:<26} {old['seconds']:>11.3f} {new['seconds']:>10.3f} "
+                  f"{ratio:>6.2f}x {mem}{flag}")
+
+
+def _quiet(func, *args):
+    """Call `func` with its prints silenced"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks for the register generation pipeline')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    label_index = subparsers.add_parser('label-index', help='LaTeX label index build + lookups')
+    label_index.add_argument('--sizes', type=int, nargs='+', default=[50, 100, 200, 400, 800],
+                             help='number of tables per document')
+    label_index.add_argument('--rows', type=int, default=8, help='rows per table (default: 8)')
+    label_index.add_argument('--legacy', action='store_true',
+                             help='also time the former per-label regex scan')
+    label_index.set_defaults(func=bench_label_index)
+
+    rows = subparsers.add_parser('rows', help='LaTeX row tokenizer throughput')
+    rows.add_argument('--rows', type=int, default=100_000, help='rows in the table (default: 100000)')
+    rows.set_defaults(func=bench_rows)
+
+    model = subparsers.add_parser('model', help='register model memory and RTL emit time')
+    model.add_argument('--fields', type=int, default=500_000, help='fields in the component (default: 500000)')
+    model.add_argument('--regs', type=int, default=64, help='registers per IP (default: 64)')
+    model.add_argument('--fields-per-reg', type=int, default=8, help='fields per register (default: 8)')
+    model.set_defaults(func=bench_model)
+
+    emit = subparsers.add_parser('emit', help='RTL package and module emit throughput')
+    emit.add_argument('--fields', type=int, default=200_000, help='fields in the component (default: 200000)')
+    emit.add_argument('--regs', type=int, default=64, help='registers per IP (default: 64)')
+    emit.add_argument('--fields-per-reg', type=int, default=8, help='fields per register (default: 8)')
+    emit.add_argument('--repeat', type=int, default=3, help='runs of each file, the best is kept (default: 3)')
+    emit.add_argument('--no-memory', action='store_true', help='skip the tracemalloc run')
+    emit.add_argument('-j', '--jobs', type=int, default=1,
+                      help='also time both files on this many worker processes, 0 for one per CPU, at most one per '
+                           'CPU and none under 20000 fields (default: 1)')
+    emit.set_defaults(func=bench_emit)
+
+    regdb = subparsers.add_parser('regdb', help='SQLite register database export and lookup latency')
+    regdb.add_argument('--fields', type=int, default=1_000_000, help='fields in the component (default: 1000000)')
+    regdb.add_argument('--regs', type=int, default=64, help='registers per IP (default: 64)')
+    regdb.add_argument('--fields-per-reg', type=int, default=8, help='fields per register (default: 8)')
+    regdb.add_argument('--lookups', type=int, default=1000, help='random lookups per query (default: 1000)')
+    regdb.set_defaults(func=bench_regdb)
+
+    stages = subparsers.add_parser('stages', help='time and memory of each pipeline stage over map sizes')
+    stages.add_argument('--sizes', type=int, nargs='+', default=[4, 16, 64],
+                        help='number of IPs of each map (default: 4 16 64)')
+    stages.add_argument('--regs', type=int, default=32, help='registers per IP (default: 32)')
+    stages.add_argument('--fields', type=int, default=8, help='fields per register (default: 8)')
+    stages.add_argument('--enum-density', type=float, default=0.25,
+                        help='fraction of fields with enumerated values (default: 0.25)')
+    stages.add_argument('--no-multirow', action='store_true', help='no \\multirow cells in the LaTeX')
+    stages.add_argument('--seed', type=int, default=0, help='random seed of the map (default: 0)')
+    stages.add_argument('--no-memory', action='store_true', help='skip the tracemalloc runs')
+    stages.add_argument('-o', '--output', help='save the results to this JSON file')
+    stages.set_defaults(func=bench_stages)
+
+    compare = subparsers.add_parser('compare', help='compare two JSON results of `stages`')
+    compare.add_argument('baseline', help='results of the reference commit')
+    compare.add_argument('current', help='results to check')
+    compare.add_argument('--threshold', type=float, default=0.1,
+                         help='flag stages slower by more than this fraction (default: 0.1)')
+    compare.set_defaults(func=bench_compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
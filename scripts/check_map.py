@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Check the address map and the fields of a spec.
+
+Reports address blocks and registers that overlap (in a block or across
+blocks), registers not aligned to the bus width and registers running past
+the range of their block. The block ranges and register spans of the whole
+map are sorted once into an interval index, so the check stays
+O(n log n) on maps with hundreds of thousands of registers.
+
+Then reports fields overlapping each other, running past their register,
+or with a reset value or enum values wider than the field. These checks
+run on NumPy columns of all the fields when NumPy is installed, row by row
+otherwise.
+"""
+import io
+import sys
+import time
+import argparse
+import contextlib
+from collections import Counter
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from tools.address_check import check_address_map
+from tools.field_check import check_fields
+from pipeline import load_component
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the address map and the fields of a LaTeX or IP-XACT spec')
+    parser.add_argument('-i', '--input', default='src/ipMap.tex',
+                        help='root LaTeX file or IP-XACT file (default: src/ipMap.tex)')
+    parser.add_argument('-b', '--bus-width', type=int, default=32,
+                        help='bus width the registers are aligned to (default: 32)')
+    parser.add_argument('--no-numpy', action='store_true',
+                        help='check the fields row by row even if NumPy is installed')
+
+    args = parser.parse_args()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            component, _ = load_component(args.input, args.bus_width)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+    start = time.perf_counter()
+    issues = check_address_map(component, args.bus_width)
+    map_elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    issues += check_fields(component, False if args.no_numpy else None)
+    field_elapsed = time.perf_counter() - start
+
+    for issue in issues:
+        print(f"❌ {issue}")
+    counts = Counter(issue.kind for issue in issues)
+    summary = ", ".join(f"{count} {kind}" for kind, count in counts.items()) or "no issue"
+    registers = [reg for block in component.blocks for reg in block.registers]
+    print(f"{len(registers)} registers in {len(component.blocks)} blocks checked in {map_elapsed * 1000:.1f}ms, "
+          f"{sum(len(reg.fields) for reg in registers)} fields in {field_elapsed * 1000:.1f}ms: {summary}")
+    return 1 if issues else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
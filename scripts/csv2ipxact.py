@@ -7,17 +7,62 @@ import sys
 import csv
 import os
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
 import re
 import argparse
+from collections import Counter
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 from tools.ipxact_builder import IPXACT2022Generator
+from tools.ipxact_writer import IpxactWriter, atomic_output, write_element
+from tools.register_model import AddressBlock, Component
+from tools.instrument import is_quiet, log, set_quiet, span
 
 
 def read_csv_data(csv_file):
     """Read CSV data, validate structure and return structured data"""
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        return parse_register_rows(reader.fieldnames, reader, csv_file)
+
+# `NAME[count]` or `NAME[count, stride]` in the Register column: an array of
+# `count` registers, `stride` bytes apart (the register size by default)
+_ARRAY_RE = re.compile(r'^(?P<name>[^\[\]]+?)\s*\[\s*(?P<dim>\w+)\s*(?:,\s*(?P<stride>\w+)\s*)?\]$')
+
+def parse_register_name(register, csv_file):
+    """
+    Name, dimension and stride of a Register cell, `ctrl`, `lut[256]` or
+    `chan[8, 0x10]`; dimension 1 and stride None for a plain register
+
+    Raises:
+        ValueError: If the array dimension or stride is not a positive number
+    """
+    m = _ARRAY_RE.match(register)
+    if not m:
+        return register, 1, None
+    try:
+        dim = int(m.group('dim'), 0)
+        stride = int(m.group('stride'), 0) if m.group('stride') else None
+    except ValueError:
+        dim = stride = 0
+    if dim < 1 or (stride is not None and stride < 1):
+        raise ValueError(f"CSV {csv_file}: Invalid register array '{register}', "
+                         f"expected NAME[count] or NAME[count, stride] with positive numbers")
+    return m.group('name'), dim, stride
+
+def parse_register_rows(fieldnames, rows, csv_file):
+    """
+    Validate the rows of a register table and group their fields by register
+
+    Args:
+        fieldnames: header of the table
+        rows: iterable of dicts mapping each header name to its cell
+        csv_file: name of the table in error messages
+
+    Returns:
+        register name -> {'offset', 'fields', 'dim', 'stride'}, see
+        parse_register_name for the arrays
+    """
     registers_data = {}
 
     # Definition of required columns (expected in the CSV)
@@ -36,36 +81,39 @@ def read_csv_data(csv_file):
     # Allowed values for the access_policy field (IP-XACT standard)
     valid_access_policies = {"RW", "RO", "WO", "W1C", "W0C", "RC"}
 
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-
-        if not reader.fieldnames:
-            raise ValueError(f"CSV file {csv_file} does not contain a header.")
+    if not fieldnames:
+        raise ValueError(f"CSV file {csv_file} does not contain a header.")
 
-        # Normalize column names to lowercase
-        fieldnames = {name.lower().strip() for name in reader.fieldnames}
+    # Normalize column names to lowercase
+    fieldnames = {name.lower().strip() for name in fieldnames}
 
-        # Validate missing or extra columns
-        missing = expected_columns - fieldnames
-        extra = fieldnames - expected_columns
-        if missing:
-            raise ValueError(f"CSV {csv_file} is missing required columns: {missing}")
-        if extra:
-            raise ValueError(f"CSV {csv_file} contains unexpected columns: {extra}")
+    # Validate missing or extra columns
+    missing = expected_columns - fieldnames
+    extra = fieldnames - expected_columns
+    if missing:
+        raise ValueError(f"CSV {csv_file} is missing required columns: {missing}")
+    if extra:
+        raise ValueError(f"CSV {csv_file} contains unexpected columns: {extra}")
 
-        for row in reader:
+    with span("validate", table=csv_file):
+        for row in rows:
             row_data = {k.lower().strip(): v.strip() for k, v in row.items()}
    
             register = row_data.get('register', '').strip().lower()
 
             if not register:
                 continue
-    
+
+            register, dim, stride = parse_register_name(register, csv_file)
             if register not in registers_data:
                 registers_data[register] = {
                     'offset': row_data.get('offset', '0x0000'),
-                    'fields': []
+                    'fields': [],
+                    'dim': dim,
+                    'stride': stride
                 }
+            elif dim != 1 and (dim, stride) != (registers_data[register]['dim'], registers_data[register]['stride']):
+                raise ValueError(f"CSV {csv_file}: register '{register}' is declared with different array sizes")
 
             # Validation of access_policy
             access_policy = row_data.get('Access_Policy', row_data.get('Access Policy', 'RW')).upper()
@@ -90,55 +138,72 @@ def read_csv_data(csv_file):
 
     return registers_data
 
-def convert_all_csv_to_ipxact(bus_size="32"):
-    """Convert all CSV files to a single IP-XACT XML file"""
-    
-    build_path_csv    = Path("build/csv")
-    build_path_ipxact = Path("build/ipxact")
-    csv_files = list(build_path_csv.glob('RegisterMap_*.csv'))
+def map_instances(rows):
+    """
+    IP instances of the rows of table_main.csv
+
+    Args:
+        rows: dicts with the IP, Base Address and (optionally) REF columns
 
+    Returns:
+        (instances, base_addresses): (block name, REF label, base address)
+        of every row with a REF, and the base address of each IP by name
+    """
+    instances = []
     base_addresses = {}
-    with open ("build/csv/table_main.csv", mode="r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
+    for row in rows:
+        if not is_quiet():
             print(f"{row}")
-            row["IP"] = re.sub("IP ", "IP-", row["IP"])
-            row["Base Address"] = re.sub(" ", "", row["Base Address"])
-            base_addresses[row["IP"]] = row["Base Address"]
+        ip_name = re.sub("IP ", "IP-", row["IP"])
+        base_address = re.sub(" ", "", row["Base Address"])
+        base_addresses[ip_name] = base_address
+        ref = (row.get("REF") or "").strip()
+        if ref:
+            instances.append((f"RegisterMap_{ip_name}", ref, base_address))
+    return instances, base_addresses
 
-    print(f" CSV: {csv_files} \n")
-            
-    if not csv_files:
-        print(f"No IPs specific CSV files found in directory: {build_path_csv}")
-        return False
-    
-    print(f"Found {len(csv_files)} CSV files")
-    
-    # Create IP-XACT generator
-    generator = IPXACT2022Generator()
-    
-    # Create root element
-    root = generator.create_root_element()
-    
-    # Create memory maps container
-    memory_maps = ET.SubElement(root, 'ipxact:memoryMaps')
-    memory_map = ET.SubElement(memory_maps, 'ipxact:memoryMap')
-    
-    # Memory map name
-    map_name = ET.SubElement(memory_map, 'ipxact:name')
-    map_name.text = "CSR_MemoryMap"
-    
-    # Process each CSV file
-    for csv_file in csv_files:
-        print(f"Processing {csv_file.name}...")
+def read_address_map(csv_dir):
+    """
+    IP instances listed in table_main.csv
+
+    Returns:
+        list of (block name, register CSV, base address), one address block
+        per IP instance of table_main.csv, whose REF column names the
+        register table; older CSVs without it map one block per file
+    """
+    csv_dir = Path(csv_dir)
+    with open (csv_dir / "table_main.csv", mode="r", newline="", encoding="utf-8") as f:
+        instances, base_addresses = map_instances(csv.DictReader(f))
+
+    if instances:
+        return [(name, csv_dir / f"{ref.replace('table:', 'RegisterMap_', 1)}.csv", base)
+                for name, ref, base in instances]
+
+    return [(csv_file.stem, csv_file, base_addresses.get(csv_file.stem.replace('RegisterMap_', '', 1)))
+            for csv_file in csv_dir.glob('RegisterMap_*.csv')]
+
+def _address_blocks(generator, instances, load_registers, bus_size):
+    """`<ipxact:addressBlock>` of each IP instance, built as they are asked for"""
+    # a table shared by several IP instances is read once, and dropped after its last instance
+    instances = list(instances)
+    uses = Counter(table for _, table, _ in instances)
+    tables = {}
+    for block_name, table, base_address in instances:
+        table_name = getattr(table, 'name', table)
+        log(f"Processing {table_name}...")
         
         try:
             # Read CSV data
-            registers_data = read_csv_data(csv_file)
-            print(f"  Found {len(registers_data)} registers")
+            if table not in tables:
+                tables[table] = load_registers(table)
+            registers_data = tables[table]
+            uses[table] -= 1
+            if not uses[table]:
+                del tables[table]
+            log(f"  Found {len(registers_data)} registers")
             
             if not registers_data:
-                print(f"  No register data found in {csv_file.name}")
+                print(f"  No register data found in {table_name}")
                 continue
             
             # Create registers for this CSV
@@ -148,42 +213,167 @@ def convert_all_csv_to_ipxact(bus_size="32"):
                     reg_name, 
                     reg_data['offset'], 
                     reg_data['fields'],
-                    bus_size
+                    bus_size,
+                    reg_data.get('dim', 1),
+                    reg_data.get('stride')
                 )
                 registers.append(register)
-                print(f"    Created register: {reg_name} at {reg_data['offset']}")
+                log(f"    Created register: {reg_name} at {reg_data['offset']}")
             
             # Creation of address block
-            csv_name = csv_file.stem  # remove extension
-            ip_name = re.sub(r'RegisterMap_', '', csv_name)
-            address_block = generator.create_address_block(csv_name, registers, base_addresses.get(ip_name), bus_size)
-            memory_map.append(address_block)
+            address_block = generator.create_address_block(block_name, registers, base_address, bus_size)
             
-            print(f"  Created address block: {csv_name}")
+            log(f"  Created address block: {block_name}")
             
         except ValueError as e:
-            print(f"Error processing {csv_file.name}: {e}")
+            print(f"Error processing {table_name}: {e}")
             raise  # <-- immediate interruption if CSV is invalid
+
+        yield address_block
+
+def _component_skeleton(generator):
+    """Root `<ipxact:component>`, its `<ipxact:memoryMaps>` and its named, empty `<ipxact:memoryMap>`"""
+    # Create root element
+    root = generator.create_root_element()
+    
+    # Create memory maps container
+    memory_maps = ET.SubElement(root, 'ipxact:memoryMaps')
+    memory_map = ET.SubElement(memory_maps, 'ipxact:memoryMap')
+    
+    # Memory map name
+    map_name = ET.SubElement(memory_map, 'ipxact:name')
+    map_name.text = "CSR_MemoryMap"
+    return root, memory_maps, memory_map
+
+def build_ipxact(instances, load_registers, bus_size="32"):
+    """
+    Build the IP-XACT component of every IP instance
+
+    Args:
+        instances: (block name, table, base address) of each address block
+        load_registers: returns the registers of a table, as read by
+                        read_csv_data; called once per distinct table
+        bus_size: register size in bits
+
+    Returns:
+        root `<ipxact:component>` element
+    """
+    with span("build XML"):
+        generator = IPXACT2022Generator()
+        root, _, memory_map = _component_skeleton(generator)
+        memory_map.extend(_address_blocks(generator, instances, load_registers, bus_size))
+    return root
+
+def stream_ipxact(instances, load_registers, output_file, bus_size="32"):
+    """
+    Write the IP-XACT component of every IP instance to `output_file`, the
+    same file as write_ipxact(build_ipxact(...)), without holding the
+    document: each address block is written once its table is processed.
+
+    Args:
+        instances: (block name, table, base address) of each address block
+        load_registers: returns the registers of a table, as read by
+                        read_csv_data; called once per distinct table
+        output_file: IP-XACT file, replaced once complete
+        bus_size: register size in bits
+    """
+    with span("stream XML"):
+        generator = IPXACT2022Generator()
+        root, memory_maps, memory_map = _component_skeleton(generator)
+        with atomic_output(output_file) as f:
+            writer = IpxactWriter(f)
+            writer.start(root)
+            for child in root:
+                if child is not memory_maps:
+                    writer.element(child)
+            writer.start(memory_maps)
+            writer.start(memory_map)
+            for child in memory_map:
+                writer.element(child)
+            for address_block in _address_blocks(generator, instances, load_registers, bus_size):
+                writer.element(address_block)
+            writer.end(memory_map)
+            writer.end(memory_maps)
+            writer.end(root)
+
+def build_component(instances, load_registers, bus_size="32"):
+    """
+    Build the register model of every IP instance, the same one
+    parse_ipxact_component reads from the component of build_ipxact
+
+    Args:
+        instances: (block name, table, base address) of each address block
+        load_registers: returns the registers of a table, as read by
+                        read_csv_data; called once per distinct table
+        bus_size: register size in bits
+
+    Returns:
+        Component of the memory map
+    """
+    with span("build model"):
+        generator = IPXACT2022Generator()
+        enum_definitions = {}
+        enum_cache = {}
+
+        # The fields of a table shared by several IP instances are built once
+        tables = {}
+        blocks = []
+        for block_name, table, base_address in instances:
+            if table not in tables:
+                registers_data = load_registers(table)
+                table_fields = []
+                for reg_name, reg_data in registers_data.items():
+                    fields = {}
+                    for field_data in reg_data['fields']:
+                        field = generator.create_field_model(field_data, reg_name, enum_cache, enum_definitions)
+                        if field is not None:
+                            fields[field.name] = field
+                    table_fields.append((reg_name, reg_data['offset'], fields,
+                                         reg_data.get('dim', 1), reg_data.get('stride')))
+                tables[table] = table_fields
+
+            if not tables[table]:
+                continue
+
+            registers = [generator.create_register_model(reg_name, offset, fields, base_address, bus_size, dim, stride)
+                         for reg_name, offset, fields, dim, stride in tables[table]]
+            blocks.append(AddressBlock(block_name.replace("RegisterMap_", "", 1), base_address, registers))
+
+    return Component("CSR_IP_Map", blocks, enum_definitions)
+
+def write_ipxact(root, output_file):
+    """Pretty print the component to `output_file`"""
+    with span("serialize"):
+        write_element(root, output_file)
+
+def convert_all_csv_to_ipxact(bus_size="32", csv_dir="build/csv", output_file="build/ipxact/ipMap.xml"):
+    """Convert all CSV files of `csv_dir` to a single IP-XACT XML file"""
+    
+    build_path_csv    = Path(csv_dir)
+    csv_files = list(build_path_csv.glob('RegisterMap_*.csv'))
+
+    instances = read_address_map(build_path_csv)
+
+    log(f" CSV: {csv_files} \n")
+            
+    if not csv_files:
+        print(f"No IPs specific CSV files found in directory: {build_path_csv}")
+        return False
     
-    # Write the combined XML file
-    output_file = build_path_ipxact / "ipMap.xml"
+    print(f"Found {len(csv_files)} CSV files")
+
+    # Write the combined XML file, one address block at a time
+    output_file = Path(output_file)
 
     try:
-        # Pretty print the XML
-        xml_str = ET.tostring(root, encoding='unicode')
-        parsed = minidom.parseString(xml_str)
-        pretty_xml = parsed.toprettyxml(indent="  ")
-        
-        # Remove extra empty lines
-        lines = [line for line in pretty_xml.split('\n') if line.strip()]
-        pretty_xml = '\n'.join(lines)
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(pretty_xml)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        stream_ipxact(instances, read_csv_data, output_file, bus_size)
         
         print(f"\nSuccessfully created combined IP-XACT file: {output_file}")
         return True
         
+    except ValueError:
+        raise  # invalid CSV, reported by main
     except Exception as e:
         print(f"Error writing XML file: {e}")
         return False
@@ -191,11 +381,16 @@ def convert_all_csv_to_ipxact(bus_size="32"):
 def main():
     parser = argparse.ArgumentParser(description='Convert CSV register tables to IP-XACT 2022 XML format')
     parser.add_argument('-s', '--bus-size', default='32', help='size of bus (default: 32)')
+    parser.add_argument('-i', '--input-dir', default='build/csv', help='CSV directory (default: build/csv)')
+    parser.add_argument('-o', '--output', default='build/ipxact/ipMap.xml',
+                        help='IP-XACT output file (default: build/ipxact/ipMap.xml)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='no per-row and per-register messages')
 
     args = parser.parse_args()
+    set_quiet(args.quiet)
 
     try:
-        convert_all_csv_to_ipxact(args.bus_size)
+        convert_all_csv_to_ipxact(args.bus_size, args.input_dir, args.output)
     except ValueError as e:
         print("\n❌ Conversion not completed: error during CSV generation.")
         print(e)
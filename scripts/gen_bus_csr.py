@@ -3,20 +3,24 @@ Gerador de RTL para módulo APB4 CSR Top
 Autor: Script Python para geração automatizada
 """
 
+import sys
 import argparse
 from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from tools.instrument import log
  
 class APB4RTLGenerator:
-    def __init__(self, bus_type="apb4", data_width=32, addr_width=8):
+    def __init__(self, bus_type="apb4", data_width=32, addr_width=8, build_dir="build/rtl"):
         self.bus_type = bus_type.lower()
         self.data_width = data_width
         self.addr_width = addr_width
-        self.build_dir = Path("build/rtl")
+        self.build_dir = Path(build_dir)
         
     def create_directories(self):
         """Cria o diretório build/rtl se não existir"""
         self.build_dir.mkdir(parents=True, exist_ok=True)
-        print(f"✓ Diretório {self.build_dir} criado/verificado")
+        log(f"✓ Diretório {self.build_dir} criado/verificado")
     
     def generate_bus2Reg_interface_params(self):
         """Gera os parâmetros específicos do barramento"""
@@ -176,15 +180,15 @@ endmodule
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(rtl_content)
         
-        print(f"✓ Arquivo RTL gerado: {output_file}")
+        log(f"✓ Arquivo RTL gerado: {output_file}")
         return output_file
        
     def generate_all(self):
         """Executa todo o processo de geração"""
-        print(f"🚀 Iniciando geração de RTL para {self.bus_type.upper()}")
-        print(f"   DATA_WIDTH: {self.data_width}")
-        print(f"   ADDR_WIDTH: {self.addr_width}")
-        print("-" * 50)
+        log(f"🚀 Iniciando geração de RTL para {self.bus_type.upper()}")
+        log(f"   DATA_WIDTH: {self.data_width}")
+        log(f"   ADDR_WIDTH: {self.addr_width}")
+        log("-" * 50)
         
         try:
             # 1. Criar diretórios
@@ -193,10 +197,10 @@ endmodule
             # 2. Gerar arquivo RTL
             rtl_file = self.write_rtl_file()
             
-            print("-" * 50)
-            print("✅ Geração concluída com sucesso!")
-            print(f"📁 Arquivos gerados em: {self.build_dir}")
-            print(f"📄 Arquivo principal: {rtl_file.name}")
+            log("-" * 50)
+            log("✅ Geração concluída com sucesso!")
+            log(f"📁 Arquivos gerados em: {self.build_dir}")
+            log(f"📄 Arquivo principal: {rtl_file.name}")
             
         except Exception as e:
             print(f"❌ Erro durante a geração: {str(e)}")
@@ -228,6 +232,12 @@ def main():
         help='Largura do endereço em bits (default: 8)'
     )
     
+    parser.add_argument(
+        '--output-dir', '-o',
+        default='build/rtl',
+        help='Diretório de saída (default: build/rtl)'
+    )
+    
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -249,7 +259,8 @@ def main():
     generator = APB4RTLGenerator(
         bus_type=args.bus,
         data_width=args.data_width,
-        addr_width=args.addr_width
+        addr_width=args.addr_width,
+        build_dir=args.output_dir
     )
     
     try:
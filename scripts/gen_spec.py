@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Synthetic register map generator.
+
+Builds specs of any size in the layout of src/ipMap.tex: a system address
+map and one register table per IP. The same map can be written as LaTeX
+(input of latex2csv), as the CSVs of latex2csv (input of csv2ipxact) or as
+IP-XACT (input of ipxact2rtl), to exercise each stage on its own.
+"""
+import io
+import sys
+import random
+import argparse
+import contextlib
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from latex2csv import _write_csv, MAP_HEADER
+from csv2ipxact import stream_ipxact
+
+
+TABLE_HEADER = ["Register", "Offset", "Field", "Bits", "Access Policy", "Volatile", "reset",
+                "Description", "Enum Values"]
+# latex2csv reads "Access\_Policy" as "Access Policy"
+_LATEX_TABLE_HEADER = [cell.replace(" Policy", "\\_Policy") for cell in TABLE_HEADER]
+BASE_ADDRESS = 0x4000_0000
+
+_ENUMS = [
+    "0:OFF; 1:ON",
+    "0:Idle; 1:Run; 2:Sleep",
+    "0:Low; 1:Med; 2:High; 3:Max",
+    "0:ModeA; 1:ModeB",
+]
+_POLICIES = ["RW", "RW", "RO", "WO"]
+
+
+@dataclass(frozen=True)
+class SpecShape:
+    """
+    Size and content of a synthetic map.
+
+    Attributes:
+        ips: Number of IPs, one register table each.
+        regs: Registers per IP.
+        fields: Fields per register, they split the 32 bits evenly.
+        enum_density: Fraction of the fields with enumerated values.
+        multirow: Write the register and offset of multi-field registers
+                  as \\multirow cells, as src/ipMap.tex does.
+        seed: Seed of the access, volatile, reset and enum choices.
+    """
+    ips: int = 2
+    regs: int = 8
+    fields: int = 4
+    enum_density: float = 0.25
+    multirow: bool = True
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.ips < 1 or self.regs < 1 or not 1 <= self.fields <= 32:
+            raise ValueError("a spec needs at least 1 IP and 1 register, and 1 to 32 fields per register")
+        if not 0.0 <= self.enum_density <= 1.0:
+            raise ValueError(f"enum density {self.enum_density} is not between 0 and 1")
+
+    @property
+    def block_size(self) -> int:
+        """Address stride of the IPs: a power of two, at least 4 KiB"""
+        size = 0x1000
+        while size < 4 * self.regs:
+            size *= 2
+        return size
+
+    def ip_name(self, ip: int) -> str:
+        return f"IP-{ip}"
+
+
+def table_rows(shape: SpecShape, ip: int) -> list[list[str]]:
+    """
+    Rows of the register table of an IP, as latex2csv writes them
+    (register and offset repeated on every field, no header)
+    """
+    rng = random.Random(shape.seed * 1_000_003 + ip)
+    width = 32 // shape.fields
+    rows = []
+    for r in range(shape.regs):
+        register = f"IP{ip}REG{r}"
+        offset = f"0x{4 * r:04X}"
+        for i in range(shape.fields):
+            lsb = i * width
+            msb = lsb + width - 1
+            rows.append([
+                register,
+                offset,
+                f"FIELD{i}",
+                f"[{msb}:{lsb}]" if width > 1 else f"[{lsb}]",
+                rng.choice(_POLICIES),
+                "true" if rng.random() < 0.2 else "false",
+                f"'h{rng.randrange(min(1 << width, 16)):X}",
+                f"Field {i} of {register}",
+                rng.choice(_ENUMS) if rng.random() < shape.enum_density else "",
+            ])
+    return rows
+
+
+def register_data(shape: SpecShape, ip: int) -> dict:
+    """Registers of an IP as read_csv_data returns them, with their access policy"""
+    registers = {}
+    for row in table_rows(shape, ip):
+        register = registers.setdefault(row[0].lower(), {'offset': row[1], 'fields': []})
+        register['fields'].append({
+            'field': row[2].lower(),
+            'bits': row[3],
+            'access_policy': row[4],
+            'volatile': row[5],
+            'reset': row[6],
+            'description': row[7],
+            'enum_values': row[8],
+        })
+    return registers
+
+
+def instances(shape: SpecShape) -> list[tuple[str, int, str]]:
+    """(block name, IP number, base address) of each IP, for build_ipxact/build_component"""
+    return [(f"RegisterMap_{shape.ip_name(ip)}", ip, f"0x{BASE_ADDRESS + ip * shape.block_size:08X}")
+            for ip in range(shape.ips)]
+
+
+def _latex_table(label: str, caption: str, header: list[str], lines: list[str]) -> str:
+    columns = "|" + "l|" * len(header)
+    head = " & ".join(f"\\textbf{{{cell}}}" for cell in header)
+    return (
+        "\\begin{table}[h]\n"
+        "\\centering\n"
+        f"\\caption{{{caption}}}\n"
+        f"\\label{{{label}}}\n"
+        f"\\begin{{tabular}}{{{columns}}}\n"
+        "\\hline\n"
+        f"{head} \\\\ \\hline\n" + "".join(lines) +
+        "\\end{tabular}\n"
+        "\\end{table}\n\n"
+    )
+
+
+def latex_register_table(shape: SpecShape, ip: int) -> str:
+    """LaTeX register table of an IP"""
+    lines = []
+    rows = table_rows(shape, ip)
+    for start in range(0, len(rows), shape.fields):
+        fields = rows[start:start + shape.fields]
+        for i, row in enumerate(fields):
+            cells = list(row)
+            if shape.multirow and shape.fields > 1:
+                if i == 0:
+                    cells[0] = f"\\multirow{{{shape.fields}}}{{*}}{{{cells[0]}}}"
+                    cells[1] = f"\\multirow{{{shape.fields}}}{{*}}{{{cells[1]}}}"
+                else:
+                    cells[0] = cells[1] = ""
+            rule = "\\hline" if i == len(fields) - 1 else "\\cline{3-9}"
+            lines.append(" & ".join(cells) + f" \\\\ {rule}\n")
+    name = shape.ip_name(ip)
+    return _latex_table(f"table:{name}", f"tabela {name}", _LATEX_TABLE_HEADER, lines)
+
+
+def write_latex(shape: SpecShape, tex_file: str | Path) -> Path:
+    """Write the spec as a single LaTeX document"""
+    tex_file = Path(tex_file)
+    tex_file.parent.mkdir(parents=True, exist_ok=True)
+    map_lines = [f"{shape.ip_name(ip)} & {shape.ip_name(ip)} description & {base} & "
+                 f"\\ref{{table:{shape.ip_name(ip)}}} \\\\ \\hline\n"
+                 for _, ip, base in instances(shape)]
+    with open(tex_file, 'w', encoding='utf-8') as f:
+        f.write("\\documentclass{article}\n\\usepackage{multirow}\n\\begin{document}\n\n")
+        f.write(_latex_table("table:system_address_map", "System Address Map", MAP_HEADER, map_lines))
+        for ip in range(shape.ips):
+            f.write(latex_register_table(shape, ip))
+        f.write("\\end{document}\n")
+    return tex_file
+
+
+def write_csv(shape: SpecShape, csv_dir: str | Path) -> Path:
+    """Write the spec as the CSVs latex2csv produces"""
+    csv_dir = Path(csv_dir)
+    csv_dir.mkdir(parents=True, exist_ok=True)
+    _write_csv([MAP_HEADER] + [[shape.ip_name(ip), f"{shape.ip_name(ip)} description", base,
+                                f"table:{shape.ip_name(ip)}"]
+                               for _, ip, base in instances(shape)],
+               str(csv_dir / "table_main.csv"))
+    for ip in range(shape.ips):
+        _write_csv([TABLE_HEADER] + table_rows(shape, ip), str(csv_dir / f"RegisterMap_{shape.ip_name(ip)}.csv"))
+    return csv_dir
+
+
+def write_ipxact_file(shape: SpecShape, output_file: str | Path, bus_size="32") -> Path:
+    """Write the spec as an IP-XACT component, with the access policies of the spec"""
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        stream_ipxact(instances(shape), lambda ip: register_data(shape, ip), output_file, bus_size)
+    return output_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic register map')
+    parser.add_argument('format', choices=['latex', 'csv', 'ipxact'], help='what to write')
+    parser.add_argument('output', help='LaTeX file, CSV directory or IP-XACT file')
+    parser.add_argument('--ips', type=int, default=2, help='number of IPs (default: 2)')
+    parser.add_argument('--regs', type=int, default=8, help='registers per IP (default: 8)')
+    parser.add_argument('--fields', type=int, default=4, help='fields per register, 1 to 32 (default: 4)')
+    parser.add_argument('--enum-density', type=float, default=0.25,
+                        help='fraction of fields with enumerated values (default: 0.25)')
+    parser.add_argument('--no-multirow', action='store_true',
+                        help='repeat register and offset on every row instead of \\multirow cells')
+    parser.add_argument('--seed', type=int, default=0, help='random seed (default: 0)')
+    parser.add_argument('-s', '--bus-size', default='32', help='register size in the IP-XACT (default: 32)')
+
+    args = parser.parse_args()
+    try:
+        shape = SpecShape(args.ips, args.regs, args.fields, args.enum_density, not args.no_multirow, args.seed)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    if args.format == 'latex':
+        path = write_latex(shape, args.output)
+    elif args.format == 'csv':
+        path = write_csv(shape, args.output)
+    else:
+        path = write_ipxact_file(shape, args.output, args.bus_size)
+    print(f"{path}: {shape.ips} IPs, {shape.ips * shape.regs} registers, "
+          f"{shape.ips * shape.regs * shape.fields} fields ({asdict(shape)})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
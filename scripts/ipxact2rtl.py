@@ -1,145 +1,285 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 import xml.etree.ElementTree as ET
+import os
 import sys
+import tempfile
+from itertools import accumulate
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 from tools import ipxact2rtl
+from tools.register_model import AddressBlock, Component, Register
+from tools.instrument import log, span
 
 # Namespace IP-XACT
 NS = {'ipxact': 'http://www.accellera.org/XMLSchema/IPXACT/1685-2022'}
 
 def parse_ipxact(input_xml):
-    """Extract data from IP-XACT for generation of the CSR."""
+    """Extract data from IP-XACT for generation of the CSR, see read_ipxact."""
     try:
         input_path = ipxact2rtl.get_absolute_path(input_xml)
-        tree = ET.parse(input_path)
-        root = tree.getroot()
-        
-        component = root
+        with span("parse IP-XACT"):
+            return read_ipxact(input_path)
+    
+    except Exception as e:
+        print(f"Unexpected error: {type(e).__name__}: {str(e)}", file=sys.stderr)
+        return None
+
+def read_ipxact(source):
+    """
+    Read the CSR data of an IP-XACT file as a Component, the one
+    parse_ipxact_component returns for the whole document.
+
+    The file is streamed with iterparse: each <ipxact:register> is decoded
+    when it closes, then dropped from the tree along with every element
+    the model does not need, so the memory stays flat however large the
+    file is.
+
+    Args:
+        source: path or binary file object of the IP-XACT file.
+
+    Returns:
+        Component of the file.
+    """
+    ipxact = f"{{{NS['ipxact']}}}"
+    name_tag, block_tag, register_tag = f"{ipxact}name", f"{ipxact}addressBlock", f"{ipxact}register"
+    block_children = {name_tag: 'name', f"{ipxact}baseAddress": 'baseAddress', f"{ipxact}range": 'range'}
+
+    name = None
+    blocks = []
+    enum_definitions = {}  # Name of enum -> values
+    enum_cache = {}        # Signature -> enum_name
+    block = None           # name, baseAddress and range of the open address block
+    registers = []         # of the open address block
+    stack = []             # open elements
+    in_register = 0        # depth of the elements below a register of the open block
+
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        if event == 'start':
+            if in_register or (elem.tag == register_tag and stack and stack[-1].tag == block_tag):
+                in_register += 1
+            elif elem.tag == block_tag:
+                block, registers = {}, []
+            stack.append(elem)
+            continue
+
+        stack.pop()
+        parent = stack[-1] if stack else None
+        if in_register:
+            in_register -= 1
+            if in_register:
+                continue  # decoded with its register
+            # <ipxact:baseAddress> comes first in a valid file, until then the element is kept
+            if 'baseAddress' in block:
+                elem = ipxact2rtl.parse_register_ipxact(elem, NS, enum_cache, enum_definitions,
+                                                        block['baseAddress'])
+            registers.append(elem)
+        elif elem.tag == block_tag:
+            base_address = block['baseAddress']
+            registers = [reg if isinstance(reg, Register) else
+                         ipxact2rtl.parse_register_ipxact(reg, NS, enum_cache, enum_definitions, base_address)
+                         for reg in registers]
+            blocks.append(AddressBlock(block.get('name', ""), base_address, registers,
+                                       int(block['range'], 0) if 'range' in block else None))
+            block, registers = None, []
+        elif block is not None and parent is not None and parent.tag == block_tag:
+            if elem.tag in block_children:
+                block.setdefault(block_children[elem.tag], elem.text)
+        elif elem.tag == name_tag and parent is not None and len(stack) == 1 and name is None:
+            name = elem.text
+        if parent is not None:
+            # the element that just closed is the last child of its parent
+            del parent[-1]
+
+    return Component(name, blocks, enum_definitions)
+
+def parse_ipxact_component(component):
+    """Extract the CSR data from a parsed `<ipxact:component>` element as a Component."""
+    try:
         name = component.find('ipxact:name', NS).text
         
-        registers = {}
+        blocks = []
         enum_definitions = {}  # Name of enum -> values
         enum_cache = {}        # Signature -> enum_name
-        address_info = {}      # info of addressing
 
         for addr_block in component.findall('.//ipxact:addressBlock', NS):
-            base_address = addr_block.find('ipxact:baseAddress', NS)
-
-            for reg in addr_block.findall('ipxact:register', NS):
-                reg_info = ipxact2rtl.parse_register_ipxact(reg, NS, enum_cache, enum_definitions)
-                registers[reg_info['reg_name']] =  {
-                    'offset': reg_info['offset'],
-                    'size': reg_info['size'],
-                    'fields': reg_info['fields'],
-                    'base_address': base_address.text
-                }
-                
-                
-                address_info[reg_info['reg_name']] = {
-                    'offset': reg_info['offset'],
-                    'abs_offset': reg_info['abs_offset'],
-                    'index': reg_info['index'],
-                    'size': reg_info['size']
-                }
+            block_name = addr_block.find('ipxact:name', NS)
+            base_address = addr_block.find('ipxact:baseAddress', NS).text
+            block_range = addr_block.find('ipxact:range', NS)
+
+            registers = [ipxact2rtl.parse_register_ipxact(reg, NS, enum_cache, enum_definitions, base_address)
+                         for reg in addr_block.findall('ipxact:register', NS)]
+            blocks.append(AddressBlock(block_name.text if block_name is not None else "", base_address, registers,
+                                       int(block_range.text, 0) if block_range is not None else None))
         
-        return {
-            'name': name,
-            'registers': registers,
-            'enums': enum_definitions,
-            'address_info': address_info
-        }
+        return Component(name, blocks, enum_definitions)
     
     except Exception as e:
         print(f"Unexpected error: {type(e).__name__}: {str(e)}", file=sys.stderr)
         return None
 
-def generate_package(ipxact_data, output_dir):
-    """Generates the SystemVerilog package file."""
+def generate_package(component, output_dir, enum_library=None):
+    """
+    Generates the SystemVerilog package file, see ipxact2rtl.write_package.
+
+    With an EnumLibrary (tools.enum_library), the enum types it has are
+    typedefs of the library types instead of declarations of their own.
+    """
     try:
-        output_file = ipxact2rtl._setup_package_output_file(ipxact_data, output_dir)
-        component_data = ipxact2rtl._extract_package_data(ipxact_data)
+        output_file = ipxact2rtl._setup_package_output_file(component, output_dir)
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            ipxact2rtl._write_package_header(f, component_data)
-            # Generate enum definitions first
-            if component_data['enums']:
-                f.write("    // Enum definitions\n")
-                for enum_name, enum_values in component_data['enums'].items():
-                    ipxact2rtl._write_single_enum(f, enum_name, enum_values)
-
-            # Generate typedef structs for input (hardware -> register)
-            ipxact2rtl._write_input_structures(f, component_data)
-            # Generate typedef structs for output (register -> hardware)
-            ipxact2rtl._write_output_structures(f, component_data)
-            
-            f.write("endpackage\n")
+        with span("emit package"), open(output_file, 'w', encoding='utf-8') as f:
+            out = ipxact2rtl.SvBuffer(f)
+            ipxact2rtl.write_package(out, component, enum_library)
+            out.close()
         
-        print(f"Package generated: {output_file}")
+        log(f"Package generated: {output_file}")
         return True
     
     except Exception as e:
         print(f"Failed to generate package: {str(e)}", file=sys.stderr)
         return False
 
-def generate_module(ipxact_data, output_dir):
-    """Generates the complete SystemVerilog module."""
+def generate_module(component, output_dir):
+    """Generates the complete SystemVerilog module, see ipxact2rtl.write_module."""
     try:
-        output_file = ipxact2rtl._setup_output_file(ipxact_data, output_dir)
-        component_data = ipxact2rtl._extract_component_data(ipxact_data)
+        output_file = ipxact2rtl._setup_output_file(component, output_dir)
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            ipxact2rtl._write_module_header(f, component_data)
-            ipxact2rtl._write_module_interface(f, component_data)
-            ipxact2rtl._write_internal_signals(f, component_data)
-            ipxact2rtl._write_address_decoding(f, component_data)
-            
-            # Combinational and storage structures
-            f.write("    //--------------------------------------------------------------------------\n")
-            f.write("    // Field logic\n")
-            f.write("    //--------------------------------------------------------------------------\n")
-            
-            ipxact2rtl._write_field_structures(f, component_data)
-            
-            # Logic for each field
-            for reg_name, reg_info in component_data['registers'].items():
-                for field_name, field_info in reg_info['fields'].items():
-                    if field_info['access'] == 'read-only' and not field_info['volatile']:
-                        continue
-
-                    ipxact2rtl._write_single_field_logic(f, component_data['name'], reg_name, field_info)
-            
-            ipxact2rtl._write_write_response(f)
-            ipxact2rtl._write_readback_logic(f, component_data)
-
-            f.write("endmodule\n")
-
-            print(f"Logic generated: {output_file}")
+        with span("emit module"), open(output_file, 'w', encoding='utf-8') as f:
+            out = ipxact2rtl.SvBuffer(f)
+            ipxact2rtl.write_module(out, component)
+            out.close()
+
+        log(f"Logic generated: {output_file}")
         return True
     
     except Exception as e:
         print(f"Failed to generate module: {str(e)}", file=sys.stderr)
         return False
 
+# Below this many fields generate_rtl writes the files in one process:
+# starting the pool and passing the parts around costs more than it saves
+PARALLEL_MIN_FIELDS = 20_000
+
+def _part_component(component, registers):
+    """Component of a part of the registers of `component` and of the enum types they use, for a worker"""
+    used = {f.enum for reg in registers for f in reg.fields.values() if f.enum}
+    return Component(component.name, [AddressBlock("", registers[0].base_address, registers, 0)],
+                     {enum: values for enum, values in component.enums.items() if enum in used},
+                     component.addr_width)
+
+def _spool(texts, path):
+    """Writes the sections one after the other to path, returns their sizes in bytes"""
+    sizes = []
+    with open(path, 'wb') as f:
+        for text in texts:
+            data = text.encode('utf-8')
+            f.write(data)
+            sizes.append(len(data))
+    return sizes
+
+def _emit_part(task):
+    """
+    Module and package sections of one part, in a worker: task is (part
+    component, readback entry of its first register, module file, package
+    file). Returns the sizes of the sections of both files.
+    """
+    part, reg_idx, module_path, package_path = task
+    registers = list(part.registers.values())
+    return (_spool(ipxact2rtl.module_bodies(part, registers, reg_idx), module_path),
+            _spool(ipxact2rtl.package_bodies(part, registers), package_path))
+
+class _SpooledSections:
+    """Sections a worker wrote to a file: [k] reads section k back"""
+
+    def __init__(self, path, sizes):
+        self.path = path
+        self.offsets = [0, *accumulate(sizes)]
+
+    def __getitem__(self, k):
+        with open(self.path, 'rb') as f:
+            f.seek(self.offsets[k])
+            return f.read(self.offsets[k + 1] - self.offsets[k]).decode('utf-8')
+
+def generate_rtl(component, output_dir, enum_library=None, jobs=1):
+    """
+    Generates the package and the module of a component.
+
+    With more than one job, the sections of the registers of each address
+    block (see ipxact2rtl.register_parts) are written by a pool of worker
+    processes, one task per block for both the package and the module.
+    Each task gets the registers of its block and the enum types they use,
+    and writes its sections to temporary files; the files are then put
+    together from them in block order, one section of one block in memory
+    at a time: the same bytes as one process writes.
+
+    The pool has at most one worker per CPU, and components of fewer than
+    PARALLEL_MIN_FIELDS (20000) fields are written in this process.
+
+    Args:
+        component: Component to generate.
+        output_dir: Directory of the <name>_pkg.sv and <name>.sv files.
+        enum_library: EnumLibrary of the batch, see generate_package.
+        jobs: Worker processes, 0 for one per CPU, 1 to write the files in
+              this process.
+
+    Returns:
+        bool: True if both files were generated.
+    """
+    cpus = os.cpu_count() or 1
+    fields = sum(len(reg.fields) for reg in component.registers.values())
+    parts = ipxact2rtl.register_parts(component) if fields >= PARALLEL_MIN_FIELDS else []
+    workers = min(jobs or cpus, cpus, len(parts))
+    if workers <= 1:
+        return generate_package(component, output_dir, enum_library) and generate_module(component, output_dir)
+
+    try:
+        package_file = ipxact2rtl._setup_package_output_file(component, output_dir)
+        module_file = ipxact2rtl._setup_output_file(component, output_dir)
+        with span("emit RTL", jobs=workers), tempfile.TemporaryDirectory() as spool:
+            tasks, reg_idx = [], 0
+            for i, registers in enumerate(parts):
+                tasks.append((_part_component(component, registers), reg_idx,
+                              Path(spool) / f"module{i}", Path(spool) / f"package{i}"))
+                reg_idx += sum(reg.dim for reg in registers)
+
+            module_bodies, package_bodies = [], []
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for task, (module_sizes, package_sizes) in zip(tasks, executor.map(_emit_part, tasks)):
+                    module_bodies.append(_SpooledSections(task[2], module_sizes))
+                    package_bodies.append(_SpooledSections(task[3], package_sizes))
+            for output_file, write, args in ((package_file, ipxact2rtl.write_package, (enum_library, package_bodies)),
+                                             (module_file, ipxact2rtl.write_module, (module_bodies,))):
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    out = ipxact2rtl.SvBuffer(f)
+                    write(out, component, *args)
+                    out.close()
+
+        log(f"Package generated: {package_file}")
+        log(f"Logic generated: {module_file}")
+        return True
+
+    except Exception as e:
+        print(f"Failed to generate RTL: {str(e)}", file=sys.stderr)
+        return False
+
 if __name__ == "__main__":
     if len(sys.argv) < 3:
-        print("Usage: python3 ipxact_csr_gen.py <input.xml> <output_dir>")
+        print("Usage: python3 ipxact_csr_gen.py <input.xml> <output_dir> [jobs]")
         sys.exit(1)
         
     INPUT_XML = sys.argv[1]
     OUTPUT_DIR = sys.argv[2]
+    JOBS = int(sys.argv[3]) if len(sys.argv) > 3 else 1
     
     print(f"⚡ Converting: {INPUT_XML}")
     ip_data = parse_ipxact(INPUT_XML)
 
     if ip_data:
-        pkg_success = generate_package(ip_data, OUTPUT_DIR)
-        logic_success = generate_module(ip_data, OUTPUT_DIR)
-        
-        if pkg_success and logic_success:
+        if generate_rtl(ip_data, OUTPUT_DIR, jobs=JOBS):
             print(f"✅ Conversion completed! Check {OUTPUT_DIR}")
             sys.exit(0)
     
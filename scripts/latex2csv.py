@@ -1,89 +1,272 @@
-import re
 import os
 import csv
 import sys
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 from tools.latex_parser import *
+from tools.instrument import log, set_quiet, span
 
-def convert2csv(table_content):
+def iter_csv_rows(table_content, multirow_columns=None):
+    """
+    Lazily convert LaTeX table content to CSV-ready rows
+
+    Rows come straight from the tokenizer, which carries `\\multirow`
+    values down their span, and are padded to the width of the header row.
+
+    Args:
+        table_content: table input
+        multirow_columns: indexes of the columns whose multirow cells are
+                          carried down (default: all columns)
+
+    Yields:
+        clean rows fitting the csv format
+    """
+    rows = iter_table_rows(table_content, multirow_columns)
+
+    header = next(rows, None)
+    if header is None:
+        return
+    width = len(header)
+    yield header
+
+    for row in rows:
+        if len(row) < width:
+            row.extend([''] * (width - len(row)))
+        yield row
+
+def convert2csv(table_content, multirow_columns=None):
     """
     Clean LaTeX table content and convert to CSV-ready format
 
     Args:
         table:  table input
+        multirow_columns: columns whose multirow cells are carried down
 
     Returns:
         clean table fitting the csv format
     """
-
-    rows = clean_table_content(table_content)
-    
-    # Process each row
-    csv_rows = []
-    for row in rows:
-        row = row.strip()
-        if not row:
-            continue
-            
-        # Split by & and clean each cell
-        cells = re.split(r'(?<!\\)&', row)
-        cleaned_cells = []
-        
-        for cell in cells:
-            cell = cell.strip()
-            # Remove remaining LaTeX commands
-            cell = re.sub(r'\\[a-zA-Z]+(?:\{[^}]*\})*', '', cell)
-            cell = re.sub(r'\\_', ' ', cell)
-            cell = re.sub(r'\s+', ' ', cell)
-            cleaned_cells.append(cell.strip())
-            
-        
-        if cleaned_cells and any(cell.strip() for cell in cleaned_cells):
-            csv_rows.append(cleaned_cells)
-    
-    # Fill empty cells with values from above (for multirow handling)
-    if csv_rows:
-        max_cols = max(len(row) for row in csv_rows)
-        for row in csv_rows:
-            while len(row) < max_cols:
-                row.append('')
-        
-        # Fill empty cells in first few columns
-        for col_idx in range(min(3, max_cols)):
-            for row_idx in range(len(csv_rows)):
-                if not csv_rows[row_idx][col_idx].strip() and row_idx > 0:
-                    for prev_row_idx in range(row_idx - 1, -1, -1):
-                        if csv_rows[prev_row_idx][col_idx].strip():
-                            csv_rows[row_idx][col_idx] = csv_rows[prev_row_idx][col_idx]
-                            break
-    
-    return csv_rows
+    return list(iter_csv_rows(table_content, multirow_columns))
 
 def save_table_to_csv(csv_rows, output_file):
     """
     Save CSV rows to file
 
     Args:
-        csv rows : clean csv table
+        csv rows : clean csv table, any iterable of rows (consumed once)
         output_file : name of the file to save/create
+
+    Returns:
+        number of rows written
     """
+    row_count = _write_csv(csv_rows, output_file)
+    log(f"  Saved: {output_file} ({row_count} rows)")
+    return row_count
+
+def _write_csv(csv_rows, output_file):
+    """Write rows to `output_file` without logging, returns the row count"""
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
     
+    row_count = 0
     with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
         writer = csv.writer(csvfile)
-        writer.writerows(csv_rows)
-    
-    print(f"  Saved: {output_file} ({len(csv_rows)} rows)")
+        for row in csv_rows:
+            writer.writerow(row)
+            row_count += 1
+    return row_count
+
+def _convert_table(task):
+    """
+    Convert one register table and write its CSV. Runs in a worker process
+    when several jobs are used, so it only returns what the parent logs.
+
+    Args:
+        task : (table content, output file, multirow columns)
+
+    Returns:
+        number of rows written
+    """
+    table, file_name, multirow_columns = task
+    return _write_csv(iter_csv_rows(table, multirow_columns), file_name)
+
+# Name of the file, inside the output dir, that records what each CSV was built from
+MANIFEST_NAME = ".latex2csv_manifest.json"
+MANIFEST_VERSION = 2
+MAIN_TABLE_LABEL = "table:system_address_map"
+# table_main.csv holds one row per IP instance of the whole hierarchy
+MAP_HEADER = ["IP", "Description", "Base Address", "REF"]
+
+def _file_stamp(path):
+    """[mtime_ns, size] of a file, None if it is gone"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+def _load_manifest(output_dir, options):
+    """Previous manifest, None if missing, unreadable or built with other options"""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != MANIFEST_VERSION or manifest.get('options') != options:
+        return None
+    return manifest
+
+def _save_manifest(output_dir, manifest):
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+def _lookup_table(spec, label, file_name, previous, manifest):
+    """
+    Find a table and decide whether its CSV (if `file_name` is given)
+    has to be written again
 
-def process_latex_tables(latex_content : str, output_dir="build") -> bool:
+    The table is skipped without even being looked up when the file it
+    came from is untouched; otherwise the hash of its body is compared
+    with the one recorded when the CSV was written. The table is recorded
+    in `manifest` either way.
+
+    Returns:
+        (body, changed): body is None when the table was not looked up
+    """
+    old = previous['tables'].get(label) if previous else None
+    csv_name = os.path.basename(file_name) if file_name is not None else None
+    reusable = (old is not None and old['csv'] == csv_name
+                and (file_name is None or os.path.exists(file_name)))
+
+    if reusable and old['source'] is not None:
+        stamp = _file_stamp(old['source'])
+        if stamp is not None and stamp == previous['files'].get(old['source']):
+            manifest['tables'][label] = old
+            manifest['files'][old['source']] = stamp
+            return None, False
+
+    body = spec.table(label)
+    source = spec.entry(label)[0]
+    digest = hashlib.sha256(body.encode('utf-8')).hexdigest()
+    manifest['tables'][label] = {
+        'hash': digest,
+        'csv': csv_name,
+        'source': str(source) if source is not None else None,
+    }
+    if source is not None:
+        manifest['files'][str(source)] = _file_stamp(source)
+
+    return body, not (reusable and old['hash'] == digest)
+
+def address_map_instances(root):
+    """
+    Flatten an address map hierarchy
+
+    Returns:
+        (instances, references): the table_main.csv rows of every IP
+        instance and the register table labels in hierarchy order (each once)
+    """
+    leaves = list(root.leaves())
+    instances = [["_".join(leaf.path), leaf.description, f"0x{leaf.base_address:08X}", leaf.label]
+                 for leaf in leaves]
+    references = list(dict.fromkeys(leaf.label for leaf in leaves))
+    return instances, references
+
+def load_register_tables(spec, multirow_columns=None, memo=None):
+    """
+    In-memory counterpart of process_latex_tables, nothing is written
+
+    Args:
+        spec : LatexSpec of the document
+        multirow_columns : columns whose multirow cells are carried down
+        memo : dict kept by the caller across calls (label -> (body, rows));
+               a table whose body did not change is not converted again
+
+    Returns:
+        (instances, tables): the table_main.csv rows of every IP instance
+        and the CSV rows of each referenced register table, by label
+    """
+    with span("parse address map"):
+        instances, references = address_map_instances(walk_address_map(spec.table, MAIN_TABLE_LABEL))
+    tables = {}
+    with span("parse tables", tables=len(references)):
+        for ref in references:
+            body = spec.table(ref)
+            if memo is not None and ref in memo and memo[ref][0] == body:
+                tables[ref] = memo[ref][1]
+                continue
+            tables[ref] = convert2csv(body, multirow_columns)
+            if memo is not None:
+                memo[ref] = (body, tables[ref])
+    if memo is not None:
+        for label in memo.keys() - tables.keys():
+            del memo[label]
+    return instances, tables
+
+def _walk_address_map(spec, main_name, previous, manifest):
+    """
+    Walk the hierarchy of map tables below the system address map
+
+    The previous walk, kept in the manifest, is reused while none of the
+    map tables changed and `main_name` still exists.
+
+    Returns:
+        (instances, references, changed): the table_main.csv rows of every
+        IP instance, the register table labels in hierarchy order (each
+        once) and whether the instances have to be written again
+    """
+    old_maps = previous.get('maps') if previous else None
+    if old_maps:
+        changed = not os.path.exists(main_name)
+        for label in old_maps:
+            _, table_changed = _lookup_table(spec, label, None, previous, manifest)
+            changed = changed or table_changed
+        if not changed:
+            manifest.update(maps=old_maps, instances=previous['instances'],
+                            references=previous['references'])
+            return previous['instances'], previous['references'], False
+        for label in old_maps:
+            del manifest['tables'][label]
+
+    root = walk_address_map(spec.table, MAIN_TABLE_LABEL)
+
+    maps = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node.is_map:
+            maps.append(node.label)
+            stack.extend(node.children)
+    maps = list(dict.fromkeys(maps))
+    for label in maps:
+        _lookup_table(spec, label, None, previous, manifest)
+
+    instances, references = address_map_instances(root)
+    manifest.update(maps=maps, instances=instances, references=references)
+    return instances, references, True
+
+def process_latex_tables(latex_content : str | LatexSpec, output_dir="build", multirow_columns=None,
+                         jobs=1, incremental=True) -> bool:
     """
     Main function to process LaTeX tables based on the system address map
 
     Args:
-        latex_content : raw data inside .text
+        latex_content : raw data inside .tex, or a LatexSpec spread over
+                        several files
         output_dir : dir to save result
+        multirow_columns : columns whose multirow cells are carried down
+                           (default: all columns)
+        jobs : number of worker processes converting the referenced tables,
+               0 uses every CPU. Files and logs keep the reference order.
+        incremental : only rewrite the CSVs whose table changed since the
+                      last run, as recorded in the manifest of `output_dir`,
+                      and remove the CSVs of tables that are gone
 
     Returns:
         True if operation sucessufl
@@ -91,51 +274,103 @@ def process_latex_tables(latex_content : str, output_dir="build") -> bool:
     
     print("Processing LaTeX tables...\n")
 
-    main_table = get_main_table_label(latex_content, "table:system_address_map")
-    main_csv = convert2csv(table_content=main_table)
+    if isinstance(latex_content, LatexSpec):
+        spec = latex_content
+    else:
+        # Tokenize the document once, every table lookup below uses the index
+        spec = LatexSpec.from_string(latex_content)
 
-    main_name = os.path.join(output_dir, f"table_main.csv")
-    save_table_to_csv(csv_rows=main_csv, output_file=main_name)
-
-    #extract references from the main table
-    references = extract_references_from_table(main_table)
-    print(f"Found references: {references}")
-    
-    #go through the refs
-    for idx, ref in enumerate(references):
-        #get table with certain label code
-        table = extract_table_with_label(latex_content, target_label=ref)
+    options = {'multirow_columns': sorted(multirow_columns) if multirow_columns is not None else None}
+    previous = _load_manifest(output_dir, options) if incremental else None
+    manifest = {'version': MANIFEST_VERSION, 'options': options, 'files': {}, 'tables': {}}
 
-        #keep it clean fit for an csv
-        table_csv = convert2csv(table_content=table)
+    main_name = os.path.join(output_dir, f"table_main.csv")
+    with span("parse address map"):
+        instances, references, changed = _walk_address_map(spec, main_name, previous, manifest)
+    print(f"Found main table: {MAIN_TABLE_LABEL}")
+    if changed:
+        save_table_to_csv(csv_rows=[MAP_HEADER] + instances, output_file=main_name)
+    else:
+        log(f"  Unchanged: {main_name}")
+    log(f"Found references: {references}")
 
-        #save on an table
+    #get every changed table with certain label code, only their files get tokenized
+    tasks = []
+    changed_refs = []
+    for ref in references:
         ref_str = ref.replace("table:", "RegisterMap_", 1)
         file_name = os.path.join(output_dir, f"{ref_str}.csv")
-        save_table_to_csv(csv_rows=table_csv, output_file=file_name)
-        print(f"Table {ref} was created with name {ref}.csv\n")
+        table, changed = _lookup_table(spec, ref, file_name, previous, manifest)
+        if changed:
+            tasks.append((table, file_name, multirow_columns))
+            changed_refs.append(ref)
+        else:
+            log(f"  Unchanged: {file_name}")
+
+    #keep them clean fit for an csv and save, in parallel if asked to
+    with span("parse tables", tables=len(tasks)):
+        if jobs != 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=jobs or None) as pool:
+                row_counts = pool.map(_convert_table, tasks)
+                _log_tables(changed_refs, tasks, row_counts)
+        else:
+            _log_tables(changed_refs, tasks, map(_convert_table, tasks))
 
+    #drop the outputs of tables that are no longer referenced
+    if previous:
+        kept = {entry['csv'] for entry in manifest['tables'].values()}
+        for label, entry in previous['tables'].items():
+            if label not in manifest['tables'] and entry['csv'] not in kept and entry['csv']:
+                file_name = os.path.join(output_dir, entry['csv'])
+                if os.path.exists(file_name):
+                    os.remove(file_name)
+                    log(f"  Removed: {file_name}")
+
+    _save_manifest(output_dir, manifest)
+    print(f"{len(tasks)} of {len(references)} register tables regenerated")
     print("End of operation")
     return True
 
+def _log_tables(references, tasks, row_counts):
+    """Print the result of each table, in reference order; consumes `row_counts`"""
+    for ref, (_, file_name, _), row_count in zip(references, tasks, row_counts):
+        log(f"  Saved: {file_name} ({row_count} rows)")
+        log(f"Table {ref} was created with name {ref}.csv\n")
+
 def main():
-    tex_file = "src/ipMap.tex"
-    output_dir = "build/csv"
+    parser = argparse.ArgumentParser(description='Extract the register tables of a LaTeX spec to CSV')
+    parser.add_argument('-i', '--input', default='src/ipMap.tex',
+                        help='root LaTeX file, \\input/\\include are followed (default: src/ipMap.tex)')
+    parser.add_argument('-o', '--output-dir', default='build/csv', help='CSV output directory (default: build/csv)')
+    parser.add_argument('--multirow-columns', type=int, nargs='+', metavar='COL',
+                        help='0-based columns whose \\multirow values are carried down (default: all)')
+    parser.add_argument('-f', '--force', action='store_true',
+                        help='regenerate every CSV, ignoring the manifest of previous runs')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='worker processes for the IP tables, 0 for one per CPU (default: 1)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='no per-table and per-file messages')
+
+    args = parser.parse_args()
+    set_quiet(args.quiet)
+    tex_file = args.input
+    output_dir = args.output_dir
     
     if not os.path.exists(tex_file):
         print(f"Error: File not found: {tex_file}")
         return
     
-    # Read LaTeX file
+    # Map the LaTeX files, they are only read when a table lives in them
     try:
-        with open(tex_file, 'r', encoding='utf-8') as f:
-            latex_content = f.read()
-    except Exception as e:
+        with LatexSpec(tex_file) as spec:
+            process_latex_tables(spec, output_dir, args.multirow_columns, args.jobs,
+                                 incremental=not args.force)
+            print(f"Tokenized {len(spec.tokenized_files())} LaTeX file(s)")
+    except (OSError, UnicodeDecodeError) as e:
         print(f"Error reading file: {e}")
         return
-    
-    # Process tables
-    process_latex_tables(latex_content, output_dir)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+LaTeX -> CSV -> IP-XACT -> RTL in a single process.
+
+Runs the stages of updateConfigRegister.sh (latex2csv, csv2ipxact,
+ipxact2rtl and gen_bus_csr) one after the other, handing the register
+tables and the IP-XACT component to the next stage in memory instead of
+writing them to disk and parsing them back. The CSV and IP-XACT files are
+only written when asked for.
+"""
+import io
+import os
+import csv
+import sys
+import time
+import contextlib
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from tools.latex_parser import LatexSpec
+from tools.stage_cache import StageCache, source_key, stage_key
+from tools.register_db import export_component, SCHEMA_VERSION
+from tools.instrument import Profiler, is_quiet, log, set_quiet, span
+from tools.address_check import check_address_map
+from tools.field_check import check_fields
+from latex2csv import load_register_tables, save_table_to_csv, _write_csv, MAP_HEADER
+from csv2ipxact import map_instances, parse_register_rows, build_component, stream_ipxact
+from ipxact2rtl import parse_ipxact, generate_rtl
+from gen_bus_csr import APB4RTLGenerator
+
+
+# Stage outputs are kept under <output_dir>/.cache, keyed on their inputs
+CACHE_DIR = ".cache"
+STAGES = ('latex2csv', 'csv2ipxact', 'ipxact2rtl', 'regdb', 'gen_bus_csr')
+# Modules whose code makes the output of each stage, part of its key
+STAGE_MODULES = {
+    'latex2csv': ('latex2csv', 'tools.latex_parser'),
+    'csv2ipxact': ('csv2ipxact', 'tools.ipxact_builder', 'tools.ipxact_writer', 'tools.register_model'),
+    'ipxact2rtl': ('ipxact2rtl', 'tools.ipxact2rtl', 'tools.register_model', 'tools.enum_library'),
+    'regdb': ('tools.register_db',),
+    'gen_bus_csr': ('gen_bus_csr',),
+}
+
+
+def _table_registers(rows, name):
+    """Registers of a table given as CSV rows, header first"""
+    header = rows[0]
+    return parse_register_rows(header, (dict(zip(header, row)) for row in rows[1:]), name)
+
+
+def _silenced():
+    """
+    Drop the messages of a generator writing to a cache entry: the paths
+    they name are temporary, the files are listed once restored
+    """
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def _log_rtl(files):
+    """Log the RTL files restored from the cache (None without the cache)"""
+    for path in files or ():
+        log(f"RTL written: {path}")
+
+
+def _csv_name(label):
+    return f"{label.replace('table:', 'RegisterMap_', 1)}.csv"
+
+
+def _write_tables(instances, tables, csv_dir, log=False):
+    """Write table_main.csv and the register table CSVs to `csv_dir`"""
+    write = save_table_to_csv if log else _write_csv
+    write([MAP_HEADER] + instances, str(Path(csv_dir) / "table_main.csv"))
+    for label, rows in tables.items():
+        write(rows, str(Path(csv_dir) / _csv_name(label)))
+
+
+def _read_tables(csv_dir):
+    """(instances, tables) back from a directory written by _write_tables"""
+    csv_dir = Path(csv_dir)
+    with open(csv_dir / "table_main.csv", newline='', encoding='utf-8') as f:
+        instances = list(csv.reader(f))[1:]
+    tables = {}
+    for row in instances:
+        if row[3] not in tables:
+            with open(csv_dir / _csv_name(row[3]), newline='', encoding='utf-8') as f:
+                tables[row[3]] = list(csv.reader(f))
+    return instances, tables
+
+
+def load_component(spec_file, bus_width=32, multirow_columns=None):
+    """
+    Register model of a LaTeX spec, its tables converted in memory, or of
+    an IP-XACT file
+
+    Returns:
+        (component, files): the Component and the files it was read from
+
+    Raises:
+        ValueError: if the spec cannot be read
+    """
+    spec_file = Path(spec_file)
+    if spec_file.suffix == '.tex':
+        with LatexSpec(spec_file) as spec:
+            files = spec.files()
+            instances, tables = load_register_tables(spec, multirow_columns)
+        blocks, _ = map_instances(dict(zip(MAP_HEADER, row)) for row in instances)
+        return build_component(blocks, lambda label: _table_registers(tables[label], label), str(bus_width)), files
+
+    errors = io.StringIO()
+    with contextlib.redirect_stderr(errors):
+        component = parse_ipxact(spec_file)
+    if component is None:
+        raise ValueError(errors.getvalue().strip() or f"Could not read {spec_file}")
+    return component, [spec_file]
+
+
+def run_pipeline(tex_file, output_dir="build", bus_width=32, addr_width=3, bus_protocol="apb4",
+                 multirow_columns=None, write_csv=False, write_ipxact=False, write_db=False, use_cache=True,
+                 memo=None, check=False, enum_library=None, jobs=1):
+    """
+    Generate the RTL of a LaTeX spec
+
+    With the cache on, each stage is keyed on a hash of what it reads (the
+    content of the spec files, or the key of the previous stage), of its
+    parameters and of the source of its modules (STAGE_MODULES). A stage
+    whose key is in the cache is not run; its outputs are copied from the
+    cache, and earlier stages only run if their result is needed.
+
+    Args:
+        tex_file : root LaTeX file of the spec
+        output_dir : build directory, outputs go to its csv, ipxact and rtl dirs
+        bus_width : data width of the bus and size of the registers
+        addr_width : address width of the bus
+        bus_protocol : apb4 or axi4lite
+        multirow_columns : columns whose multirow cells are carried down
+        write_csv : also write the CSV of every table to <output_dir>/csv
+        write_ipxact : also write <output_dir>/ipxact/ipMap.xml
+        write_db : also write the SQLite register database <output_dir>/db/ipMap.db
+        use_cache : reuse and record stage outputs in <output_dir>/.cache
+        memo : dict kept by the caller across runs (see watch); tables whose
+               LaTeX did not change are not converted or validated again
+        check : check the address map (overlaps, alignment to the bus
+                width, registers past their block) and the fields
+                (overlaps, fields past their register, reset and enum
+                values wider than the field) and fail on any issue
+        enum_library : EnumLibrary of the batch (tools.enum_library); the
+                       enum types it has are typedefs of its types
+        jobs : worker processes writing the RTL by address block, 0 for one
+               per CPU, never more than the CPUs; maps under 20000 fields
+               are written in one process (see ipxact2rtl.generate_rtl)
+
+    Returns:
+        dict of stage name -> (seconds, cached), None if a stage failed
+    """
+    output_dir = Path(output_dir).resolve()
+    csv_dir, ipxact_dir, rtl_dir = output_dir / "csv", output_dir / "ipxact", output_dir / "rtl"
+    db_dir = output_dir / "db"
+    cache = StageCache(output_dir / CACHE_DIR) if use_cache else None
+    timings = {}
+    results = {}
+
+    spec = LatexSpec(tex_file)
+    try:
+        multirow = sorted(multirow_columns) if multirow_columns is not None else None
+        code = {stage: source_key(*modules) for stage, modules in STAGE_MODULES.items()}
+        csv_key = stage_key('latex2csv', code['latex2csv'], spec.content_hash(), multirow)
+        ipxact_key = stage_key('csv2ipxact', code['csv2ipxact'], csv_key, bus_width)
+        rtl_key = stage_key('ipxact2rtl', code['ipxact2rtl'], ipxact_key,
+                            *([enum_library.key] if enum_library is not None else []))
+        db_key = stage_key('regdb', code['regdb'], ipxact_key, SCHEMA_VERSION)
+        bus_key = stage_key('gen_bus_csr', code['gen_bus_csr'], bus_protocol, bus_width, addr_width)
+
+        def register_tables():
+            """latex2csv: (instances, tables), from the cache when possible"""
+            if 'csv' not in results:
+                start = time.perf_counter()
+                cached = cache is not None and cache.has('latex2csv', csv_key)
+                with span('latex2csv', cached=cached):
+                    if cached:
+                        results['csv'] = _read_tables(cache.path('latex2csv', csv_key))
+                    else:
+                        results['csv'] = load_register_tables(
+                            spec, multirow_columns, memo.setdefault('tables', {}) if memo is not None else None)
+                        if cache is not None:
+                            entry = cache.begin('latex2csv', csv_key)
+                            _write_tables(*results['csv'], entry)
+                            cache.commit('latex2csv', csv_key, entry)
+                timings['latex2csv'] = (time.perf_counter() - start, cached)
+            return results['csv']
+
+        registers_memo = memo.setdefault('registers', {}) if memo is not None else {}
+
+        def _registers(rows, label):
+            """Registers of a table, reused while its rows are the same object"""
+            known = registers_memo.get(label)
+            if known is None or known[0] is not rows:
+                known = registers_memo[label] = (rows, _table_registers(rows, label))
+            return known[1]
+
+        def component():
+            """csv2ipxact: register model of the component, from the cache when possible"""
+            if 'ipxact' not in results:
+                cached = cache is not None and cache.has('csv2ipxact', ipxact_key)
+                if not cached:
+                    instances, tables = register_tables()
+                start = time.perf_counter()
+                with span('csv2ipxact', cached=cached):
+                    if cached:
+                        results['ipxact'] = parse_ipxact(cache.path('csv2ipxact', ipxact_key) / "ipMap.xml")
+                    else:
+                        blocks, _ = map_instances(dict(zip(MAP_HEADER, row)) for row in instances)
+                        load_registers = lambda label: _registers(tables[label], label)
+                        # the XML is only built when the file is wanted, and only cached then
+                        if write_ipxact:
+                            if cache is not None:
+                                entry = cache.begin('csv2ipxact', ipxact_key)
+                                stream_ipxact(blocks, load_registers, entry / "ipMap.xml", str(bus_width))
+                                cache.commit('csv2ipxact', ipxact_key, entry)
+                            else:
+                                ipxact_dir.mkdir(parents=True, exist_ok=True)
+                                stream_ipxact(blocks, load_registers, ipxact_dir / "ipMap.xml", str(bus_width))
+                        # the RTL generator gets the model parse_ipxact would read from ipMap.xml
+                        results['ipxact'] = build_component(blocks, load_registers, str(bus_width))
+                timings['csv2ipxact'] = (time.perf_counter() - start, cached)
+            return results['ipxact']
+
+        if check:
+            ipxact_data = component()
+            if ipxact_data is None:
+                return None
+            with span('check'):
+                issues = check_address_map(ipxact_data, bus_width) + check_fields(ipxact_data)
+            for issue in issues:
+                print(f"❌ {issue}")
+            if issues:
+                print(f"{len(issues)} address map or field issue(s)")
+                return None
+
+        restored = cache.restore('ipxact2rtl', rtl_key, rtl_dir) if cache is not None else None
+        if restored:
+            timings['ipxact2rtl'] = (0.0, True)
+        else:
+            ipxact_data = component()
+            if ipxact_data is None:
+                return None
+            start = time.perf_counter()
+            with span('ipxact2rtl'):
+                if cache is None:
+                    if not generate_rtl(ipxact_data, rtl_dir, enum_library, jobs):
+                        return None
+                else:
+                    entry = cache.begin('ipxact2rtl', rtl_key)
+                    with _silenced():
+                        if not generate_rtl(ipxact_data, entry, enum_library, jobs):
+                            return None
+                    cache.commit('ipxact2rtl', rtl_key, entry)
+                    restored = cache.restore('ipxact2rtl', rtl_key, rtl_dir)
+            timings['ipxact2rtl'] = (time.perf_counter() - start, False)
+        _log_rtl(restored)
+
+        if write_csv:
+            if cache is None:
+                _write_tables(*register_tables(), csv_dir, log=True)
+            elif not cache.restore('latex2csv', csv_key, csv_dir):
+                register_tables()
+                cache.restore('latex2csv', csv_key, csv_dir)
+            print(f"CSV written: {csv_dir}")
+        if write_ipxact:
+            if cache is not None:
+                if not cache.restore('csv2ipxact', ipxact_key, ipxact_dir):
+                    component()
+                    cache.restore('csv2ipxact', ipxact_key, ipxact_dir)
+            elif 'ipxact' not in results:
+                component()
+            print(f"IP-XACT written: {ipxact_dir / 'ipMap.xml'}")
+        if write_db:
+            if cache is not None and cache.restore('regdb', db_key, db_dir):
+                timings['regdb'] = (0.0, True)
+            else:
+                ipxact_data = component()
+                if ipxact_data is None:
+                    return None
+                start = time.perf_counter()
+                with span('regdb'):
+                    entry = cache.begin('regdb', db_key) if cache is not None else db_dir
+                    export_component(ipxact_data, Path(entry) / "ipMap.db")
+                    if cache is not None:
+                        cache.commit('regdb', db_key, entry)
+                        cache.restore('regdb', db_key, db_dir)
+                timings['regdb'] = (time.perf_counter() - start, False)
+            print(f"Register database written: {db_dir / 'ipMap.db'}")
+    finally:
+        spec.close()
+
+    start = time.perf_counter()
+    restored = cache.restore('gen_bus_csr', bus_key, rtl_dir) if cache is not None else None
+    if restored:
+        timings['gen_bus_csr'] = (time.perf_counter() - start, True)
+    else:
+        with span('gen_bus_csr'):
+            if cache is None:
+                APB4RTLGenerator(bus_protocol, bus_width, addr_width, rtl_dir).generate_all()
+            else:
+                entry = cache.begin('gen_bus_csr', bus_key)
+                with _silenced():
+                    APB4RTLGenerator(bus_protocol, bus_width, addr_width, entry).generate_all()
+                cache.commit('gen_bus_csr', bus_key, entry)
+                restored = cache.restore('gen_bus_csr', bus_key, rtl_dir)
+        timings['gen_bus_csr'] = (time.perf_counter() - start, False)
+    _log_rtl(restored)
+
+    return timings
+
+
+def _format_timings(timings):
+    """One `stage=time` item per stage that ran, in pipeline order"""
+    return " ".join(f"{stage}={'cached' if timings[stage][1] else f'{timings[stage][0] * 1000:.1f}ms'}"
+                    for stage in STAGES if stage in timings)
+
+
+def _stamps(files):
+    """(mtime_ns, size) of each file, None for a file that is gone"""
+    stamps = []
+    for path in files:
+        try:
+            st = os.stat(path)
+            stamps.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamps.append(None)
+    return stamps
+
+
+def watch(tex_file, interval=0.2, **options):
+    """
+    Run the pipeline each time a file of the spec changes, until interrupted
+
+    The parsers and generators stay loaded, the register tables whose LaTeX
+    did not change are reused from the previous run and the stage cache
+    skips the stages whose inputs did not change. The stage logs are
+    silenced (and the per-row ones not even formatted, see --quiet); a
+    timing line is printed for each run, after the output of the run when
+    it fails.
+
+    Args:
+        tex_file : root LaTeX file of the spec
+        interval : seconds between two polls of the spec files
+        options : keyword arguments of run_pipeline
+    """
+    memo = {}
+    files, stamps = [Path(tex_file).resolve()], None
+    quiet = is_quiet()
+    set_quiet(True)
+    print(f"Watching {tex_file}, Ctrl+C to stop")
+    try:
+        while True:
+            current = _stamps(files)
+            if current != stamps:
+                start = time.perf_counter()
+                output = io.StringIO()
+                try:
+                    with contextlib.redirect_stdout(output):
+                        with LatexSpec(tex_file) as spec:
+                            files = spec.files()
+                        current = _stamps(files)
+                        timings = run_pipeline(tex_file, memo=memo, **options)
+                    if timings is None:
+                        # what made the run fail, the issues of --check for one
+                        print(output.getvalue(), end="")
+                        message = "❌ generation failed"
+                    else:
+                        message = (f"regenerated in {(time.perf_counter() - start) * 1000:.1f}ms "
+                                   f"({_format_timings(timings)})")
+                except (OSError, ValueError) as e:
+                    message = f"❌ {e}"
+                print(f"[{time.strftime('%H:%M:%S')}] {message}", flush=True)
+                stamps = current
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print()
+    finally:
+        set_quiet(quiet)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate the CSR RTL of a LaTeX spec in a single process')
+    parser.add_argument('-i', '--input', default='src/ipMap.tex', help='root LaTeX file (default: src/ipMap.tex)')
+    parser.add_argument('-o', '--output-dir', default='build', help='build directory (default: build)')
+    parser.add_argument('-b', '--bus-width', type=int, default=32, help='bus width (default: 32)')
+    parser.add_argument('-a', '--addr-width', type=int, default=3, help='address width (default: 3)')
+    parser.add_argument('-p', '--bus', choices=['apb4', 'axi4lite'], default='apb4',
+                        help='bus protocol (default: apb4)')
+    parser.add_argument('--multirow-columns', type=int, nargs='+', metavar='COL',
+                        help='0-based columns whose \\multirow values are carried down (default: all)')
+    parser.add_argument('--write-csv', action='store_true', help='also write the CSV intermediates')
+    parser.add_argument('--write-ipxact', action='store_true', help='also write the IP-XACT intermediate')
+    parser.add_argument('--write-db', action='store_true',
+                        help='also write the SQLite register database <output-dir>/db/ipMap.db')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='run every stage, without reading or filling <output-dir>/.cache')
+    parser.add_argument('--check', action='store_true',
+                        help='fail on address map and field issues: overlaps, misaligned registers, registers past their '
+                             'block, reset and enum values wider than their field')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='worker processes writing the RTL by address block, 0 for one per CPU (default: 1); at most one '
+                             'per CPU, maps under 20000 fields are written in one process')
+    parser.add_argument('-w', '--watch', action='store_true',
+                        help='keep running, regenerate each time a file of the spec changes')
+    parser.add_argument('--interval', type=float, default=0.2,
+                        help='seconds between two polls of the spec files in watch mode (default: 0.2)')
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='no per-row, per-register and per-file messages')
+    parser.add_argument('--profile', action='store_true',
+                        help='print the wall and CPU time of each stage and step')
+    parser.add_argument('--trace', metavar='FILE',
+                        help='write the stages and steps as a Chrome trace (chrome://tracing, Perfetto)')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='also record the tracemalloc peak of each step (slower)')
+
+    args = parser.parse_args()
+    set_quiet(args.quiet)
+
+    if args.watch:
+        return watch(args.input, args.interval, output_dir=args.output_dir, bus_width=args.bus_width,
+                     addr_width=args.addr_width, bus_protocol=args.bus,
+                     multirow_columns=args.multirow_columns, write_csv=args.write_csv,
+                     write_ipxact=args.write_ipxact, write_db=args.write_db, use_cache=not args.no_cache,
+                     check=args.check, jobs=args.jobs)
+
+    profiler = Profiler(args.trace_memory)
+    start = time.perf_counter()
+    try:
+        with profiler if args.profile or args.trace or args.trace_memory else contextlib.nullcontext():
+            timings = run_pipeline(args.input, args.output_dir, args.bus_width, args.addr_width, args.bus,
+                                   args.multirow_columns, args.write_csv, args.write_ipxact, args.write_db,
+                                   use_cache=not args.no_cache, check=args.check, jobs=args.jobs)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+    if timings is None:
+        print("❌ Generation failed")
+        return 1
+
+    print(f"{_format_timings(timings)} total={(time.perf_counter() - start) * 1000:.1f}ms")
+    if profiler.events:
+        print(f"\n{profiler.summary()}")
+    if args.trace:
+        print(f"Trace written: {profiler.write_trace(args.trace)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
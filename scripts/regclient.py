@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Client of regserver.py.
+
+Sends one request to the server and prints the response; it imports no
+generator module, so a call costs little more than the interpreter
+start-up. Any client able to write a JSON line to a Unix socket works as
+well, e.g. `echo '{"op": "stats"}' | socat - UNIX-CONNECT:build/regserver.sock`.
+"""
+import sys
+import json
+import socket
+import argparse
+from pathlib import Path
+
+DEFAULT_SOCKET = "build/regserver.sock"
+
+
+def request(payload, socket_path=DEFAULT_SOCKET, timeout=None):
+    """
+    Send a request to the server and return its response
+
+    Args:
+        payload : request, a dict with at least "op"
+        socket_path : socket of the server
+        timeout : seconds to wait for the response, None to wait for ever
+
+    Returns:
+        dict: the response, with "ok" and "error" when it is false
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(str(socket_path))
+        sock.sendall(json.dumps(payload).encode('utf-8') + b"\n")
+        with sock.makefile('rb') as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError(f"No response from {socket_path}")
+    return json.loads(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Send a request to regserver.py')
+    parser.add_argument('-s', '--socket', default=DEFAULT_SOCKET, help=f'socket path (default: {DEFAULT_SOCKET})')
+    parser.add_argument('--json', action='store_true', help='print the raw JSON response')
+    subparsers = parser.add_subparsers(dest='op', required=True)
+
+    generate = subparsers.add_parser('generate', help='generate the RTL of a LaTeX or IP-XACT spec')
+    generate.add_argument('spec', help='root LaTeX file or IP-XACT file')
+    generate.add_argument('-o', '--output-dir', default='build/rtl', help='RTL directory (default: build/rtl)')
+    generate.add_argument('--block', dest='blocks', action='append', metavar='NAME',
+                          help='only this address block (e.g. IP-B), may be repeated')
+    generate.add_argument('-b', '--bus-width', type=int, default=32, help='bus width of a LaTeX spec (default: 32)')
+
+    validate = subparsers.add_parser('validate', help='validate a register table CSV')
+    validate.add_argument('csv', help='register table CSV')
+
+    lookup = subparsers.add_parser('lookup', help='fields at an address, e.g. 0x4000_1008[7:4]')
+    lookup.add_argument('spec', help='root LaTeX file or IP-XACT file')
+    lookup.add_argument('address', help='byte address with an optional [msb:lsb] or [bit]')
+    lookup.add_argument('-b', '--bus-width', type=int, default=32, help='bus width of a LaTeX spec (default: 32)')
+
+    check = subparsers.add_parser('check', help='address map issues of a spec')
+    check.add_argument('spec', help='root LaTeX file or IP-XACT file')
+    check.add_argument('-b', '--bus-width', type=int, default=32,
+                       help='bus width the registers are aligned to (default: 32)')
+
+    subparsers.add_parser('stats', help='cache statistics of the server')
+    subparsers.add_parser('shutdown', help='stop the server')
+
+    args = parser.parse_args()
+    payload = {'op': args.op}
+    # paths are sent absolute, the server may run from another directory
+    if args.op == 'generate':
+        payload.update(spec=str(Path(args.spec).resolve()), output_dir=str(Path(args.output_dir).resolve()),
+                       blocks=args.blocks or [], bus_width=args.bus_width)
+    elif args.op == 'validate':
+        payload['csv'] = str(Path(args.csv).resolve())
+    elif args.op == 'lookup':
+        payload.update(spec=str(Path(args.spec).resolve()), address=args.address, bus_width=args.bus_width)
+    elif args.op == 'check':
+        payload.update(spec=str(Path(args.spec).resolve()), bus_width=args.bus_width)
+
+    try:
+        response = request(payload, args.socket)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: cannot reach the server on {args.socket}: {e}")
+        return 1
+
+    if args.json:
+        print(json.dumps(response, indent=2))
+    elif not response['ok']:
+        print(f"❌ Error: {response['error']}")
+        if response.get('log'):
+            print(response['log'], end='')
+    elif args.op == 'generate':
+        print("\n".join(response['files']))
+    elif args.op == 'validate':
+        print(f"{args.csv}: {response['registers']} registers, {response['fields']} fields")
+    elif args.op == 'lookup':
+        for field in response['fields']:
+            bits = f"[{field['msb']}:{field['lsb']}]" if field['msb'] != field['lsb'] else f"[{field['lsb']}]"
+            print(f"{field['address']}{bits} {field['path']} ({field['access']})")
+    elif args.op == 'check':
+        for issue in response['issues']:
+            print(f"{issue['address']} {issue['path']}: {issue['message']}")
+    elif args.op == 'stats':
+        print(json.dumps({key: value for key, value in response.items() if key not in ('ok', 'ms')}, indent=2))
+    if 'ms' in response:
+        print(f"{response['ms']:.3f}ms on the server", file=sys.stderr)
+    if not response['ok'] or (args.op == 'lookup' and not response['fields']) or response.get('issues'):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
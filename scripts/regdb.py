@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Register database: export an IP-XACT file to SQLite and query it.
+
+The database (also written by `pipeline.py --write-db`) indexes the
+registers by absolute address and the fields by hierarchical name
+(`block.register.field`) and access type, so a lookup does not parse the
+IP-XACT again.
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from tools.register_db import RegisterDB, export_component, parse_location
+from ipxact2rtl import parse_ipxact
+
+
+def cmd_export(args):
+    component = parse_ipxact(args.input)
+    if component is None:
+        return 1
+    start = time.perf_counter()
+    export_component(component, args.output)
+    print(f"Register database written: {args.output} ({time.perf_counter() - start:.2f}s)")
+    return 0
+
+
+def cmd_lookup(args):
+    address, msb, lsb = parse_location(args.address)
+    with RegisterDB(args.db) as db:
+        start = time.perf_counter()
+        fields = db.fields_at(address, msb, lsb)
+        elapsed = time.perf_counter() - start
+    return _print_fields(fields, elapsed)
+
+
+def cmd_find(args):
+    with RegisterDB(args.db) as db:
+        start = time.perf_counter()
+        fields = db.find(args.pattern)
+        elapsed = time.perf_counter() - start
+    return _print_fields(fields, elapsed)
+
+
+def cmd_access(args):
+    with RegisterDB(args.db) as db:
+        start = time.perf_counter()
+        fields = db.fields_by_access(args.access)
+        elapsed = time.perf_counter() - start
+    return _print_fields(fields, elapsed)
+
+
+def _print_fields(fields, elapsed):
+    for field in fields:
+        print(field)
+    print(f"{len(fields)} field(s) in {elapsed * 1000:.3f}ms", file=sys.stderr)
+    return 0 if fields else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export IP-XACT to a SQLite register database and query it')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export = subparsers.add_parser('export', help='write the database of an IP-XACT file')
+    export.add_argument('-i', '--input', default='build/ipxact/ipMap.xml',
+                        help='IP-XACT file (default: build/ipxact/ipMap.xml)')
+    export.add_argument('-o', '--output', default='build/db/ipMap.db',
+                        help='database file (default: build/db/ipMap.db)')
+    export.set_defaults(func=cmd_export)
+
+    lookup = subparsers.add_parser('lookup', help='fields at an address, e.g. 0x4000_1008[7:4]')
+    lookup.add_argument('db', help='database file')
+    lookup.add_argument('address', help='byte address with an optional [msb:lsb] or [bit]')
+    lookup.set_defaults(func=cmd_lookup)
+
+    find = subparsers.add_parser('find', help='fields whose block.register.field name matches a glob')
+    find.add_argument('db', help='database file')
+    find.add_argument('pattern', help="glob pattern, e.g. 'IP-A.*' or '*.ctrl.*'")
+    find.set_defaults(func=cmd_find)
+
+    access = subparsers.add_parser('access', help='fields of an access type')
+    access.add_argument('db', help='database file')
+    access.add_argument('access', help='IP-XACT access type, e.g. read-only')
+    access.set_defaults(func=cmd_access)
+
+    args = parser.parse_args()
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Resident generator server.
+
+Keeps the register models of the specs it has loaded in memory and answers
+JSON requests on a Unix domain socket, so that the CI and editor
+integrations pay neither the interpreter start-up nor the parsing of the
+spec on every call. Requests and responses are one JSON object per line;
+a connection may send several requests. See regclient.py for a client.
+
+Requests:
+    {"op": "generate", "spec": ..., "output_dir": ..., "blocks": [...], "jobs": 1}
+        RTL package and module of a spec (LaTeX or IP-XACT), optionally of
+        some address blocks only, optionally written by worker processes.
+    {"op": "validate", "csv": ...}
+        Validate a register table CSV, as csv2ipxact reads it.
+    {"op": "lookup", "spec": ..., "address": "0x4000_1008[7:4]"}
+        Fields at an address.
+    {"op": "check", "spec": ..., "bus_width": 32}
+        Address map and field issues of a spec: overlaps, misaligned
+        registers, registers past the range of their block, reset and enum
+        values wider than their field.
+    {"op": "stats"}, {"op": "shutdown"}
+
+Every response has "ok", and "error" when it is false. Loaded specs are
+kept in a bounded LRU cache and reloaded when one of their files changes
+(modification time or size).
+"""
+import io
+import re
+import sys
+import json
+import time
+import argparse
+import contextlib
+import socketserver
+from collections import OrderedDict
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from tools.instrument import set_quiet
+from tools.register_db import FieldInfo, parse_location
+from tools.register_model import Component
+from tools.address_check import IntervalIndex, check_address_map
+from tools.field_check import check_fields
+from csv2ipxact import read_csv_data
+from ipxact2rtl import generate_rtl
+from pipeline import load_component, _stamps
+
+
+DEFAULT_SOCKET = "build/regserver.sock"
+
+
+class LoadedSpec:
+    """
+    A spec loaded by the server: its register model, the files it was read
+    from with their (mtime_ns, size) at load time, and an address index
+    built on the first lookup. Register arrays are indexed whole, the
+    element at an address is only created by the lookup.
+    """
+
+    def __init__(self, component: Component, files: list[Path]) -> None:
+        self.component = component
+        self.files = files
+        self.stamps = _stamps(files)
+        self._index = None
+
+    def is_stale(self) -> bool:
+        return _stamps(self.files) != self.stamps
+
+    def fields_at(self, address: int, msb: int | None = None, lsb: int | None = None) -> list[FieldInfo]:
+        """Fields of the registers covering byte `address`, as RegisterDB.fields_at"""
+        if self._index is None:
+            # a register array is one interval, from its first element to the end of its last one
+            registers = [(block.name, reg) for block in self.component.blocks for reg in block.registers]
+            self._index = IntervalIndex([reg.address for _, reg in registers],
+                                        [reg.address + reg.span for _, reg in registers], registers)
+        if msb is not None:
+            lsb, msb = min(lsb, msb), max(lsb, msb)
+        fields = []
+        for block_name, reg in self._index.covering(address):
+            if reg.dim > 1:
+                i, byte = divmod(address - reg.address, reg.stride)
+                if byte >= reg.size // 8:
+                    continue  # between two elements
+                reg = reg.element(i)
+            reg_path = f"{block_name}.{reg.name}"
+            # bits of the request counted from the base of the register
+            base = (address - reg.address) * 8
+            for f in sorted(reg.fields.values(), key=lambda f: f.bit_offset):
+                if msb is not None and (f.bit_offset > base + msb or f.bit_offset + f.bit_width - 1 < base + lsb):
+                    continue
+                fields.append(FieldInfo(f"{reg_path}.{f.name}", reg_path, reg.address, f.bit_offset, f.bit_width,
+                                        f.access, f.volatile, f.reset_value, f.description, f.enum))
+        return fields
+
+
+def load_spec(spec_file: Path, bus_width: int = 32) -> LoadedSpec:
+    """
+    Register model of a LaTeX spec or of an IP-XACT file, see
+    pipeline.load_component.
+
+    Raises:
+        ValueError: If the spec cannot be read.
+    """
+    return LoadedSpec(*load_component(spec_file, bus_width))
+
+
+class SpecCache:
+    """
+    Loaded specs by (path, bus width), least recently used first; the
+    oldest one is dropped past `capacity`.
+    """
+
+    def __init__(self, capacity: int = 8) -> None:
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = self.misses = self.reloads = self.evictions = 0
+
+    def get(self, spec_file: str | Path, bus_width: int = 32) -> tuple[LoadedSpec, bool]:
+        """(loaded spec, True if it came from the cache)"""
+        key = (Path(spec_file).resolve(), bus_width)
+        entry = self.entries.get(key)
+        if entry is not None:
+            if not entry.is_stale():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry, True
+            del self.entries[key]
+            self.reloads += 1
+        else:
+            self.misses += 1
+
+        if not key[0].is_file():
+            raise FileNotFoundError(f"Spec not found: {key[0]}")
+        entry = self.entries[key] = load_spec(key[0], bus_width)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+        return entry, False
+
+    def stats(self) -> dict:
+        return {'capacity': self.capacity, 'hits': self.hits, 'misses': self.misses,
+                'reloads': self.reloads, 'evictions': self.evictions,
+                'specs': [str(path) for path, _ in self.entries]}
+
+
+def select_blocks(component: Component, names: list[str]) -> Component:
+    """
+    Component of some address blocks of `component`, with the enum types
+    they use; named <component>_<block>... so that its files do not
+    replace those of the whole map.
+
+    Raises:
+        ValueError: If a block is not in the component.
+    """
+    blocks = {block.name: block for block in component.blocks}
+    missing = [name for name in names if name not in blocks]
+    if missing:
+        raise ValueError(f"Unknown address block(s) {missing}, expected some of {list(blocks)}")
+    selected = [blocks[name] for name in names]
+    used = {f.enum for block in selected for reg in block.registers for f in reg.fields.values() if f.enum}
+    name = "_".join([component.name] + [re.sub(r'\W', '_', block) for block in names])
+    return Component(name, selected, {enum: values for enum, values in component.enums.items() if enum in used},
+                     component.addr_width)
+
+
+class RegisterServer(socketserver.UnixStreamServer):
+    """Unix socket server answering the requests one at a time, with a SpecCache"""
+
+    def __init__(self, socket_path: str | Path, capacity: int = 8) -> None:
+        self.cache = SpecCache(capacity)
+        self.shutting_down = False
+        self.socket_path = Path(socket_path)
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        super().__init__(str(self.socket_path), _RequestHandler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+    def handle_request_data(self, request: dict) -> dict:
+        """Response to a decoded request"""
+        op = request.get('op')
+        handler = getattr(self, f"op_{op}", None) if isinstance(op, str) else None
+        if handler is None:
+            return {'ok': False, 'error': f"Unknown op {op!r}"}
+        start = time.perf_counter()
+        log = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+                response = handler(request)
+        except KeyError as e:
+            response = {'ok': False, 'error': f"Missing request key {e}"}
+        except (OSError, ValueError) as e:
+            response = {'ok': False, 'error': str(e)}
+        if not response['ok'] and log.getvalue():
+            response['log'] = log.getvalue()
+        response['ms'] = round((time.perf_counter() - start) * 1000, 3)
+        return response
+
+    def op_generate(self, request):
+        entry, cached = self.cache.get(request['spec'], int(request.get('bus_width', 32)))
+        component = entry.component
+        if request.get('blocks'):
+            component = select_blocks(component, request['blocks'])
+        output_dir = Path(request.get('output_dir', 'build/rtl')).resolve()
+        if not generate_rtl(component, output_dir, jobs=int(request.get('jobs', 1))):
+            return {'ok': False, 'error': "generation failed"}
+        return {'ok': True, 'cached': cached,
+                'files': [str(output_dir / f"{component.name}_pkg.sv"), str(output_dir / f"{component.name}.sv")]}
+
+    def op_validate(self, request):
+        registers = read_csv_data(request['csv'])
+        return {'ok': True, 'registers': len(registers),
+                'fields': sum(len(reg['fields']) for reg in registers.values())}
+
+    def op_lookup(self, request):
+        entry, cached = self.cache.get(request['spec'], int(request.get('bus_width', 32)))
+        fields = entry.fields_at(*parse_location(str(request['address'])))
+        return {'ok': True, 'cached': cached,
+                'fields': [{'path': f.path, 'address': f"0x{f.address:08X}", 'msb': f.msb, 'lsb': f.bit_offset,
+                            'access': f.access, 'reset': f.reset_value, 'enum': f.enum} for f in fields]}
+
+    def op_check(self, request):
+        bus_width = int(request.get('bus_width', 32))
+        entry, cached = self.cache.get(request['spec'], bus_width)
+        issues = check_address_map(entry.component, bus_width) + check_fields(entry.component)
+        return {'ok': True, 'cached': cached,
+                'issues': [{'kind': issue.kind, 'path': issue.path, 'address': f"0x{issue.address:08X}",
+                            'message': issue.message} for issue in issues]}
+
+    def op_stats(self, request):
+        return {'ok': True, **self.cache.stats()}
+
+    def op_shutdown(self, request):
+        self.shutting_down = True
+        return {'ok': True}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("a request is a JSON object")
+            except ValueError as e:
+                response = {'ok': False, 'error': f"Invalid request: {e}"}
+            else:
+                response = self.server.handle_request_data(request)
+            self.wfile.write(json.dumps(response).encode('utf-8') + b"\n")
+            self.wfile.flush()
+            if self.server.shutting_down:
+                break
+
+
+def serve(socket_path=DEFAULT_SOCKET, capacity=8, preload=()):
+    """Serve until a shutdown request or Ctrl+C"""
+    set_quiet(True)
+    with RegisterServer(socket_path, capacity) as server:
+        for spec_file in preload:
+            start = time.perf_counter()
+            server.cache.get(spec_file)
+            print(f"Loaded {spec_file} in {(time.perf_counter() - start) * 1000:.1f}ms")
+        print(f"Listening on {server.socket_path}, Ctrl+C to stop", flush=True)
+        try:
+            while not server.shutting_down:
+                server.handle_request()
+        except KeyboardInterrupt:
+            print()
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve generation, validation and lookup requests on a Unix socket')
+    parser.add_argument('-s', '--socket', default=DEFAULT_SOCKET, help=f'socket path (default: {DEFAULT_SOCKET})')
+    parser.add_argument('-n', '--capacity', type=int, default=8,
+                        help='number of specs kept in memory (default: 8)')
+    parser.add_argument('--preload', nargs='+', default=[], metavar='SPEC',
+                        help='LaTeX or IP-XACT specs to load at start-up')
+
+    args = parser.parse_args()
+    if args.capacity < 1:
+        parser.error("the capacity is at least 1")
+    try:
+        return serve(args.socket, args.capacity, args.preload)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
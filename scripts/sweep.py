@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Generate the RTL of a spec for several bus configurations.
+
+Takes a matrix of (bus protocol, data width, address width) variants,
+parses and validates the spec once, and writes the RTL of every variant to
+its own directory, <output-root>/<bus>_d<data width>_a<address width>/rtl.
+The register model depends only on the data width (the register size), so
+the CSR package and module are generated once per data width, in parallel
+across the widths, and copied to the other variants of that width. A
+manifest, <output-root>/manifest.json, lists the variants and their files.
+"""
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import itertools
+import contextlib
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from tools.latex_parser import LatexSpec
+from tools.instrument import set_quiet
+from latex2csv import load_register_tables, MAP_HEADER
+from csv2ipxact import map_instances, build_component
+from ipxact2rtl import parse_ipxact, generate_package, generate_module
+from gen_bus_csr import APB4RTLGenerator
+from pipeline import _table_registers
+
+
+MANIFEST_NAME = "manifest.json"
+LOG_NAME = "sweep.log"
+BUSES = ('apb4', 'axi4lite')
+
+# Set in each worker by _init_worker: what the spec parsed to, shared by every task
+_spec = None
+
+
+def parse_variant(text):
+    """(bus, data width, address width) of `apb4:32:8`"""
+    try:
+        bus, data_width, addr_width = text.split(':')
+        return check_variant(bus.lower(), int(data_width), int(addr_width))
+    except ValueError as e:
+        raise ValueError(f"Invalid variant '{text}', expected bus:data_width:addr_width ({e})") from None
+
+
+def check_variant(bus, data_width, addr_width):
+    """The variant, if gen_bus_csr accepts it"""
+    if bus not in BUSES:
+        raise ValueError(f"bus {bus} is not one of {BUSES}")
+    if not 8 <= data_width <= 1024:
+        raise ValueError(f"data width {data_width} is not between 8 and 1024 bits")
+    if not 3 <= addr_width <= 32:
+        raise ValueError(f"address width {addr_width} is not between 3 and 32 bits")
+    return bus, data_width, addr_width
+
+
+def variant_name(variant):
+    bus, data_width, addr_width = variant
+    return f"{bus}_d{data_width}_a{addr_width}"
+
+
+def parse_spec(spec_file, multirow_columns=None):
+    """
+    What every variant is generated from: ('ipxact', Component) for an
+    IP-XACT file, whose register sizes are fixed, or ('latex', (address
+    blocks, registers of each table)) for a LaTeX spec, validated once and
+    turned into a Component per data width.
+    """
+    spec_file = Path(spec_file)
+    if spec_file.suffix != '.tex':
+        component = parse_ipxact(spec_file)
+        if component is None:
+            raise ValueError(f"Could not read {spec_file}")
+        return 'ipxact', component
+
+    with LatexSpec(spec_file) as spec:
+        instances, tables = load_register_tables(spec, multirow_columns)
+    blocks, _ = map_instances(dict(zip(MAP_HEADER, row)) for row in instances)
+    registers = {label: _table_registers(rows, label) for label, rows in tables.items()}
+    return 'latex', (blocks, registers)
+
+
+def _init_worker(spec, quiet):
+    global _spec
+    _spec = spec
+    set_quiet(quiet)
+
+
+def _file_entry(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    return {'name': path.name, 'bytes': len(data), 'sha256': hashlib.sha256(data).hexdigest()}
+
+
+def _generate_width(task):
+    """
+    Worker: RTL of the variants of one data width, the CSR package and
+    module generated for the first one and copied to the others
+
+    Returns:
+        list of (variant, files or None, error or None)
+    """
+    data_width, variants, output_root = task
+    kind, spec = _spec
+    results = []
+    csr_files = None
+    for variant in variants:
+        rtl_dir = Path(output_root) / variant_name(variant) / "rtl"
+        rtl_dir.mkdir(parents=True, exist_ok=True)
+        log = io.StringIO()
+        error = None
+        try:
+            with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+                if csr_files is None:
+                    if kind == 'latex':
+                        blocks, registers = spec
+                        component = build_component(blocks, registers.__getitem__, str(data_width))
+                    else:
+                        component = spec
+                    if not (generate_package(component, rtl_dir) and generate_module(component, rtl_dir)):
+                        raise ValueError("generation failed")
+                    csr_files = [rtl_dir / f"{component.name}_pkg.sv", rtl_dir / f"{component.name}.sv"]
+                else:
+                    for path in csr_files:
+                        shutil.copyfile(path, rtl_dir / path.name)
+                bus, _, addr_width = variant
+                top = APB4RTLGenerator(bus, data_width, addr_width, rtl_dir).write_rtl_file()
+            files = [_file_entry(rtl_dir / path.name) for path in csr_files] + [_file_entry(top)]
+        except (OSError, ValueError) as e:
+            files, error = None, str(e)
+        with open(rtl_dir.parent / LOG_NAME, 'w', encoding='utf-8') as f:
+            f.write(log.getvalue())
+        results.append((variant, files, error))
+        if error is not None and csr_files is None:
+            # nothing to copy from, the other variants of this width fail the same way
+            results += [(other, None, error) for other in variants[len(results):]]
+            break
+    return results
+
+
+def run_sweep(spec_file, variants, output_root="build/sweep", jobs=0, multirow_columns=None, quiet=True):
+    """
+    Generate the RTL of every variant of a spec
+
+    Args:
+        spec_file : root LaTeX file or IP-XACT file
+        variants : (bus, data width, address width) of each variant
+        output_root : variant directories and manifest go there
+        jobs : worker processes, 0 for one per CPU
+        multirow_columns : columns whose multirow cells are carried down
+        quiet : leave the per-file messages out of the variant logs
+
+    Returns:
+        the manifest, also written to <output_root>/manifest.json
+    """
+    output_root = Path(output_root).resolve()
+    variants = list(dict.fromkeys(variants))
+    set_quiet(quiet)
+    start = time.perf_counter()
+    spec = parse_spec(spec_file, multirow_columns)
+    parse_seconds = time.perf_counter() - start
+
+    widths = {}
+    for variant in variants:
+        widths.setdefault(variant[1], []).append(variant)
+    tasks = [(data_width, group, str(output_root)) for data_width, group in widths.items()]
+
+    start = time.perf_counter()
+    workers = min(jobs or os.cpu_count() or 1, len(tasks))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(spec, quiet)) as executor:
+            results = list(executor.map(_generate_width, tasks))
+    else:
+        _init_worker(spec, quiet)
+        results = [_generate_width(task) for task in tasks]
+    generate_seconds = time.perf_counter() - start
+
+    generated = {variant: (files, error) for group in results for variant, files, error in group}
+    manifest = {
+        'spec': str(Path(spec_file).resolve()),
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'parse_seconds': round(parse_seconds, 3),
+        'generate_seconds': round(generate_seconds, 3),
+        'variants': [{'bus': bus, 'data_width': data_width, 'addr_width': addr_width,
+                      'dir': variant_name((bus, data_width, addr_width)),
+                      'files': generated[(bus, data_width, addr_width)][0],
+                      'error': generated[(bus, data_width, addr_width)][1]}
+                     for bus, data_width, addr_width in variants],
+    }
+    output_root.mkdir(parents=True, exist_ok=True)
+    with open(output_root / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate the CSR RTL of a spec for several bus configurations')
+    parser.add_argument('-i', '--input', default='src/ipMap.tex',
+                        help='root LaTeX file or IP-XACT file (default: src/ipMap.tex)')
+    parser.add_argument('-o', '--output-root', default='build/sweep',
+                        help='each variant goes to <output-root>/<bus>_d<data>_a<addr> (default: build/sweep)')
+    parser.add_argument('-p', '--bus', nargs='+', choices=BUSES, default=['apb4'],
+                        help='bus protocols of the matrix (default: apb4)')
+    parser.add_argument('-b', '--data-width', type=int, nargs='+', default=[32],
+                        help='data widths of the matrix (default: 32)')
+    parser.add_argument('-a', '--addr-width', type=int, nargs='+', default=[3],
+                        help='address widths of the matrix (default: 3)')
+    parser.add_argument('-v', '--variant', action='append', default=[], metavar='BUS:DATA:ADDR',
+                        help='a single variant, e.g. axi4lite:64:8, instead of the matrix; may be repeated')
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help='worker processes, one per data width at most, 0 for one per CPU (default: 0)')
+    parser.add_argument('--multirow-columns', type=int, nargs='+', metavar='COL',
+                        help='0-based columns whose \\multirow values are carried down (default: all)')
+
+    args = parser.parse_args()
+    try:
+        if args.variant:
+            variants = [parse_variant(text) for text in args.variant]
+        else:
+            variants = [check_variant(*variant) for variant in
+                        itertools.product(args.bus, args.data_width, args.addr_width)]
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        manifest = run_sweep(args.input, variants, args.output_root, args.jobs, args.multirow_columns)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+    failed = 0
+    for variant in manifest['variants']:
+        if variant['error'] is not None:
+            failed += 1
+            print(f"{variant['dir']}: ❌ {variant['error']}")
+        else:
+            print(f"{variant['dir']}: {', '.join(f['name'] for f in variant['files'])}")
+    print(f"\n{len(variants) - failed}/{len(variants)} variants in {Path(args.output_root) / MANIFEST_NAME} "
+          f"(parse {manifest['parse_seconds'] * 1000:.1f}ms, generation {manifest['generate_seconds'] * 1000:.1f}ms)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,9 +8,6 @@ BUILD_DIR="build"
 CLEAN_FLAG=false
 VIVADO_PARMS="--R"
 
-INPUT_XML="../build/ipxact/ipMap.xml"
-OUTPUT_DIR="../build/rtl"
-
 # help function
 show_help() {
     echo "Use: $0 [Options]"
@@ -40,7 +37,7 @@ error_exit() {
 clean_build() {
     echo "🧹 Cleaning build directory..."
     if [ -d "${BUILD_DIR}" ]; then
-        rm -rf "${BUILD_DIR}"/*
+        rm -rf "${BUILD_DIR}"/* "${BUILD_DIR}"/.cache
         echo "✅ Build directory cleaned"
     else
         echo "ℹ️  Build directory does not exist, nothing to clean"
@@ -117,27 +114,14 @@ done
 
 echo "🔄 Starting LaTeX -> RTL translation pipeline"
 
-echo "Step 1: Converting LaTeX to CSV..."
-if ! python3 scripts/latex2csv.py; then
-    error_exit "LaTeX to CSV"
-fi
-
-echo "Step 2: Converting CSV to IP-XACT (BUS_WIDTH=${BUS_WIDTH})..."
-if ! python3 scripts/csv2ipxact.py -s "${BUS_WIDTH}"; then
-    error_exit "CSV to IP-XACT"
-fi
-
-echo "Step 3: Generating RTL from IP-XACT..."
-if ! python3 "scripts/ipxact2rtl.py" "$INPUT_XML" "$OUTPUT_DIR"; then
-    error_exit "IP-XACT to RTL"
-fi
-
-echo "Step 4: Generating bus connection for the RegMap (BUS_WIDTH=${BUS_WIDTH}, ADDR_WIDTH=${ADDR_WIDTH}, BUS_PROTOCOL=${BUS_PROTOCOL})..."
-if ! python3 scripts/gen_bus_csr.py --bus "${BUS_PROTOCOL}" --data-width "${BUS_WIDTH}" --addr-width "${ADDR_WIDTH}"; then
-    error_exit "Generate bus logic"
+echo "Step 1: Generating CSV, IP-XACT and RTL (BUS_WIDTH=${BUS_WIDTH}, ADDR_WIDTH=${ADDR_WIDTH}, BUS_PROTOCOL=${BUS_PROTOCOL})..."
+# latex2csv, csv2ipxact, ipxact2rtl and gen_bus_csr in a single process
+if ! python3 scripts/pipeline.py -i src/ipMap.tex -o "${BUILD_DIR}" \
+        -b "${BUS_WIDTH}" -a "${ADDR_WIDTH}" -p "${BUS_PROTOCOL}" --write-csv --write-ipxact; then
+    error_exit "LaTeX to RTL"
 fi
 
-echo "Step 5: Vivado integration"
+echo "Step 2: Vivado integration"
 ./scripts/xrun.sh -top ${BUS_PROTOCOL}_tb -vivado ${VIVADO_PARMS}
 
 echo "✅ Pipeline finish with success!"
\ No newline at end of file
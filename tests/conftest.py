@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+# the tools package is imported from the repo root, as the scripts do, and
+# the scripts by module name, as they import each other
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(1, str(ROOT / "scripts"))
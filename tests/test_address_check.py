@@ -0,0 +1,81 @@
+from tools.address_check import IntervalIndex, check_address_map
+from tools.register_model import AddressBlock, Component, Field, Register
+
+
+def register(name, offset, dim=1, stride=None, size=32, base="0x40000000"):
+    return Register(name, offset, size, base, {'DATA': Field('DATA', 0, size)}, dim, stride)
+
+
+def component(*blocks):
+    return Component("CSR", list(blocks), {})
+
+
+def kinds(issues):
+    return [(issue.kind, issue.path) for issue in issues]
+
+
+def test_overlaps_report_the_interval_reaching_the_furthest():
+    index = IntervalIndex([5, 0, 11, 2, 20], [12, 10, 13, 4, 20], ['C', 'A', 'D', 'B', 'empty'])
+    assert list(index.overlaps()) == [('B', 'A'), ('C', 'A'), ('D', 'C')]
+
+
+def test_overlaps_of_intervals_starting_at_the_same_address():
+    index = IntervalIndex([0, 0, 4], [4, 8, 8], ['A', 'B', 'C'])
+    assert list(index.overlaps()) == [('B', 'A'), ('C', 'B')]
+
+
+def test_covering():
+    index = IntervalIndex([0, 4, 8], [16, 8, 12], ['A', 'B', 'C'])
+    assert index.covering(5) == ['A', 'B']
+    assert index.covering(8) == ['A', 'C']
+    assert index.covering(16) == []
+
+
+def test_clean_map_has_no_issue():
+    block = AddressBlock("IP-A", "0x40000000", [register("CTRL", "0x0"), register("STATUS", "0x4")])
+    assert check_address_map(component(block), 32) == []
+
+
+def test_register_overlap():
+    block = AddressBlock("IP-A", "0x40000000", [register("CTRL", "0x0", size=64), register("STATUS", "0x4")])
+    issues = check_address_map(component(block))
+    assert kinds(issues) == [('register-overlap', 'IP-A.STATUS')]
+    assert issues[0].message == "register overlaps register IP-A.CTRL"
+
+
+def test_register_overlap_across_blocks():
+    a = AddressBlock("IP-A", "0x40000000", [register("CTRL", "0x0")], 0x10)
+    b = AddressBlock("IP-B", "0x40000008", [register("MODE", "0x0", base="0x40000008")], 0x10)
+    assert kinds(check_address_map(component(a, b))) == [('block-overlap', 'IP-B')]
+    # a register of a block at the address of a register of another one
+    c = AddressBlock("IP-C", "0x40000000", [register("MODE", "0x0")], 0x10)
+    assert kinds(check_address_map(component(a, c))) == [('block-overlap', 'IP-C'), ('register-overlap', 'IP-C.MODE')]
+
+
+def test_misaligned_register_and_stride():
+    block = AddressBlock("IP-A", "0x40000000", [register("CTRL", "0x2"), register("LUT", "0x8", 4, 0x6)])
+    issues = check_address_map(component(block), 32)
+    assert kinds(issues) == [('misaligned', 'IP-A.CTRL'), ('misaligned', 'IP-A.LUT')]
+    assert "stride 0x6" in issues[1].message
+    # aligned to their own size without a bus width
+    assert kinds(check_address_map(component(block))) == kinds(issues)
+
+
+def test_register_past_the_range_of_its_block():
+    block = AddressBlock("IP-A", "0x40000000", [register("CTRL", "0x0"), register("LUT", "0x8", 4)], 0x10)
+    issues = check_address_map(component(block), 32)
+    assert kinds(issues) == [('out-of-range', 'IP-A.LUT')]
+    assert "offset 0x18" in issues[0].message
+
+
+def test_interleaved_arrays_do_not_overlap():
+    block = AddressBlock("IP-A", "0x40000000", [register("EVEN", "0x0", 4, 8), register("ODD", "0x4", 4, 8)])
+    assert check_address_map(component(block), 32) == []
+
+
+def test_overlap_with_an_array_element_names_the_element():
+    block = AddressBlock("IP-A", "0x40000000", [register("LUT", "0x0", 4, 8), register("CTRL", "0x10")])
+    issues = check_address_map(component(block), 32)
+    assert kinds(issues) == [('register-overlap', 'IP-A.LUT[2]')]
+    assert issues[0].message == "register overlaps register IP-A.CTRL"
+    assert issues[0].address == 0x40000010
@@ -0,0 +1,88 @@
+import random
+
+import pytest
+
+from tools.field_check import check_fields
+from tools.register_model import AddressBlock, Component, Field, Register
+
+# NumPy (True) and row by row (False), the first one when NumPy is installed
+ENGINES = [pytest.param(True, id="numpy"), pytest.param(False, id="python")]
+
+
+def component(fields, size=32, enums=None):
+    reg = Register("CTRL", "0x0", size, "0x40000000", {f.name: f for f in fields})
+    return Component("CSR", [AddressBlock("IP-A", "0x40000000", [reg])], enums or {})
+
+
+def kinds(issues):
+    return [(issue.kind, issue.path) for issue in issues]
+
+
+@pytest.fixture(params=ENGINES)
+def use_numpy(request):
+    if request.param:
+        pytest.importorskip("numpy")
+    return request.param
+
+
+def test_clean_register_has_no_issue(use_numpy):
+    fields = [Field('EN', 0, 1, reset_value="0x1"), Field('MODE', 1, 2, enum='mode_e'), Field('DATA', 8, 24)]
+    assert check_fields(component(fields, enums={'mode_e': {'0': 'A', '3': 'D'}}), use_numpy) == []
+
+
+def test_field_overlap_names_the_field_reaching_the_furthest(use_numpy):
+    fields = [Field('WIDE', 0, 8), Field('LOW', 2, 2), Field('HIGH', 6, 4), Field('TOP', 9, 2)]
+    issues = check_fields(component(fields), use_numpy)
+    assert kinds(issues) == [('field-overlap', 'IP-A.CTRL.LOW'), ('field-overlap', 'IP-A.CTRL.HIGH'),
+                             ('field-overlap', 'IP-A.CTRL.TOP')]
+    assert issues[0].message == "field [3:2] overlaps field WIDE [7:0]"
+    assert issues[2].message == "field [10:9] overlaps field HIGH [9:6]"
+
+
+def test_overlaps_stay_within_their_register(use_numpy):
+    a = Register("A", "0x0", 32, "0x40000000", {'X': Field('X', 0, 32)})
+    b = Register("B", "0x4", 32, "0x40000000", {'Y': Field('Y', 0, 8)})
+    assert check_fields(Component("CSR", [AddressBlock("IP-A", "0x40000000", [a, b])], {}), use_numpy) == []
+
+
+def test_field_past_its_register(use_numpy):
+    issues = check_fields(component([Field('DATA', 24, 16)]), use_numpy)
+    assert kinds(issues) == [('field-out-of-range', 'IP-A.CTRL.DATA')]
+    assert issues[0].message == "field ends at bit 39, past the 32-bit register"
+
+
+def test_reset_and_enum_wider_than_their_field(use_numpy):
+    fields = [Field('EN', 0, 1, reset_value="0x2"), Field('MODE', 4, 1, enum='mode_e', reset_value="'b1")]
+    issues = check_fields(component(fields, enums={'mode_e': {'0': 'OFF', '1': 'ON', '2': 'AUTO'}}), use_numpy)
+    assert kinds(issues) == [('reset-overflow', 'IP-A.CTRL.EN'), ('enum-overflow', 'IP-A.CTRL.MODE')]
+
+
+def test_issues_of_one_field_in_kind_order(use_numpy):
+    fields = [Field('A', 0, 8), Field('B', 4, 32, reset_value="0x1FFFFFFFFF")]
+    assert [issue.kind for issue in check_fields(component(fields), use_numpy)] == \
+        ['field-overlap', 'field-out-of-range', 'reset-overflow']
+
+
+def _random_component(rng):
+    enums = {f"e{i}_e": {str(v): f"V{i}_{v}" for v in range(rng.randint(1, 9))} for i in range(4)}
+    blocks = []
+    for b in range(rng.randint(1, 3)):
+        base = f"0x{0x40000000 + b * 0x1000:08X}"
+        registers = []
+        for r in range(rng.randint(0, 6)):
+            fields = {}
+            for k in range(rng.randint(0, 6)):
+                fields[f"F{k}"] = Field(f"F{k}", rng.randint(0, 35), rng.randint(1, 12),
+                                        reset_value=rng.choice(["'h0", "0x1", "0xFF", "'b101", "'d7", "junk"]),
+                                        enum=rng.choice([None, None] + list(enums)))
+            registers.append(Register(f"R{r}", f"0x{r * 8:X}", rng.choice([8, 16, 32, 64]), base, fields))
+        blocks.append(AddressBlock(f"IP{b}", base, registers))
+    return Component("CSR", blocks, enums)
+
+
+def test_numpy_and_python_report_the_same_issues():
+    pytest.importorskip("numpy")
+    rng = random.Random(0)
+    for _ in range(200):
+        c = _random_component(rng)
+        assert check_fields(c, True) == check_fields(c, False)
@@ -0,0 +1,119 @@
+import os
+
+import pytest
+
+from latex2csv import process_latex_tables
+from tools.latex_parser import (LatexSpec, _split_cells, _tokenize_cells, build_table_index, iter_table_rows,
+                                walk_address_map)
+
+
+def table(label, rows, caption="Table", label_first=True):
+    """A table environment, its label before the caption or after the tabular"""
+    body = f"\\begin{{tabular}}{{|l|l|}}\n{rows}\n\\end{{tabular}}\n"
+    if label_first:
+        return f"\\begin{{table}}\n\\label{{{label}}}\n\\caption{{{caption}}}\n{body}\\end{{table}}\n"
+    return f"\\begin{{table}}\n\\caption{{{caption}}}\n{body}\\label{{{label}}}\n\\end{{table}}\n"
+
+
+MAP = table("table:system_address_map",
+            "IP & Description & Base Address & REF \\\\\n"
+            "IP-A & first & 0x4000\\_0000 & \\ref{table:IP-A} \\\\\n"
+            "IP-B & second & 0x4000\\_1000 & \\ref{table:IP-B} \\\\")
+
+
+def registers(name, field):
+    return table(f"table:{name}", f"Register & Field \\\\\nCTRL & {field} \\\\")
+
+
+def write_spec(root, a_field="EN", b_field="MODE"):
+    (root / "ip_a.tex").write_text(registers("IP-A", a_field))
+    (root / "ip_b.tex").write_text(registers("IP-B", b_field))
+    (root / "main.tex").write_text(f"\\begin{{document}}\n{MAP}\\input{{ip_a}}\n% \\input{{missing}}\n"
+                                   "\\input{ip_b.tex}\n\\end{document}\n")
+    return root / "main.tex"
+
+
+def test_label_before_and_after_the_caption():
+    index = build_table_index(table("table:before", "a & b \\\\", "First") +
+                              table("table:after", "c & d \\\\", "Second", label_first=False))
+    assert index.labels() == ["table:before", "table:after"]
+    assert index.get("table:before").caption == "First"
+    assert index.get("table:after").caption == "Second"
+    assert index.body("table:after").strip() == "c & d \\\\"
+    assert index.body("table:missing") is None
+
+
+def test_table_of_an_input_file(tmp_path):
+    with LatexSpec(write_spec(tmp_path)) as spec:
+        assert spec.files() == [tmp_path / "main.tex", tmp_path / "ip_a.tex", tmp_path / "ip_b.tex"]
+        path, entry = spec.entry("table:IP-B")
+        assert path == tmp_path / "ip_b.tex"
+        assert list(iter_table_rows(spec.table("table:IP-B"))) == [["Register", "Field"], ["CTRL", "MODE"]]
+        # only the files holding a table that was asked for are tokenized
+        assert spec.tokenized_files() == [tmp_path / "ip_b.tex"]
+        with pytest.raises(ValueError):
+            spec.table("table:IP-C")
+
+
+@pytest.mark.parametrize("cell", ["\\multirow{2}{*}{X}", "\\multirow[t]{2}{*}{X}", "\\multirow{2}*{X}",
+                                  "\\multirow[c]{2}[1]{=}[1pt]{\\textbf{X}}", "\\multirow{2}{3cm}{X}"])
+def test_multirow_forms_are_carried(cell):
+    rows = f"{cell} & a \\\\ \\cline{{2-2}}\n & b \\\\ \\hline\nY & c \\\\"
+    assert list(iter_table_rows(rows)) == [["X", "a"], ["X", "b"], ["Y", "c"]]
+
+
+def test_multirow_carried_in_some_columns_only():
+    rows = "\\multirow{2}{*}{CTRL} & \\multirow{2}{*}{0x0} & EN \\\\\n & & MODE \\\\"
+    assert list(iter_table_rows(rows, [0])) == [["CTRL", "0x0", "EN"], ["CTRL", "", "MODE"]]
+    assert list(iter_table_rows(rows)) == [["CTRL", "0x0", "EN"], ["CTRL", "0x0", "MODE"]]
+
+
+@pytest.mark.parametrize("row", ["\\textbf{Access\\_Policy} & RW", "\\multirow{3}{*}{CTRL} & \\cline{2-2} 0x0",
+                                 "\\texttt{\\textbf{a}} & \\hline b", "\\fontsize{7}{10}x & \\ref{table:IP-A}"])
+def test_fast_path_matches_the_state_machine(row):
+    fast_spans, spans = [], []
+    assert _split_cells(row, fast_spans) == _tokenize_cells(row, spans)
+    assert fast_spans == spans
+
+
+def test_changed_table_is_rewritten_and_unchanged_one_skipped(tmp_path, capsys):
+    out = tmp_path / "csv"
+    with LatexSpec(write_spec(tmp_path)) as spec:
+        assert process_latex_tables(spec, out)
+    assert "2 of 2 register tables regenerated" in capsys.readouterr().out
+
+    # a touched file whose table is the same is looked up, but not rewritten
+    stamp = os.stat(tmp_path / "ip_a.tex").st_mtime_ns
+    os.utime(tmp_path / "ip_a.tex", ns=(stamp + 10**9, stamp + 10**9))
+    (tmp_path / "ip_b.tex").write_text(registers("IP-B", "SPEED"))
+    with LatexSpec(tmp_path / "main.tex") as spec:
+        assert process_latex_tables(spec, out)
+        assert tmp_path / "ip_a.tex" in spec.tokenized_files()
+    assert "1 of 2 register tables regenerated" in capsys.readouterr().out
+    assert (out / "RegisterMap_IP-B.csv").read_text().splitlines()[-1] == "CTRL,SPEED"
+
+    # an untouched file is not even tokenized
+    with LatexSpec(tmp_path / "main.tex") as spec:
+        assert process_latex_tables(spec, out)
+        assert spec.tokenized_files() == []
+    assert "0 of 2 register tables regenerated" in capsys.readouterr().out
+
+
+def test_reference_cycle():
+    maps = {
+        "table:top": "IP & Base Address & REF \\\\\nSUB & 0x1000 & \\ref{table:sub} \\\\",
+        "table:sub": "IP & Base Address & REF \\\\\nTOP & 0x0 & \\ref{table:top} \\\\",
+    }
+    with pytest.raises(ValueError, match="table:top -> table:sub -> table:top"):
+        walk_address_map(maps.__getitem__, "table:top")
+
+
+def test_shared_table_is_walked_once_per_instance():
+    fetched = []
+    tables = {
+        "table:top": "IP & Base Address & REF \\\\\nA & 0x1000 & \\ref{table:ip} \\\\\nB & 0x2000 & \\ref{table:ip} \\\\",
+        "table:ip": "Register & Offset \\\\\nCTRL & 0x0 \\\\",
+    }
+    root = walk_address_map(lambda label: fetched.append(label) or tables[label], "table:top")
+    assert [(leaf.name, leaf.base_address) for leaf in root.leaves()] == [("A", 0x1000), ("B", 0x2000)]
+    assert fetched == ["table:top", "table:ip"]
@@ -0,0 +1,148 @@
+import bisect
+from operator import sub
+from dataclasses import dataclass
+
+from tools.register_model import Component
+
+# Address map checks over every address block of a component.
+#
+# The block ranges and the register spans go into one sorted interval
+# index; overlaps come out of a single sweep over it, so a map of n
+# registers is checked in O(n log n) instead of comparing every pair.
+# Each element of a register array is an interval of its own, so arrays
+# interleaved with a stride larger than their size do not overlap.
+
+
+@dataclass(frozen=True, slots=True)
+class MapIssue:
+    """
+    A problem found in the address map.
+
+    Attributes:
+        kind: 'block-overlap', 'register-overlap', 'misaligned' or
+              'out-of-range', or one of field_check.KINDS.
+        path: Block name, `block.register` or `block.register.field`.
+        address: Absolute address of the block or register.
+        message: Description of the problem.
+    """
+    kind: str
+    path: str
+    address: int
+    message: str
+
+    def __str__(self) -> str:
+        return f"0x{self.address:08X} {self.path}: {self.message}"
+
+
+class IntervalIndex:
+    """
+    Half-open intervals [start, end) with a label, sorted by start.
+
+    Args:
+        starts, ends, labels: Bounds and label of each interval, in any
+            order; parallel sequences rather than one tuple per interval,
+            which keeps the garbage collector out of large maps.
+    """
+
+    def __init__(self, starts, ends, labels) -> None:
+        order = sorted(range(len(starts)), key=starts.__getitem__)
+        self.starts = [starts[i] for i in order]
+        self.ends = [ends[i] for i in order]
+        self.labels = [labels[i] for i in order]
+        self._max_length = max(map(sub, self.ends, self.starts), default=0)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def overlaps(self):
+        """
+        (label, other label) of each interval overlapping an interval that
+        starts before it (or at the same address); `other label` is the
+        one of those reaching the furthest. One sweep in start order.
+        """
+        reach, owner = None, None
+        for start, end, label in zip(self.starts, self.ends, self.labels):
+            if end <= start:
+                continue
+            if reach is not None and start < reach:
+                yield label, owner
+            if reach is None or end > reach:
+                reach, owner = end, label
+
+    def covering(self, address: int) -> list:
+        """Labels of the intervals containing `address`, in start order"""
+        first = bisect.bisect_left(self.starts, address - self._max_length + 1)
+        last = bisect.bisect_right(self.starts, address)
+        return [self.labels[i] for i in range(first, last) if self.ends[i] > address]
+
+
+def check_address_map(component: Component, bus_width: int | None = None) -> list[MapIssue]:
+    """
+    Check the address map of a component:
+
+    - address blocks overlapping each other,
+    - registers overlapping each other, in a block or across blocks,
+    - registers, or the stride of register arrays, not aligned to the bus
+      width (to their own size by default),
+    - registers or arrays running past the range of their block.
+
+    Args:
+        component: Component to check.
+        bus_width: Bus width in bits the registers must be aligned to.
+
+    Returns:
+        list[MapIssue]: Issues in address order.
+    """
+    issues = []
+
+    bases = [int(block.base_address, 16) for block in component.blocks]
+    ends = [base + block.range for base, block in zip(bases, component.blocks)]
+    for block, other in IntervalIndex(bases, ends, component.blocks).overlaps():
+        issues.append(MapIssue('block-overlap', block.name, int(block.base_address, 16),
+                               f"address block overlaps block {other.name}"))
+
+    starts, ends, registers, owners = [], [], [], []
+    arrays = []
+    for block in component.blocks:
+        for reg in block.registers:
+            size = reg.size // 8
+            starts.append(reg.address)
+            ends.append(reg.address + size)
+            registers.append(reg)
+            owners.append(block)
+            if reg.dim > 1:
+                arrays.append((block, reg))
+            alignment = (bus_width or reg.size) // 8
+            if alignment and reg.address % alignment:
+                issues.append(MapIssue('misaligned', f"{block.name}.{reg.name}", reg.address,
+                                       f"offset {reg.offset} is not aligned to {alignment * 8} bits"))
+            elif alignment and reg.dim > 1 and reg.stride % alignment:
+                issues.append(MapIssue('misaligned', f"{block.name}.{reg.name}", reg.address,
+                                       f"array stride 0x{reg.stride:X} is not aligned to {alignment * 8} bits"))
+            if reg.abs_offset + reg.span > block.range:
+                issues.append(MapIssue('out-of-range', f"{block.name}.{reg.name}", reg.address,
+                                       f"register ends at offset 0x{reg.abs_offset + reg.span:X}, "
+                                       f"past the range 0x{block.range:X} of block {block.name}"))
+
+    # the other elements of the arrays, the first one is the register itself
+    first_element = len(starts)
+    for block, reg in arrays:
+        for address in range(reg.address + reg.stride, reg.address + reg.dim * reg.stride, reg.stride):
+            starts.append(address)
+            ends.append(address + reg.size // 8)
+            registers.append(reg)
+            owners.append(block)
+
+    def name(k):
+        reg = registers[k]
+        if reg.dim == 1:
+            return f"{owners[k].name}.{reg.name}"
+        i = (starts[k] - reg.address) // reg.stride if k >= first_element else 0
+        return f"{owners[k].name}.{reg.name}[{i}]"
+
+    # registers are labelled by position, to name them with their block
+    for i, j in IntervalIndex(starts, ends, range(len(starts))).overlaps():
+        issues.append(MapIssue('register-overlap', name(i), starts[i], f"register overlaps register {name(j)}"))
+
+    issues.sort(key=lambda issue: issue.address)
+    return issues
@@ -0,0 +1,146 @@
+import json
+import hashlib
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from tools.register_model import enum_signature
+from tools.ipxact2rtl import enum_item_name, _write_single_enum
+
+# Enum types shared by the components of a batch.
+#
+# Within a component, fields with the same enum values already share one
+# type (register_model.enum_type), but every <component>_pkg.sv still
+# declares its own copy of the `0:Off; 1:On` style types. The library
+# collects the enum signatures used by several components into one
+# package, declared once; the component packages keep their type names as
+# typedefs of the library types, so the structs and the code using them do
+# not change. A library type is named after its values only, so the same
+# values get the same name whatever batch they are generated in.
+
+DEFAULT_PACKAGE = "csr_types_pkg"
+
+# longer names are cut and made unique with a hash of the values
+_MAX_NAME = 40
+
+
+def shared_enum_name(signature: tuple[tuple[str, str], ...]) -> str:
+    """Library name of an enum type: its item names in value order"""
+    name = "_".join(enum_item_name(item) for _, item in signature)
+    if len(name) > _MAX_NAME:
+        digest = hashlib.sha256(json.dumps(signature).encode('utf-8')).hexdigest()[:8]
+        name = f"{name[:_MAX_NAME - 9].rstrip('_')}_{digest}"
+    return f"{name}_e"
+
+
+@dataclass(slots=True)
+class EnumLibrary:
+    """
+    The shared enum types of a batch.
+
+    Attributes:
+        package: Name of the SystemVerilog package declaring them.
+        enums: Library type name -> {value: item name}, in name order.
+        users: Library type name -> number of components using it.
+    """
+    package: str
+    enums: dict[str, dict[str, str]]
+    users: dict[str, int]
+    _names: dict = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._names = {enum_signature(values): name for name, values in self.enums.items()}
+
+    def shared_name(self, values: dict[str, str]) -> str | None:
+        """Library name of the type with these values, None if it is not in the library"""
+        return self._names.get(enum_signature(values))
+
+    @property
+    def key(self) -> list:
+        """What the packages generated with the library depend on, for stage_key"""
+        return [self.package, [[name, list(values.items())] for name, values in self.enums.items()]]
+
+
+def build_enum_library(enum_sets, package: str = DEFAULT_PACKAGE, min_users: int = 2) -> EnumLibrary:
+    """
+    Library of the enum types used by at least `min_users` components.
+
+    The items of the enum types of a package share its scope, so a type
+    with an item name already taken by a more widely used type is left to
+    the components.
+
+    Args:
+        enum_sets: Enum types of each component (Component.enums).
+        package: Name of the library package.
+        min_users: Components a type is used by to go into the library.
+
+    Returns:
+        EnumLibrary: The shared types.
+    """
+    users = Counter()
+    for enums in enum_sets:
+        users.update({enum_signature(values) for values in enums.values()})
+
+    candidates = sorted((signature for signature, count in users.items() if count >= min_users),
+                        key=lambda signature: (-users[signature], shared_enum_name(signature), signature))
+    items, chosen = set(), {}
+    for signature in candidates:
+        names = {enum_item_name(item) for _, item in signature}
+        name = shared_enum_name(signature)
+        if name in chosen or names & items:
+            continue
+        items |= names
+        chosen[name] = signature
+    return EnumLibrary(package, {name: dict(chosen[name]) for name in sorted(chosen)},
+                       {name: users[chosen[name]] for name in sorted(chosen)})
+
+
+def _library_text(library: EnumLibrary) -> str:
+    out = [f"// Package {library.package} - Automatically generated\n",
+           "// Enum types shared by the CSR packages\n\n",
+           f"package {library.package};\n\n"]
+    for name, values in library.enums.items():
+        _write_single_enum(out, name, values)
+    out.append("endpackage\n")
+    return "".join(out)
+
+
+def write_enum_library(library: EnumLibrary, output_dir: str | Path) -> Path:
+    """Write <output_dir>/<package>.sv"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_file = output_dir / f"{library.package}.sv"
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(_library_text(library))
+    return output_file
+
+
+def _declaration(name: str, values: dict[str, str]) -> str:
+    out = []
+    _write_single_enum(out, name, values)
+    return "".join(out)
+
+
+def library_savings(library: EnumLibrary, enum_sets) -> dict:
+    """
+    Enum declarations and bytes of enum declarations the components would
+    elaborate without the library and with it (the library counted once).
+    """
+    declarations = declarations_shared = 0
+    size = size_shared = 0
+    for enums in enum_sets:
+        for name, values in enums.items():
+            text = _declaration(name, values)
+            declarations += 1
+            size += len(text)
+            shared = library.shared_name(values)
+            if shared is None:
+                declarations_shared += 1
+                size_shared += len(text)
+            else:
+                size_shared += len(f"    typedef {library.package}::{shared} {name};\n\n")
+    for name, values in library.enums.items():
+        declarations_shared += 1
+        size_shared += len(_declaration(name, values))
+    return {'types': len(library.enums), 'declarations': declarations,
+            'declarations_shared': declarations_shared, 'bytes': size, 'bytes_shared': size_shared}
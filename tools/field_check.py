@@ -0,0 +1,154 @@
+from bisect import bisect_right
+from itertools import accumulate
+from operator import attrgetter
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the checks fall back to plain Python
+    np = None
+
+from tools.register_model import Component
+from tools.address_check import MapIssue
+from tools.ipxact_builder import IPXACT2022Generator
+
+# Field checks over every register of a component.
+#
+# Every field becomes a row of a few integer columns (register, lsb, width,
+# bits of the reset value, bits of the largest enum value, register size)
+# and each check is one vectorized comparison over the columns, so a map
+# with a million fields is checked in a fraction of a second. Values are
+# compared by their bit length rather than by value: a reset of a 64-bit
+# or wider field does not fit a NumPy integer. Without NumPy the same
+# checks run row by row and report the same issues.
+
+# order of the issues of one field
+KINDS = ('field-overlap', 'field-out-of-range', 'reset-overflow', 'enum-overflow')
+
+
+def _value_bits(text: str | None) -> int:
+    """Bits of a reset or enum value as the IP-XACT builder parses it, 0 if it does not parse"""
+    try:
+        return IPXACT2022Generator().parse_reset_value(text).bit_length()
+    except ValueError:
+        return 0
+
+
+def _fields(component: Component):
+    """(registers with their block, fields, bits of each reset value, bits of the largest value of each enum)"""
+    registers = [(block, reg) for block in component.blocks for reg in block.registers]
+    fields = [f for _, reg in registers for f in reg.fields.values()]
+    # few distinct reset values and enum types: parse each once
+    resets = {text: _value_bits(text) for text in set(map(attrgetter('reset_value'), fields))}
+    enums = {name: max(map(_value_bits, values), default=0) for name, values in component.enums.items()}
+    return registers, fields, resets, enums
+
+
+def _issue(kind, register, fields, i, other=None):
+    block, reg = register
+    f = fields[i]
+    path = f"{block.name}.{reg.name}.{f.name}"
+    msb = f.bit_offset + f.bit_width - 1
+    if kind == 'field-overlap':
+        message = f"field {f.bit_select} overlaps field {fields[other].name} {fields[other].bit_select}"
+    elif kind == 'field-out-of-range':
+        message = f"field ends at bit {msb}, past the {reg.size}-bit register"
+    elif kind == 'reset-overflow':
+        message = f"reset value {f.reset_value} does not fit in {f.bit_width} bit(s)"
+    else:
+        message = f"enum {f.enum} has values that do not fit in {f.bit_width} bit(s)"
+    return MapIssue(kind, path, reg.address, message)
+
+
+def _find_numpy(registers, fields, resets, enums):
+    """(field, kind, other field) of each issue, by column"""
+    count = len(fields)
+    counts = np.fromiter((len(reg.fields) for _, reg in registers), dtype=np.int64, count=len(registers))
+    reg = np.repeat(np.arange(len(registers)), counts)
+    # one list comprehension per column: faster than fromiter over attrgetter
+    lsb = np.array([f.bit_offset for f in fields], dtype=np.int64)
+    width = np.array([f.bit_width for f in fields], dtype=np.int64)
+    reset_bits = np.array([resets[f.reset_value] for f in fields], dtype=np.int64)
+    enum_bits = np.array([enums.get(f.enum, 0) for f in fields], dtype=np.int64)
+    size = np.fromiter((r.size for _, r in registers), dtype=np.int64, count=len(registers))[reg]
+    end = lsb + width
+    found = []
+
+    # sweep of the fields of each register in lsb order: a field overlaps
+    # the field reaching the furthest among those before it. Offsetting the
+    # ends by register keeps one running maximum from crossing registers.
+    order = np.lexsort((lsb, reg))
+    scale = int(end.max(initial=0)) + 1
+    base = reg[order] * scale
+    key = base + end[order]
+    reach = np.maximum.accumulate(key)
+    record = np.ones(count, dtype=bool)
+    record[1:] = key[1:] > reach[:-1]
+    owner = np.maximum.accumulate(np.where(record, np.arange(count), 0))
+    overlap = np.flatnonzero(base[1:] + lsb[order][1:] < reach[:-1]) + 1
+    found += [(int(order[i]), 0, int(order[owner[i - 1]])) for i in overlap]
+
+    found += [(int(i), 1, None) for i in np.flatnonzero(end > size)]
+    found += [(int(i), 2, None) for i in np.flatnonzero(reset_bits > width)]
+    found += [(int(i), 3, None) for i in np.flatnonzero(enum_bits > width)]
+    return found
+
+
+def _find_python(registers, fields, resets, enums):
+    """(field, kind, other field) of each issue, row by row"""
+    found = []
+    first = 0
+    for _, reg in registers:
+        indices = range(first, first + len(reg.fields))
+        first += len(reg.fields)
+        reach, owner = None, None
+        for i in sorted(indices, key=lambda i: fields[i].bit_offset):
+            f = fields[i]
+            end = f.bit_offset + f.bit_width
+            if reach is not None and f.bit_offset < reach:
+                found.append((i, 0, owner))
+            if reach is None or end > reach:
+                reach, owner = end, i
+        for i in indices:
+            f = fields[i]
+            if f.bit_offset + f.bit_width > reg.size:
+                found.append((i, 1, None))
+            if resets[f.reset_value] > f.bit_width:
+                found.append((i, 2, None))
+            if enums.get(f.enum, 0) > f.bit_width:
+                found.append((i, 3, None))
+    return found
+
+
+def check_fields(component: Component, use_numpy: bool | None = None) -> list[MapIssue]:
+    """
+    Check the fields of every register of a component:
+
+    - fields overlapping another field of their register,
+    - fields running past the size of their register,
+    - reset values not fitting in their field,
+    - enum types with values not fitting in their field.
+
+    Args:
+        component: Component to check.
+        use_numpy: Vectorized checks with NumPy (True), row by row (False),
+            or with NumPy if it is installed (None).
+
+    Returns:
+        list[MapIssue]: Issues in field order.
+
+    Raises:
+        ImportError: If use_numpy is True and NumPy is not installed.
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    elif use_numpy and np is None:
+        raise ImportError("NumPy is not installed")
+
+    registers, fields, resets, enums = _fields(component)
+    found = (_find_numpy if use_numpy else _find_python)(registers, fields, resets, enums)
+    found.sort(key=lambda item: item[:2])
+    if not found:
+        return []
+    # the register of each field with an issue
+    owners = list(accumulate(len(reg.fields) for _, reg in registers))
+    return [_issue(KINDS[kind], registers[bisect_right(owners, i)], fields, i, other) for i, kind, other in found]
@@ -0,0 +1,158 @@
+import os
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+# Instrumentation of the pipeline stages and of their steps.
+#
+# The code marks its steps with `with span("build XML"):`. Nothing is
+# recorded unless a Profiler is active, so the marks cost one global lookup
+# when profiling is off. Per-row and per-file messages go through `log`,
+# which --quiet turns off.
+
+_profiler = None
+_quiet = False
+_NO_SPAN = nullcontext()
+
+
+def set_quiet(quiet: bool = True) -> None:
+    """Drop the messages of `log` (per-row, per-register and per-file logs)"""
+    global _quiet
+    _quiet = quiet
+
+
+def is_quiet() -> bool:
+    return _quiet
+
+
+def log(*args, **kwargs) -> None:
+    """print, unless quiet mode is on"""
+    if not _quiet:
+        print(*args, **kwargs)
+
+
+def span(name: str, **args):
+    """
+    Context manager recording a step in the active Profiler, if any.
+
+    Args:
+        name: Name of the step, spans of the same name are summed up in
+              the summary.
+        **args: Details stored with the trace event (table name, ...).
+    """
+    if _profiler is None:
+        return _NO_SPAN
+    return _profiler.span(name, **args)
+
+
+class Profiler:
+    """
+    Records the wall time, CPU time and, optionally, the tracemalloc peak of
+    every span while it is active (`with profiler:`).
+
+    The peak of a span is the highest traced memory reached while it runs,
+    above the traced memory when it started; tracing memory slows the
+    allocations down, so it is off by default.
+    """
+
+    def __init__(self, memory: bool = False) -> None:
+        self.memory = memory
+        self.events = []
+        self._stack = []
+        self._origin = time.perf_counter_ns()
+        self._started_tracemalloc = False
+        self._previous = None
+
+    def __enter__(self) -> "Profiler":
+        global _profiler
+        self._previous = _profiler
+        _profiler = self
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        return self
+
+    def __exit__(self, *exc) -> None:
+        global _profiler
+        _profiler = self._previous
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextmanager
+    def span(self, name: str, **args):
+        # [peak carried over the resets done by the spans inside this one]
+        frame = [0]
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                self._stack[-1][0] = max(self._stack[-1][0], peak)
+            tracemalloc.reset_peak()
+        self._stack.append(frame)
+        depth = len(self._stack) - 1
+        start = time.perf_counter_ns()
+        cpu_start = time.process_time_ns()
+        try:
+            yield
+        finally:
+            cpu = time.process_time_ns() - cpu_start
+            wall = time.perf_counter_ns() - start
+            self._stack.pop()
+            peak_bytes = None
+            if self.memory:
+                peak = max(frame[0], tracemalloc.get_traced_memory()[1])
+                if self._stack:
+                    self._stack[-1][0] = max(self._stack[-1][0], peak)
+                peak_bytes = max(0, peak - current)
+            self.events.append((name, start - self._origin, wall, cpu, peak_bytes, depth, args))
+
+    def trace_events(self) -> list[dict]:
+        """The spans as Chrome trace-event "complete" events, times in microseconds"""
+        pid = os.getpid()
+        events = []
+        for name, start, wall, cpu, peak, depth, args in sorted(self.events, key=lambda e: (e[1], e[5])):
+            details = {'cpu_ms': round(cpu / 1e6, 3)}
+            if peak is not None:
+                details['peak_kib'] = round(peak / 1024, 1)
+            details.update({key: str(value) for key, value in args.items()})
+            events.append({'name': name, 'cat': 'pipeline', 'ph': 'X', 'pid': pid, 'tid': 0,
+                           'ts': start / 1000, 'dur': wall / 1000, 'args': details})
+        return events
+
+    def write_trace(self, trace_file: str | Path) -> Path:
+        """
+        Write the spans as a Chrome trace-event JSON file, to open in
+        chrome://tracing or https://ui.perfetto.dev
+        """
+        trace_file = Path(trace_file)
+        trace_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(trace_file, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.trace_events(), 'displayTimeUnit': 'ms'}, f)
+        return trace_file
+
+    def summary(self) -> str:
+        """
+        Table of the spans summed up by name, in order of first start and
+        indented by nesting
+        """
+        rows = {}
+        for name, start, wall, cpu, peak, depth, _ in sorted(self.events, key=lambda e: (e[1], e[5])):
+            row = rows.setdefault(name, {'depth': depth, 'count': 0, 'wall': 0, 'cpu': 0, 'peak': None})
+            row['count'] += 1
+            row['wall'] += wall
+            row['cpu'] += cpu
+            if peak is not None:
+                row['peak'] = max(row['peak'] or 0, peak)
+
+        width = max([len(name) + 2 * row['depth'] for name, row in rows.items()] + [4])
+        lines = [f"{'step':<{width}} {'calls':>6} {'wall ms':>10} {'cpu ms':>10}" +
+                 (f" {'peak MiB':>9}" if self.memory else "")]
+        for name, row in rows.items():
+            line = (f"{'  ' * row['depth'] + name:<{width}} {row['count']:>6} "
+                    f"{row['wall'] / 1e6:>10.1f} {row['cpu'] / 1e6:>10.1f}")
+            if self.memory:
+                line += f" {row['peak'] / 2**20:>9.1f}" if row['peak'] is not None else f" {'-':>9}"
+            lines.append(line)
+        return "\n".join(lines)
@@ -1,14 +1,42 @@
-from datetime import datetime
+import sys
+from functools import lru_cache
 from pathlib import Path
 
-def get_absolute_path(relative_path):
-    """Converts relative paths into absolute paths based on the script's location."""
-    script_dir = Path(__file__).parent
-    return (script_dir / relative_path).resolve()
+from tools.register_model import Field, Register, enum_type
 
-def parse_register_ipxact(reg, NS, enum_cache, enum_definitions):
+def get_absolute_path(relative_path):
+    """
+    Converts relative paths into absolute paths based on the current
+    working directory. Paths used to be taken from the directory of this
+    module (`../build/ipxact/ipMap.xml` from the repo root); a path that
+    only exists from there is still found there, with a warning.
+    """
+    path = Path(relative_path)
+    resolved = path.resolve()
+    if not path.is_absolute() and not resolved.exists():
+        legacy = (Path(__file__).parent / path).resolve()
+        if legacy.exists():
+            print(f"Warning: {relative_path} is relative to the working directory now, using {legacy}",
+                  file=sys.stderr)
+            return legacy
+    return resolved
+
+@lru_cache(maxsize=None)
+def _child_tags(uri):
+    """Tag of a child element -> its local name, for the IP-XACT namespace `uri`"""
+    names = ('name', 'addressOffset', 'size', 'field', 'bitOffset', 'bitWidth', 'access', 'volatile',
+             'resets', 'reset', 'value', 'description', 'enumeratedValues', 'enumeratedValue',
+             'array', 'dim', 'stride')
+    return {f"{{{uri}}}{name}": name for name in names}
+
+def parse_register_ipxact(reg, NS, enum_cache, enum_definitions, base_address):
     """
-    Parse a single <ipxact:register> element into a Python dictionary.
+    Parse a single <ipxact:register> element into a Register.
+
+    The children of the register are decoded in one pass over them. A
+    register array (`<ipxact:array>`) stays one Register with its
+    dimension and stride; the dimensions of a multidimensional array are
+    flattened.
 
     Parameters
     ----------
@@ -20,38 +48,48 @@ def parse_register_ipxact(reg, NS, enum_cache, enum_definitions):
         Cache to reuse enum signatures across fields.
     enum_definitions : dict
         Dictionary to store unique enum definitions.
+    base_address : str
+        Base address of the address block of the register.
 
     Returns
     -------
-    dict
+    Register
         Parsed register attributes including fields.
     """
-    reg_name = reg.find('ipxact:name', NS).text
-    offset = reg.find('ipxact:addressOffset', NS).text
-    size = int(reg.find('ipxact:size', NS).text) if reg.find('ipxact:size', NS) is not None else 32
-
-    # Calculate absolute address and index
-    abs_offset = int(offset, 0)
-    reg_index = abs_offset // (size // 8)  # word alignment (bytes)
+    tags = _child_tags(NS['ipxact'])
+    found = {}
+    field_elems = []
+    dim, stride = 1, None
+    for child in reg:
+        tag = tags.get(child.tag)
+        if tag == 'field':
+            field_elems.append(child)
+        elif tag == 'array':
+            for item in child:
+                if tags.get(item.tag) == 'dim':
+                    dim *= int(item.text, 0)
+                elif tags.get(item.tag) == 'stride':
+                    stride = int(item.text, 0)
+        elif tag is not None and tag not in found:
+            found[tag] = child.text
+    reg_name = found['name']
+    offset = found['addressOffset']
+    size = int(found['size']) if 'size' in found else 32
 
     # Register fields
     fields = {}
-    for field in reg.findall('ipxact:field', NS):
+    for field in field_elems:
         field_info = parse_field_ipxact(field, NS, reg_name, enum_cache, enum_definitions)
-        fields[field_info['field_name']] = field_info
+        fields[field_info.name] = field_info
 
-    return {
-        'reg_name': reg_name,
-        'offset': offset,
-        'abs_offset': abs_offset,
-        'index': reg_index,
-        'size': size,
-        'fields': fields
-    }
+    return Register(reg_name, offset, size, base_address, fields, dim, stride)
 
 def parse_field_ipxact(field, NS, reg_name, enum_cache, enum_definitions):
     """
-    Parse a single <ipxact:field> element into a Python dictionary.
+    Parse a single <ipxact:field> element into a Field.
+
+    The children of the field are decoded in one pass over them, the
+    enumerated values included.
 
     Parameters
     ----------
@@ -68,355 +106,530 @@ def parse_field_ipxact(field, NS, reg_name, enum_cache, enum_definitions):
 
     Returns
     -------
-    dict
+    Field
         Parsed field attributes.
     """
-    field_name = field.find('ipxact:name', NS).text
-    bit_offset = int(field.find('ipxact:bitOffset', NS).text)
-    bit_width = int(field.find('ipxact:bitWidth', NS).text)
+    tags = _child_tags(NS['ipxact'])
+    found = {}
+    # without <ipxact:resets>, the reset is the first <ipxact:value> below the field
+    first_value = None
+    enum_values = {}
+    for child in field:
+        tag = tags.get(child.tag)
+        if tag == 'enumeratedValues':
+            enum_values.update(parse_enumerated_values(child, tags))
+        elif tag == 'resets':
+            found.setdefault(tag, child)
+        elif tag is not None and tag not in found:
+            found[tag] = child.text
+        if first_value is None and 'resets' not in found:
+            if tag == 'value':
+                first_value = child
+            elif len(child):
+                first_value = next(child.iter(f"{{{NS['ipxact']}}}value"), None)
+
+    field_name = found['name']
+    bit_offset = int(found['bitOffset'])
+    bit_width = int(found['bitWidth'])
 
     # Access type (default: read-write)
-    access_elem = field.find('ipxact:access', NS)
-    access = access_elem.text if access_elem is not None else 'read-write'
+    access = found.get('access', 'read-write')
 
     # Volatile (default: False)
-    volatile_elem = field.find('ipxact:volatile', NS)
-    volatile = volatile_elem is not None and volatile_elem.text.lower() == 'true'
+    volatile = 'volatile' in found and found['volatile'].lower() == 'true'
 
     # Reset value
     reset_value = "'h0"
-    resets = field.find('ipxact:resets', NS)
+    resets = found.get('resets')
     if resets is not None:
-        reset = resets.find('ipxact:reset', NS)
+        reset = next((child for child in resets if tags.get(child.tag) == 'reset'), None)
         if reset is not None:
-            reset_value_elem = reset.find('ipxact:value', NS)
+            reset_value_elem = next((child for child in reset if tags.get(child.tag) == 'value'), None)
             if reset_value_elem is not None:
                 reset_value = reset_value_elem.text
-    else:
-        reset_value_elem = field.find('.//ipxact:value', NS)
-        if reset_value_elem is not None:
-            reset_value = reset_value_elem.text
+    elif first_value is not None:
+        reset_value = first_value.text
 
     # Description
-    desc_elem = field.find('ipxact:description', NS)
-    description = desc_elem.text if desc_elem is not None else ""
+    description = found.get('description', "")
 
-    # Enumerated values
-    enum_values = parse_enumerated_values(field, NS)
+    # Enumerated values, a type is shared by the fields with the same values
     enum_name = None
     if enum_values:
-        # Unique signature for enum reuse
-        signature = tuple(sorted(enum_values.items()))
-        if signature in enum_cache:
-            enum_name = enum_cache[signature]
-        else:
-            enum_name = f"{reg_name}_{field_name}_e"
-            enum_definitions[enum_name] = enum_values
-            enum_cache[signature] = enum_name
-
-    return {
-        'field_name': field_name,
-        'bit_offset': bit_offset,
-        'bit_width': bit_width,
-        'access': access,
-        'volatile': volatile,
-        'reset_value': reset_value,
-        'description': description,
-        'enum': enum_name
-    }
-
-def parse_enumerated_values(field, NS):
-    """Extract Enums from a field"""
+        enum_name = enum_type(enum_values, reg_name, field_name, enum_cache, enum_definitions)
+
+    return Field(field_name, bit_offset, bit_width, access, volatile, reset_value, description, enum_name)
+
+def parse_enumerated_values(enumerated_values, tags):
+    """{value: name} of an <ipxact:enumeratedValues> element, given the tags of _child_tags"""
     enum_values = {}
-    for enum in field.findall('ipxact:enumeratedValues/ipxact:enumeratedValue', NS):
-        name_elem = enum.find('ipxact:name', NS)
-        value_elem = enum.find('ipxact:value', NS)
-        if name_elem is not None and value_elem is not None:
-            enum_values[value_elem.text] = name_elem.text
-    return enum_values if enum_values else None
-
-def needs_hw_input(field_info):
-    """Verify if a field need a hardware input"""
-    return (field_info['volatile'] or 
-            field_info['access'] == 'read-only' or
-            'master mode will be cleared' in field_info.get('description', '').lower())
-
-def _setup_output_file(ipxact_data, output_dir):
+    for enum in enumerated_values:
+        if tags.get(enum.tag) != 'enumeratedValue':
+            continue
+        name = value = None
+        for child in enum:
+            tag = tags.get(child.tag)
+            if tag == 'name' and name is None:
+                name = child
+            elif tag == 'value' and value is None:
+                value = child
+        if name is not None and value is not None:
+            enum_values[value.text] = name.text
+    return enum_values
+
+# The package and the module are built in an SvBuffer, a list of strings
+# written to the file with writelines about every thousand strings, between
+# two constructs: few write calls, and a memory use that does not grow with
+# the size of the file. The logic of a field, most of the module, comes
+# from a str.format template rendered once per set of field properties
+# (see _field_logic_template), so each field costs one format call
+# filling in its names instead of some twenty formatted writes. The struct
+# members and the readback entries are one f-string per field. No tuple or
+# list is created per field: on maps of a million fields these would keep
+# the garbage collector going over the whole model.
+#
+# The parts written once per register (struct members, decoders, field
+# logic, readback entries) are the sections of MODULE_SECTIONS and
+# PACKAGE_SECTIONS. A section of a register only depends on that register,
+# so the sections can be written for each address block on its own
+# (module_bodies, package_bodies, in worker processes) and put back
+# together in block order, into the same file a single pass writes.
+
+class SvBuffer(list):
+    """
+    Text of a SystemVerilog file as a list of strings. With a file,
+    `flush` writes the strings gathered so far in one call once there are
+    `chunk` of them (or with `force`), and `close` writes the rest;
+    without one, the strings are kept in the list.
+    """
+    __slots__ = ('file', 'chunk')
+
+    def __init__(self, file=None, chunk=1024):
+        super().__init__()
+        self.file = file
+        self.chunk = chunk
+
+    def flush(self, force=False):
+        if self.file is not None and (force or len(self) >= self.chunk):
+            self.file.writelines(self)
+            self.clear()
+
+    def close(self):
+        if self.file is not None:
+            self.file.writelines(self)
+            self.clear()
+
+def register_parts(component):
+    """
+    component.registers split by address block, in order: the registers
+    each block brings to the map (a register named like one of an earlier
+    block takes the place of that one, see Component). Blocks bringing no
+    register have no part.
+    """
+    parts, seen = [], set()
+    for block in component.blocks:
+        part = []
+        for reg in block.registers:
+            if reg.name not in seen:
+                seen.add(reg.name)
+                part.append(component.registers[reg.name])
+        if part:
+            parts.append(part)
+    return parts
+
+def _sections(out, writers, bodies, *args):
+    """
+    Function writing section k of `writers` to `out`: writers[k](out,
+    *args), or with `bodies` (the sections of each part, as lists or as
+    anything giving section k by index), section k of each part in order,
+    each written out before the next one is taken.
+    """
+    def section(k):
+        if bodies is None:
+            writers[k](out, *args)
+            out.flush()
+        else:
+            for body in bodies:
+                out.append(body[k])
+                out.flush(True)
+    return section
+
+def _bodies(writers, *args):
+    """Text of each section of `writers`, written with `args`"""
+    texts = []
+    for write in writers:
+        out = SvBuffer()
+        write(out, *args)
+        texts.append("".join(out))
+    return texts
+
+def write_module(out, component, bodies=None):
+    """
+    Writes the SystemVerilog module of a component to an SvBuffer.
+
+    The sections of the registers are written from the model, or taken
+    from `bodies`: the module_bodies of each of the register_parts of the
+    component, in order.
+    """
+    section = _sections(out, MODULE_SECTIONS, bodies, component, component.registers.values(), 0)
+    _write_module_header(out, component)
+    _write_module_interface(out, component)
+    _write_internal_signals(out, component)
+    _write_address_decoding(out, component, section)
+
+    # Combinational and storage structures
+    out.append("    //--------------------------------------------------------------------------\n")
+    out.append("    // Field logic\n")
+    out.append("    //--------------------------------------------------------------------------\n")
+
+    _write_field_structures(out, section)
+
+    # Logic for each field
+    section(4)
+
+    _write_write_response(out)
+    _write_readback_logic(out, component, section)
+    out.append("endmodule\n")
+
+def module_bodies(component, registers, reg_idx=0):
+    """
+    Sections of the module for `registers`, a part of the registers of
+    the component whose first one has the readback entry `reg_idx`: one
+    string per section of MODULE_SECTIONS, for write_module.
+    """
+    return _bodies(MODULE_SECTIONS, component, registers, reg_idx)
+
+def write_package(out, component, enum_library=None, bodies=None):
+    """
+    Writes the SystemVerilog package of a component to an SvBuffer.
+
+    With an EnumLibrary (tools.enum_library), the enum types it has are
+    typedefs of the library types instead of declarations of their own.
+    The sections of the registers are written from the model, or taken
+    from `bodies`, as for write_module (see package_bodies).
+    """
+    section = _sections(out, PACKAGE_SECTIONS, bodies, component, component.registers.values())
+    _write_package_header(out, component)
+    # Generate enum definitions first
+    if component.enums:
+        out.append("    // Enum definitions\n")
+        for enum_name, enum_values in component.enums.items():
+            shared = enum_library.shared_name(enum_values) if enum_library is not None else None
+            if shared is not None:
+                out.append(f"    typedef {enum_library.package}::{shared} {enum_name};\n\n")
+            else:
+                _write_single_enum(out, enum_name, enum_values)
+
+    # Generate typedef structs for input (hardware -> register)
+    _write_input_structures(out, component, section)
+    # Generate typedef structs for output (register -> hardware)
+    _write_output_structures(out, component, section)
+
+    out.append("endpackage\n")
+
+def package_bodies(component, registers):
+    """Sections of the package for `registers`, as module_bodies"""
+    return _bodies(PACKAGE_SECTIONS, component, registers)
+
+def _setup_output_file(component, output_dir):
     """save output file"""
     output_path = get_absolute_path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
-    return output_path / f"{ipxact_data['name']}.sv"
-
-def _extract_component_data(ipxact_data):
-    """Extract component data."""
-    component_name = ipxact_data['name']
-    registers = ipxact_data['registers']
-    enums = ipxact_data.get('enums', {})
-    address_info = ipxact_data.get('address_info', {})
-    
-    # calcule width
-    max_size = max([info['size'] for info in registers.values()]) if registers else 32
-    data_width = max_size - 1
-    num_regs = len(registers)
-    addr_width = 32 # will probably have an addr_width as a parameter in the future
-    
-    hw_input_regs = [r for r, info in registers.items() 
-                    if any(needs_hw_input(f_info) for f_info in info['fields'].values())]
-    
-    return {
-        'name': component_name,
-        'registers': registers,
-        'enums': enums,
-        'address_info': address_info,
-        'data_width': data_width,
-        'addr_width': addr_width,
-        'num_regs': num_regs,
-        'hw_input_regs': hw_input_regs
-    }
-
-def _write_module_header(f, component_data):
+    return output_path / f"{component.name}.sv"
+
+def _write_module_header(out, component):
     """write module header."""
-    f.write(f"// Módulo {component_data['name']} - Gerado automaticamente em {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-    f.write("// Módulo CSR completo\n\n")
-    f.write(f"import {component_data['name']}_pkg::*;\n\n")
+    out.append(f"// Módulo {component.name} - Gerado automaticamente\n")
+    out.append("// Módulo CSR completo\n\n")
+    out.append(f"import {component.name}_pkg::*;\n\n")
 
-def _write_module_interface(f, component_data):
+def _write_module_interface(out, component):
     """write module interface."""
-    f.write(f"module {component_data['name']} (\n")
-    f.write("     Bus2Reg_intf intf,\n\n")
-    
-    if component_data['hw_input_regs']:
-        f.write(f"    input {component_data['name']}__in_t hwif_in,\n")
-    f.write(f"    output {component_data['name']}__out_t hwif_out\n")
-    f.write(");\n\n")
-
-def _write_internal_signals(f, component_data):
+    out.append(f"module {component.name} (\n")
+    out.append("     Bus2Reg_intf intf,\n\n")
+
+    if component.hw_input_regs:
+        out.append(f"    input {component.name}__in_t hwif_in,\n")
+    out.append(f"    output {component.name}__out_t hwif_out\n")
+    out.append(");\n\n")
+
+def _write_internal_signals(out, component):
     """write internal signals."""
-    f.write("    logic cpuif_rd_ack;\n")
-    f.write("    logic cpuif_rd_err;\n")
-    f.write("    logic cpuif_wr_ack;\n")
-    f.write("    logic cpuif_wr_err;\n")
-    f.write(f"    logic [{component_data['data_width']}:0] cpuif_rd_data;\n")
-    f.write(f"    logic [{component_data['addr_width']-1}:0] cpuif_addr;\n\n")
-    
-    f.write("    assign cpuif_addr = intf.bus_addr;\n")
-    f.write("    assign intf.bus_ready = cpuif_rd_ack | cpuif_wr_ack;\n")
-    f.write("    assign intf.bus_rd_data = cpuif_rd_data;\n")
-    f.write("    assign intf.bus_err = cpuif_rd_err | cpuif_wr_err;\n\n")
-
-def get_addr_register(component_data, reg_name):
-
-    base_addr = component_data['registers'][reg_name]['base_address']
-    offset    = component_data['registers'][reg_name]['offset']
-
-    base_int = int(base_addr, 16)
-    offset_int = int(offset, 16)
-    result = base_int + offset_int
-    return f"{result:08X}"
-
-def _write_address_decoding(f, component_data):
+    out.append("    logic cpuif_rd_ack;\n"
+               "    logic cpuif_rd_err;\n"
+               "    logic cpuif_wr_ack;\n"
+               "    logic cpuif_wr_err;\n")
+    out.append(f"    logic [{component.data_width}:0] cpuif_rd_data;\n")
+    out.append(f"    logic [{component.addr_width-1}:0] cpuif_addr;\n\n")
+
+    out.append("    assign cpuif_addr = intf.bus_addr;\n"
+               "    assign intf.bus_ready = cpuif_rd_ack | cpuif_wr_ack;\n"
+               "    assign intf.bus_rd_data = cpuif_rd_data;\n"
+               "    assign intf.bus_err = cpuif_rd_err | cpuif_wr_err;\n\n")
+
+def _dims(reg_info):
+    """Unpacked dimension of a register array in declarations, empty for a register"""
+    return f"[{reg_info.dim}]" if reg_info.dim > 1 else ""
+
+def get_addr_register(component, reg_name):
+    """Absolute address of a register as 8 hex digits"""
+    return f"{component.registers[reg_name].address:08X}"
+
+def _write_address_decoding(out, component, section):
     """write address decode logic."""
-    f.write("    typedef struct {\n")
-    for reg_name in component_data['registers'].keys():
-        f.write(f"        logic {reg_name};\n")
-    f.write("    } decoded_reg_strb_t;\n\n")
-    
-    f.write("    decoded_reg_strb_t decoded_reg_strb;\n")
-    f.write("    logic decoded_req;\n")
-    f.write("    logic decoded_req_is_wr;\n")
-    f.write(f"    logic [{component_data['data_width']}:0] decoded_wr_data;\n")
-    f.write(f"    logic [{component_data['data_width']}:0] decoded_wr_biten;\n\n")
-    
-    f.write("    always_comb begin\n")
-    reg_list = list(component_data['registers'].keys())
-    for i, reg_name in enumerate(reg_list):
-        if component_data['addr_width'] > 0:
-            f.write(f"        decoded_reg_strb.{reg_name} = (cpuif_addr == 32'h{get_addr_register(component_data, reg_name)});\n")
+    out.append("    typedef struct {\n")
+    section(0)
+    out.append("    } decoded_reg_strb_t;\n\n")
+
+    out.append("    decoded_reg_strb_t decoded_reg_strb;\n"
+               "    logic decoded_req;\n"
+               "    logic decoded_req_is_wr;\n")
+    out.append(f"    logic [{component.data_width}:0] decoded_wr_data;\n")
+    out.append(f"    logic [{component.data_width}:0] decoded_wr_biten;\n\n")
+
+    out.append("    always_comb begin\n")
+    section(1)
+    out.append("    end\n\n")
+
+    out.append("    assign decoded_req = intf.bus_req;\n"
+               "    assign decoded_req_is_wr = intf.bus_req_is_wr;\n"
+               "    assign decoded_wr_data = intf.bus_wr_data;\n"
+               "    assign decoded_wr_biten = intf.bus_wr_biten;\n\n")
+
+def _write_strobes(out, component, registers, reg_idx):
+    """Members of decoded_reg_strb_t."""
+    out.extend([f"        logic {reg_info.name}{_dims(reg_info)};\n" for reg_info in registers])
+
+def _write_decoders(out, component, registers, reg_idx):
+    """Address comparisons setting decoded_reg_strb."""
+    for reg_info in registers:
+        reg_name = reg_info.name
+        if reg_info.dim > 1:
+            # one comparison per element, the array is not unrolled
+            out.append(f"        for(int i=0; i<{reg_info.dim}; i++) ")
+            if component.addr_width > 0:
+                out.append(f"decoded_reg_strb.{reg_name}[i] = "
+                           f"(cpuif_addr == 32'h{reg_info.address:08X} + i*32'h{reg_info.stride:X});\n")
+            else:
+                out.append(f"decoded_reg_strb.{reg_name}[i] = 1'b1;\n")
+        elif component.addr_width > 0:
+            out.append(f"        decoded_reg_strb.{reg_name} = (cpuif_addr == 32'h{reg_info.address:08X});\n")
         else:
-            f.write(f"        decoded_reg_strb.{reg_name} = 1'b1;\n")
-    f.write("    end\n\n")
-    
-    f.write("    assign decoded_req = intf.bus_req;\n")
-    f.write("    assign decoded_req_is_wr = intf.bus_req_is_wr;\n")
-    f.write("    assign decoded_wr_data = intf.bus_wr_data;\n")
-    f.write(f"    assign decoded_wr_biten = intf.bus_wr_biten;\n\n")
-
-def _write_field_structures(f, component_data):
+            out.append(f"        decoded_reg_strb.{reg_name} = 1'b1;\n")
+
+def _value_type(field_info):
+    """SystemVerilog type of the value of a field in the structs"""
+    if field_info.enum:
+        return field_info.enum
+    return f"logic [{field_info.bit_width-1}:0]" if field_info.bit_width > 1 else "logic"
+
+def _write_field_structures(out, section):
     """write field comb and storage logic."""
-    f.write("    //--------------------------------------------------------------------------\n")
-    f.write("    // Field logic\n")
-    f.write("    //--------------------------------------------------------------------------\n")
-    
+    out.append("    //--------------------------------------------------------------------------\n"
+               "    // Field logic\n"
+               "    //--------------------------------------------------------------------------\n")
+
     # field_combo_t
-    f.write("    typedef struct {\n")
-    for reg_name, reg_info in component_data['registers'].items():
-        f.write(f"        struct {{\n")
-        for field_name, field_info in reg_info['fields'].items():
-            if field_info['access'] != 'read-only' or field_info['volatile']:
-                f.write(f"            struct {{\n")
-                if field_info['enum']:
-                    f.write(f"                {field_info['enum']} next;\n")
-                elif field_info['bit_width'] > 1:
-                    f.write(f"                logic [{field_info['bit_width']-1}:0] next;\n")
-                else:
-                    f.write(f"                logic next;\n")
-                f.write(f"                logic load_next;\n")
-                f.write(f"            }} {field_name};\n")
-        f.write(f"        }} {reg_name};\n")
-    f.write("    } field_combo_t;\n")
-    f.write("    field_combo_t field_combo;\n\n")
-    
+    out.append("    typedef struct {\n")
+    section(2)
+    out.append("    } field_combo_t;\n"
+               "    field_combo_t field_combo;\n\n")
+
     # field_storage_t
-    f.write("    typedef struct {\n")
-    for reg_name, reg_info in component_data['registers'].items():
-        f.write(f"        struct {{\n")
-        for field_name, field_info in reg_info['fields'].items():
-            if field_info['access'] != 'read-only' or field_info['volatile']:
-                f.write(f"            struct {{\n")
-                if field_info['enum']:
-                    f.write(f"                {field_info['enum']} value;\n")
-                elif field_info['bit_width'] > 1:
-                    f.write(f"                logic [{field_info['bit_width']-1}:0] value;\n")
-                else:
-                    f.write(f"                logic value;\n")
-                f.write(f"            }} {field_name};\n")
-        f.write(f"        }} {reg_name};\n")
-    f.write("    } field_storage_t;\n")
-    f.write("    field_storage_t field_storage;\n\n")
-
-def _write_single_field_logic(f, component_name, reg_name, field_info):
-    """Write logic to a single field."""
-    f.write(f"    // Field: {component_name}.{reg_name}.{field_info['field_name']}\n")
-    
-    # Combinational logic
-    bit_range = f"[{field_info['bit_width']-1}:0]" if field_info['bit_width'] > 1 and not field_info['enum'] else ""
-    bit_select = _get_bit_select(field_info)
-    
-    f.write("    always_comb begin\n")
-    if field_info['enum']:
-        f.write(f"        {field_info['enum']} next_c;\n")
+    out.append("    typedef struct {\n")
+    section(3)
+    out.append("    } field_storage_t;\n"
+               "    field_storage_t field_storage;\n\n")
+
+def _write_combo_members(out, component, registers, reg_idx):
+    """Members of field_combo_t."""
+    for reg_info in registers:
+        out.append("        struct {\n")
+        out.extend([f"            struct {{\n"
+                    f"                {_value_type(field_info)} next;\n"
+                    f"                logic load_next;\n"
+                    f"            }} {field_info.name};\n"
+                    for field_info in reg_info.fields.values() if field_info.has_storage])
+        out.append(f"        }} {reg_info.name}{_dims(reg_info)};\n")
+        out.flush()
+
+def _write_storage_members(out, component, registers, reg_idx):
+    """Members of field_storage_t."""
+    for reg_info in registers:
+        out.append("        struct {\n")
+        out.extend([f"            struct {{\n"
+                    f"                {_value_type(field_info)} value;\n"
+                    f"            }} {field_info.name};\n"
+                    for field_info in reg_info.fields.values() if field_info.has_storage])
+        out.append(f"        }} {reg_info.name}{_dims(reg_info)};\n")
+        out.flush()
+
+def _literal(text):
+    """`text` as part of a template"""
+    return text.replace('{', '{{').replace('}', '}}')
+
+@lru_cache(maxsize=4096)
+def _field_logic_template(enum, bit_width, reset_value, sw_writable, hw_input, readable):
+    """
+    Template of the logic of a field: combinational next value, storage
+    and output, as the `format` method of its text. What only depends on
+    the arguments (type of the value, write expression, reset value) is
+    part of the text; the fields left are component, reg, path
+    (`reg.field`, filled in once rather than at each use) and bits (bit
+    select).
+    """
+    if enum:
+        next_type = enum
+    elif bit_width > 1:
+        next_type = f"logic [{bit_width-1}:0]"
     else:
-        f.write(f"        logic {bit_range} next_c;\n")
-    f.write(f"        logic load_next_c;\n")
-    f.write(f"        next_c = field_storage.{reg_name}.{field_info['field_name']}.value;\n")
-    f.write(f"        load_next_c = '0;\n")
-    
-    _write_field_write_logic(f, reg_name, field_info, bit_select)
-    
-    f.write(f"        field_combo.{reg_name}.{field_info['field_name']}.next = next_c;\n")
-    f.write(f"        field_combo.{reg_name}.{field_info['field_name']}.load_next = load_next_c;\n")
-    f.write("    end\n")
-    
-    _write_field_sequential_logic(f, reg_name, field_info)
-    
-    # output Assignment
-    if field_info['access'] != 'write-only':
-        f.write(f"    assign hwif_out.{reg_name}.{field_info['field_name']}.value = field_storage.{reg_name}.{field_info['field_name']}.value;\n")
-    
-    f.write("\n")
-
-def _write_field_sequential_logic(f, reg_name, field_info):
-    """Write sequential logic to a single field."""
-    f.write("    always_ff @(posedge intf.clk or negedge intf.rst) begin\n")
-    if field_info['access'] != 'write-only':
-        f.write("        if(!intf.rst) begin\n")
-        if field_info['enum']:
-            f.write(f"            field_storage.{reg_name}.{field_info['field_name']}.value <= {field_info['enum']}'({format_reset_value(field_info['reset_value'], field_info['bit_width'])});\n")
+        next_type = "logic "
+    reset = format_reset_value(reset_value, bit_width)
+    if enum:
+        reset = f"{enum}'({reset})"
+
+    lines = ["    // Field: {component}.{path}\n",
+             "    always_comb begin\n",
+             f"        {_literal(next_type)} next_c;\n",
+             "        logic load_next_c;\n",
+             "        next_c = field_storage.{path}.value;\n",
+             "        load_next_c = '0;\n"]
+
+    # Software write
+    if sw_writable:
+        lines.append("        if(decoded_reg_strb.{reg} && decoded_req_is_wr) begin // SW write\n")
+        if enum:
+            lines.append(f"            next_c = {_literal(enum)}'(decoded_wr_data{{bits}});\n")
+        elif bit_width > 1:
+            lines.append("            next_c = (field_storage.{path}.value & ~decoded_wr_biten{bits}) "
+                         "| (decoded_wr_data{bits} & decoded_wr_biten{bits});\n")
         else:
-            f.write(f"            field_storage.{reg_name}.{field_info['field_name']}.value <= {format_reset_value(field_info['reset_value'], field_info['bit_width'])};\n")
-        f.write("        end else begin\n")
-        f.write(f"            if(field_combo.{reg_name}.{field_info['field_name']}.load_next) begin\n")
-        #f.write(f"$display(\"field_storage.{reg_name}.{field_info['field_name']}.value <= %h\",field_combo.{reg_name}.{field_info['field_name']}.next);\n")
-        f.write(f"                field_storage.{reg_name}.{field_info['field_name']}.value <= field_combo.{reg_name}.{field_info['field_name']}.next;\n")
-        f.write("            end\n")
-        f.write("        end\n")
+            lines.append("            next_c = decoded_wr_data{bits};\n")
+        lines.append("            load_next_c = '1;\n"
+                     "        end")
+    # Hardware write
+    if hw_input:
+        lines.append(" else " if sw_writable else "        ")
+        lines.append("if(hwif_in.{path}.we) begin // HW Write - we\n"
+                     "            next_c = hwif_in.{path}.next;\n"
+                     "            load_next_c = '1;\n"
+                     "        end\n")
+    elif sw_writable:
+        lines.append("\n")
+
+    lines.append("        field_combo.{path}.next = next_c;\n"
+                 "        field_combo.{path}.load_next = load_next_c;\n"
+                 "    end\n")
+
+    # Sequential logic
+    lines.append("    always_ff @(posedge intf.clk or negedge intf.rst) begin\n")
+    if readable:
+        lines.append("        if(!intf.rst) begin\n"
+                     f"            field_storage.{{path}}.value <= {_literal(reset)};\n"
+                     "        end else begin\n"
+                     "            if(field_combo.{path}.load_next) begin\n"
+                     "                field_storage.{path}.value <= field_combo.{path}.next;\n"
+                     "            end\n"
+                     "        end\n")
     else:
-        f.write(f"        if(field_combo.{reg_name}.{field_info['field_name']}.load_next) begin\n")
-        f.write(f"            field_storage.{reg_name}.{field_info['field_name']}.value <= field_combo.{reg_name}.{field_info['field_name']}.next;\n")
-        f.write("        end\n")
-    f.write("    end\n")
+        lines.append("        if(field_combo.{path}.load_next) begin\n"
+                     "            field_storage.{path}.value <= field_combo.{path}.next;\n"
+                     "        end\n")
+    lines.append("    end\n")
 
-def _write_write_response(f):
+    # output Assignment
+    if readable:
+        lines.append("    assign hwif_out.{path}.value = field_storage.{path}.value;\n")
+    lines.append("\n")
+    return "".join(lines).format
+
+def _field_logic(component_name, reg_name, field_info):
+    """Logic of a single field."""
+    template = _field_logic_template(field_info.enum, field_info.bit_width, field_info.reset_value,
+                                     field_info.sw_writable, field_info.hw_input, field_info.readable)
+    return template(component=component_name, reg=reg_name, path=f"{reg_name}.{field_info.name}",
+                    bits=field_info.bit_select)
+
+def _write_fields_logic(out, component, registers, reg_idx):
+    """Logic of each field with storage."""
+    for reg_info in registers:
+        for field_info in reg_info.fields.values():
+            if not field_info.has_storage:
+                continue
+            if reg_info.dim > 1:
+                _write_array_field_logic(out, component.name, reg_info.name, reg_info.dim, field_info)
+            else:
+                out.append(_field_logic(component.name, reg_info.name, field_info))
+        out.flush()
+
+def _write_array_field_logic(out, component_name, reg_name, dim, field_info):
+    """Write the logic of a field of a register array, once in a generate loop over its elements."""
+    body = _field_logic(component_name, f"{reg_name}[i]", field_info)
+    out.append(f"    for(genvar i=0; i<{dim}; i++) begin : g_{reg_name}_{field_info.name}\n")
+    out.extend([f"    {line}\n" for line in body.rstrip('\n').split('\n')])
+    out.append("    end\n\n")
+
+def _write_write_response(out):
     """write response logic."""
-    f.write("    //--------------------------------------------------------------------------\n")
-    f.write("    // Write response\n")
-    f.write("    //--------------------------------------------------------------------------\n")
-    f.write("    assign cpuif_wr_ack = decoded_req & decoded_req_is_wr;\n")
-    f.write("    // Writes are always granted with no error response\n")
-    f.write("    assign cpuif_wr_err = '0;\n\n")
-
-def _write_readback_logic(f, component_data):
+    out.append("    //--------------------------------------------------------------------------\n"
+               "    // Write response\n"
+               "    //--------------------------------------------------------------------------\n"
+               "    assign cpuif_wr_ack = decoded_req & decoded_req_is_wr;\n"
+               "    // Writes are always granted with no error response\n"
+               "    assign cpuif_wr_err = '0;\n\n")
+
+def _write_readback_logic(out, component, section):
     """write readback logic."""
-    f.write("    //--------------------------------------------------------------------------\n")
-    f.write("    // Readback\n")
-    f.write("    //--------------------------------------------------------------------------\n\n")
-    
-    f.write("    logic readback_err;\n")
-    f.write("    logic readback_done;\n")
-    f.write(f"    logic [{component_data['data_width']}:0] readback_data;\n\n")
-    
-    f.write(f"    // Assign readback values to a flattened array\n")
-    f.write(f"    logic [{component_data['data_width']}:0] readback_array[{component_data['num_regs']}];\n")
-    
-    _write_readback_array(f, component_data)
-    
-    f.write("\n    // Reduce the array\n")
-    f.write("    always_comb begin\n")
-    f.write(f"        automatic logic [{component_data['data_width']}:0] readback_data_var;\n")
-    f.write("        readback_done = decoded_req & ~decoded_req_is_wr;\n")
-    f.write("        readback_err = '0;\n")
-    f.write("        readback_data_var = '0;\n")
-    f.write(f"        for(int i=0; i<{component_data['num_regs']}; i++) readback_data_var |= readback_array[i];\n")
-    f.write("        readback_data = readback_data_var;\n")
-    f.write("    end\n\n")
-    
-    f.write("    assign cpuif_rd_ack = readback_done;\n")
-    f.write("    assign cpuif_rd_data = readback_data;\n")
-    f.write("    assign cpuif_rd_err = readback_err;\n\n")
-
-def _write_field_write_logic(f, reg_name, field_info, bit_select):
-    """Implements the write logic for a field."""
-    # Software write
-    if field_info['access'] in ['read-write', 'write-only']:
-        f.write(f"        if(decoded_reg_strb.{reg_name} && decoded_req_is_wr) begin // SW write\n")
-        if field_info['enum']:
-            f.write(f"            next_c = {field_info['enum']}'(decoded_wr_data{bit_select});\n")
-        elif field_info['bit_width'] > 1:
-            f.write(f"            next_c = (field_storage.{reg_name}.{field_info['field_name']}.value & ~decoded_wr_biten{bit_select}) | (decoded_wr_data{bit_select} & decoded_wr_biten{bit_select});\n")
+    out.append("    //--------------------------------------------------------------------------\n"
+               "    // Readback\n"
+               "    //--------------------------------------------------------------------------\n\n")
+
+    out.append("    logic readback_err;\n"
+               "    logic readback_done;\n")
+    out.append(f"    logic [{component.data_width}:0] readback_data;\n\n")
+
+    out.append("    // Assign readback values to a flattened array\n")
+    out.append(f"    logic [{component.data_width}:0] readback_array[{component.num_regs}];\n")
+
+    section(5)
+
+    out.append("\n    // Reduce the array\n"
+               "    always_comb begin\n")
+    out.append(f"        automatic logic [{component.data_width}:0] readback_data_var;\n")
+    out.append("        readback_done = decoded_req & ~decoded_req_is_wr;\n"
+               "        readback_err = '0;\n"
+               "        readback_data_var = '0;\n")
+    out.append(f"        for(int i=0; i<{component.num_regs}; i++) readback_data_var |= readback_array[i];\n")
+    out.append("        readback_data = readback_data_var;\n"
+               "    end\n\n")
+
+    out.append("    assign cpuif_rd_ack = readback_done;\n"
+               "    assign cpuif_rd_data = readback_data;\n"
+               "    assign cpuif_rd_err = readback_err;\n\n")
+
+def _write_readback_array(out, component, registers, reg_idx):
+    """Implements assignments of readback array, from entry `reg_idx` on."""
+    # a register array takes one entry per element, assigned in a generate loop
+    for reg_info in registers:
+        reg_name = reg_info.name
+        if reg_info.dim > 1:
+            out.append(f"    for(genvar i=0; i<{reg_info.dim}; i++) begin : g_{reg_name}_readback\n")
+            _write_readback_entries(out, f"{reg_idx}+i", f"{reg_name}[i]", reg_info, "        ")
+            out.append("    end\n")
         else:
-            f.write(f"            next_c = decoded_wr_data{bit_select};\n")
-        f.write(f"            load_next_c = '1;\n")
-        f.write("        end")
-    
-    # Hardware write
-    if needs_hw_input(field_info):
-        if field_info['access'] in ['read-write', 'write-only']:
-            f.write(" else ")
-        else:
-            f.write("        ")
-        f.write(f"if(hwif_in.{reg_name}.{field_info['field_name']}.we) begin // HW Write - we\n")
-        f.write(f"            next_c = hwif_in.{reg_name}.{field_info['field_name']}.next;\n")
-        f.write(f"            load_next_c = '1;\n")
-        f.write("        end\n")
-    elif field_info['access'] in ['read-write', 'write-only']:
-        f.write("\n")
-
-def _write_readback_array(f, component_data):
-    """Implements assignments of readback array."""
-    reg_idx = 0
-    for reg_name, reg_info in component_data['registers'].items():
-        f.write(f"    assign readback_array[{reg_idx}] = '0;\n")
-        
-        for field_name, field_info in reg_info['fields'].items():
-            if field_info['access'] != 'write-only':
-                bit_select = _get_bit_select(field_info)
-                
-                if needs_hw_input(field_info) and field_info['access'] == 'read-only':
-                    f.write(f"    assign readback_array[{reg_idx}]{bit_select} = (decoded_reg_strb.{reg_name} && !decoded_req_is_wr) ? hwif_in.{reg_name}.{field_name}.next : '0;\n")
-                else:
-                    f.write(f"    assign readback_array[{reg_idx}]{bit_select} = (decoded_reg_strb.{reg_name} && !decoded_req_is_wr) ? field_storage.{reg_name}.{field_name}.value : '0;\n")
-        
-        reg_idx += 1
+            _write_readback_entries(out, reg_idx, reg_name, reg_info, "    ")
+        reg_idx += reg_info.dim
+        out.flush()
+
+def _write_readback_entries(out, reg_idx, reg_name, reg_info, indent):
+    """Assignments of the readback array entry of a register."""
+    out.append(f"{indent}assign readback_array[{reg_idx}] = '0;\n")
+    out.extend([f"{indent}assign readback_array[{reg_idx}]{field_info.bit_select} = "
+                f"(decoded_reg_strb.{reg_name} && !decoded_req_is_wr) ? "
+                + (f"hwif_in.{reg_name}.{field_info.name}.next : '0;\n"
+                   if field_info.hw_input and field_info.access == 'read-only' else
+                   f"field_storage.{reg_name}.{field_info.name}.value : '0;\n")
+                for field_info in reg_info.readable_fields])
 
 def format_reset_value(reset_value, bit_width):
     """Formats the reset value with the correct width"""
@@ -430,125 +643,119 @@ def format_reset_value(reset_value, bit_width):
         return f"{bit_width}'d{reset_value[2:]}"
     return f"{bit_width}'h0"
 
-def _get_bit_select(field_info):
-    """Returns the appropriate bit selection string."""
-    if field_info['bit_width'] > 1:
-        return f"[{field_info['bit_offset']+field_info['bit_width']-1}:{field_info['bit_offset']}]"
-    else:
-        return f"[{field_info['bit_offset']}]"
-    
-def _setup_package_output_file(ipxact_data, output_dir):
+def _setup_package_output_file(component, output_dir):
     """Configures the package output file."""
     output_path = get_absolute_path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
-    return output_path / f"{ipxact_data['name']}_pkg.sv"
-
-
-def _extract_package_data(ipxact_data):
-    """Extracts data required to generate the package."""
-    component_name = ipxact_data['name']
-    registers = ipxact_data['registers']
-    enums = ipxact_data.get('enums', {})
-    
-    # Identifies registers with HW input fields
-    hw_input_regs = [
-        reg_name for reg_name, reg_info in registers.items()
-        if any(needs_hw_input(f_info) for f_info in reg_info['fields'].values())
-    ]
-    
-    return {
-        'name': component_name,
-        'registers': registers,
-        'enums': enums,
-        'hw_input_regs': hw_input_regs
-    }
-
-
-def _write_package_header(f, component_data):
+    return output_path / f"{component.name}_pkg.sv"
+
+
+def _write_package_header(out, component):
     """Writes the package header."""
-    f.write(f"// Package {component_data['name']}_pkg - Automatically generated in {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-    f.write("// Typedef structures for CSR interface\n\n")
-    f.write(f"package {component_data['name']}_pkg;\n\n")
+    out.append(f"// Package {component.name}_pkg - Automatically generated\n")
+    out.append("// Typedef structures for CSR interface\n\n")
+    out.append(f"package {component.name}_pkg;\n\n")
+
+def enum_item_name(name):
+    """SystemVerilog name of an enum item."""
+    return name.replace('\\', '').replace(' ', '_')
 
-def _write_single_enum(f, enum_name, enum_values):
+def _write_single_enum(out, enum_name, enum_values):
     """Writes a single enum definition."""
     enum_size = max(len(bin(len(enum_values))) - 3, 1)
-    f.write(f"    typedef enum logic [{enum_size}:0] {{\n")
-    
+    out.append(f"    typedef enum logic [{enum_size}:0] {{\n")
+
     items = list(enum_values.items())
     last_value, _ = items[-1]
-    
+
     for value, name in items:
-        clean_name = name.replace('\\', '').replace(' ', '_')
+        clean_name = enum_item_name(name)
         separator = ",\n" if value != last_value else "\n"
-        f.write(f"        {clean_name} = {value}{separator}")
-    
-    f.write(f"    }} {enum_name};\n\n")
+        out.append(f"        {clean_name} = {value}{separator}")
 
-def _write_input_structures(f, component_data):
+    out.append(f"    }} {enum_name};\n\n")
+
+def _write_input_structures(out, component, section):
     """Writes input structures (hardware -> register)."""
-    f.write("    // Input structures (Hardware -> Register)\n")
+    out.append("    // Input structures (Hardware -> Register)\n")
     # Structs for individual fields that require HW input
-    for reg_name, reg_info in component_data['registers'].items():
-        for field_name, field_info in reg_info['fields'].items():
-            if needs_hw_input(field_info):
-                f.write(f"    typedef struct {{\n")
-                
-                if field_info['enum']:
-                    f.write(f"        {field_info['enum']} next;\n")
-                elif field_info['bit_width'] > 1:
-                    f.write(f"        logic [{field_info['bit_width']-1}:0] next;\n")
-                else:
-                    f.write(f"        logic next;\n")
-                    
-                f.write(f"        logic we;\n")
-                f.write(f"    }} {component_data['name']}__{reg_name}__{field_name}__in_t;\n\n")
-    
+    section(0)
     # Structs for register with HW input
-    for reg_name, reg_info in component_data['registers'].items():
-        hw_input_fields = [f for f, info in reg_info['fields'].items() if needs_hw_input(info)]
-        if hw_input_fields:
-            f.write(f"    typedef struct {{\n")
-            for field_name in hw_input_fields:
-                f.write(f"        {component_data['name']}__{reg_name}__{field_name}__in_t {field_name};\n")
-            f.write(f"    }} {component_data['name']}__{reg_name}__in_t;\n\n")
-    
+    section(1)
+
     # Struct main input
-    hw_input_regs = [r for r, info in component_data['registers'].items() 
-                    if any(needs_hw_input(f_info) for f_info in info['fields'].values())]
-    if hw_input_regs:
-        f.write(f"    typedef struct {{\n")
-        for reg_name in hw_input_regs:
-            f.write(f"        {component_data['name']}__{reg_name}__in_t {reg_name};\n")
-        f.write(f"    }} {component_data['name']}__in_t;\n\n")
-
-def _write_output_structures(f, component_data):
+    if component.hw_input_regs:
+        out.append("    typedef struct {\n")
+        section(2)
+        out.append(f"    }} {component.name}__in_t;\n\n")
+
+def _write_output_structures(out, component, section):
     """Writes output structures (hardware -> register)."""
-    f.write("    // Output structures (Register -> Hardware)\n")
+    out.append("    // Output structures (Register -> Hardware)\n")
     # Structs for individual fields output
-    for reg_name, reg_info in component_data['registers'].items():
-        for field_name, field_info in reg_info['fields'].items():
-            if field_info['access'] != 'write-only':
-                f.write(f"    typedef struct {{\n")
-                if field_info['enum']:
-                    f.write(f"        {field_info['enum']} value;\n")
-                elif field_info['bit_width'] > 1:
-                    f.write(f"        logic [{field_info['bit_width']-1}:0] value;\n")
-                else:
-                    f.write(f"        logic value;\n")
-                f.write(f"    }} {component_data['name']}__{reg_name}__{field_name}__out_t;\n\n")
-    
+    section(3)
     # Structs for registers
-    for reg_name, reg_info in component_data['registers'].items():
-        output_fields = [f for f, info in reg_info['fields'].items() if info['access'] != 'write-only']
-        if output_fields:
-            f.write(f"    typedef struct {{\n")
-            for field_name in output_fields:
-                f.write(f"        {component_data['name']}__{reg_name}__{field_name}__out_t {field_name};\n")
-            f.write(f"    }} {component_data['name']}__{reg_name}__out_t;\n\n")
-    
+    section(4)
+
     # Struct for main output
-    f.write(f"    typedef struct {{\n")
-    for reg_name in component_data['registers'].keys():
-        f.write(f"        {component_data['name']}__{reg_name}__out_t {reg_name};\n")
-    f.write(f"    }} {component_data['name']}__out_t;\n\n")
\ No newline at end of file
+    out.append("    typedef struct {\n")
+    section(5)
+    out.append(f"    }} {component.name}__out_t;\n\n")
+
+def _write_field_in_structs(out, component, registers):
+    """Input struct of each field with a hardware input."""
+    for reg_info in registers:
+        out.extend([f"    typedef struct {{\n"
+                    f"        {_value_type(field_info)} next;\n"
+                    f"        logic we;\n"
+                    f"    }} {component.name}__{reg_info.name}__{field_info.name}__in_t;\n\n"
+                    for field_info in reg_info.hw_input_fields])
+        out.flush()
+
+def _write_register_in_structs(out, component, registers):
+    """Input struct of each register with a hardware input."""
+    for reg_info in registers:
+        if reg_info.hw_input_fields:
+            out.append("    typedef struct {\n")
+            for field_info in reg_info.hw_input_fields:
+                out.append(f"        {component.name}__{reg_info.name}__{field_info.name}__in_t {field_info.name};\n")
+            out.append(f"    }} {component.name}__{reg_info.name}__in_t;\n\n")
+            out.flush()
+
+def _write_in_members(out, component, registers):
+    """Members of the main input struct."""
+    out.extend([f"        {component.name}__{reg_info.name}__in_t {reg_info.name}{_dims(reg_info)};\n"
+                for reg_info in registers if reg_info.hw_input_fields])
+
+def _write_field_out_structs(out, component, registers):
+    """Output struct of each readable field."""
+    for reg_info in registers:
+        out.extend([f"    typedef struct {{\n"
+                    f"        {_value_type(field_info)} value;\n"
+                    f"    }} {component.name}__{reg_info.name}__{field_info.name}__out_t;\n\n"
+                    for field_info in reg_info.readable_fields])
+        out.flush()
+
+def _write_register_out_structs(out, component, registers):
+    """Output struct of each register with readable fields."""
+    for reg_info in registers:
+        if reg_info.readable_fields:
+            out.append("    typedef struct {\n")
+            for field_info in reg_info.readable_fields:
+                out.append(f"        {component.name}__{reg_info.name}__{field_info.name}__out_t {field_info.name};\n")
+            out.append(f"    }} {component.name}__{reg_info.name}__out_t;\n\n")
+            out.flush()
+
+def _write_out_members(out, component, registers):
+    """Members of the main output struct."""
+    out.extend([f"        {component.name}__{reg_info.name}__out_t {reg_info.name}{_dims(reg_info)};\n"
+                for reg_info in registers])
+
+# Sections written once per register, in the order write_module and
+# write_package take them; a module section is called with (out,
+# component, registers, reg_idx), a package one with (out, component,
+# registers)
+MODULE_SECTIONS = (_write_strobes, _write_decoders, _write_combo_members, _write_storage_members,
+                   _write_fields_logic, _write_readback_array)
+PACKAGE_SECTIONS = (_write_field_in_structs, _write_register_in_structs, _write_in_members,
+                    _write_field_out_structs, _write_register_out_structs, _write_out_members)
@@ -1,6 +1,8 @@
 import xml.etree.ElementTree as ET
 import re
 
+from tools.register_model import Field, Register, enum_type
+
 class IPXACT2022Generator:
     def __init__(self) -> None:
         self.namespaces = {
@@ -161,13 +163,17 @@ class IPXACT2022Generator:
                                 reg_name: str, 
                                 reg_offset: str, 
                                 fields_data: list, 
-                                bus_size = "32"
+                                bus_size = "32",
+                                dim: int = 1,
+                                stride: int | None = None
     ) -> ET.Element:
         """
         Create a register element with its fields
 
         This builds an <ipxact:register> element populated with:
         - <ipxact:name>: The register name.
+        - <ipxact:array>: For a register array, its <ipxact:dim> and
+          <ipxact:stride> (bytes); the array stays a single element.
         - <ipxact:addressOffset>: The register offset within the block.
         - <ipxact:size>: The register size (bus width).
 
@@ -180,6 +186,8 @@ class IPXACT2022Generator:
             fields_data: List of field metadata dictionaries. Each dict must
                 contain at least a `"bits"` entry (bit range string).
             bus_size: Register size in bits (usually matches bus width, e.g. "32").
+            dim: Number of elements of a register array, 1 for a register.
+            stride: Bytes between two elements, the register size if None.
 
         Returns:
             ET.Element: The constructed <ipxact:register> XML element.
@@ -189,6 +197,11 @@ class IPXACT2022Generator:
         name = ET.SubElement(register, 'ipxact:name')
         name.text = reg_name
         
+        if dim > 1:
+            array = ET.SubElement(register, 'ipxact:array')
+            ET.SubElement(array, 'ipxact:dim').text = str(dim)
+            ET.SubElement(array, 'ipxact:stride').text = str(stride if stride is not None else int(bus_size) // 8)
+        
         address_offset = ET.SubElement(register, 'ipxact:addressOffset')
         address_offset.text = reg_offset
         
@@ -290,6 +303,85 @@ class IPXACT2022Generator:
         
         return field
     
+    def create_field_model(self,
+                           field_data: dict[str, any],
+                           reg_name: str,
+                           enum_cache: dict,
+                           enum_definitions: dict) -> Field | None:
+        """
+        Create the model of a field, as `parse_field_ipxact` reads back the
+        element built by `create_field_element` from the same data.
+
+        Args:
+            field_data: dict with the keys of `create_field_element`.
+            reg_name: Name of the register, used to name a new enum type.
+            enum_cache: Signature of enum values -> type name.
+            enum_definitions: Type name -> enum values, filled with new types.
+
+        Returns:
+            Field or None: None if the field has no name.
+
+        Raises:
+            ValueError: If the field has no bit range.
+        """
+        field_name = field_data.get('field', '').strip()
+        if not field_name:
+            return None
+
+        msb, lsb = self.parse_bit_range(field_data.get('bits', ''))
+        if msb is None or lsb is None:
+            raise ValueError(f"Field '{field_name}' of register '{reg_name}' has no bit range")
+
+        enum_values = {}
+        for enum_data in self.parse_enum_values(field_data.get('enum_values', '')):
+            enum_values[enum_data['value']] = enum_data['name']
+
+        reset_value = self.parse_reset_value(field_data.get('reset', '0'))
+        if reset_value != 0:
+            reset = f"0x{reset_value:X}"
+        elif enum_values:
+            # without <ipxact:resets>, the reader takes the first <ipxact:value> of the field
+            reset = next(iter(enum_values))
+        else:
+            reset = "'h0"
+
+        return Field(
+            field_name,
+            min(msb, lsb),
+            abs(msb - lsb) + 1,
+            self.parse_access_policy(field_data.get('access_policy', 'RW')),
+            field_data.get('volatile', 'false').lower() in ['true', '1', 'yes'],
+            reset,
+            field_data.get('description', '').strip(),
+            enum_type(enum_values, reg_name, field_name, enum_cache, enum_definitions) if enum_values else None
+        )
+
+    def create_register_model(self,
+                              reg_name: str,
+                              reg_offset: str,
+                              fields: dict[str, Field],
+                              base_address: str,
+                              bus_size = "32",
+                              dim: int = 1,
+                              stride: int | None = None) -> Register:
+        """
+        Create the model of a register, as `parse_register_ipxact` reads
+        back the element built by `create_register_element`.
+
+        Args:
+            reg_name: Name of the register.
+            reg_offset: Address offset as a string.
+            fields: Field models by name, from `create_field_model`.
+            base_address: Base address of the address block.
+            bus_size: Register size in bits.
+            dim: Number of elements of a register array, 1 for a register.
+            stride: Bytes between two elements, the register size if None.
+
+        Returns:
+            Register: The register model.
+        """
+        return Register(reg_name, reg_offset, int(bus_size), base_address, fields, dim, stride)
+
     def create_address_block(self, 
                              csv_name:      str, 
                              registers:     list[ET.Element], 
@@ -320,7 +412,11 @@ class IPXACT2022Generator:
             offset_str = reg.find('ipxact:addressOffset').text
             offset = int(offset_str, 0)
             size = int(reg.find('ipxact:size').text)
-            max_offset = max(max_offset, offset + (size // 8))
+            span = size // 8
+            array = reg.find('ipxact:array')
+            if array is not None:
+                span += (int(array.find('ipxact:dim').text) - 1) * int(array.find('ipxact:stride').text)
+            max_offset = max(max_offset, offset + span)
         
         range_elem = ET.SubElement(address_block, 'ipxact:range')
         range_elem.text = f"0x{max_offset:X}"
@@ -0,0 +1,142 @@
+import os
+from contextlib import contextmanager
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from xml.dom import minidom
+
+# Streaming writer of the IP-XACT files.
+#
+# The files used to be written by serializing the whole component with
+# ET.tostring, parsing the string back with minidom, pretty printing it with
+# toprettyxml and dropping the blank lines. IpxactWriter writes the same
+# bytes without any of these copies of the document: elements are written
+# as they come, one address block at a time, the way toprettyxml writes
+# them after such a round trip.
+
+# minidom escapes '"' in text nodes up to Python 3.12 only
+_QUOTE_IN_TEXT = '&quot;' in minidom.parseString('<a>"</a>').toprettyxml()
+
+
+def _escape_attrib(value: str) -> str:
+    if '&' in value:
+        value = value.replace('&', '&amp;')
+    if '<' in value:
+        value = value.replace('<', '&lt;')
+    if '"' in value:
+        value = value.replace('"', '&quot;')
+    if '>' in value:
+        value = value.replace('>', '&gt;')
+    return value
+
+
+def _escape_text(text: str) -> str:
+    if '\r' in text:
+        # line ends as the XML parser normalizes them
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if _QUOTE_IN_TEXT and '"' in text:
+        text = text.replace('"', '&quot;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    return text
+
+
+class IpxactWriter:
+    """
+    Indenting XML writer producing the output of toprettyxml(indent="  ")
+    with the blank lines removed, for ElementTree elements written whole
+    (`element`) or opened and closed around their children (`start`/`end`).
+
+    Example:
+        writer = IpxactWriter(f)
+        writer.start(root)
+        for block in blocks:
+            writer.element(block)
+        writer.end(root)
+    """
+
+    def __init__(self, f, indent: str = "  ") -> None:
+        self._f = f
+        self._indent = indent
+        self._depth = 0
+        self._ragged = False  # some text may leave blank lines
+        self._f.write('<?xml version="1.0" ?>')
+
+    def _open_tag(self, elem: ET.Element, indent: str) -> str:
+        if not elem.attrib:
+            return f"{indent}<{elem.tag}"
+        # the parser reports the namespace declarations before the other attributes
+        items = sorted(elem.attrib.items(), key=lambda item: not (item[0] == 'xmlns' or item[0].startswith('xmlns:')))
+        attrs = "".join(f' {name}="{_escape_attrib(value)}"' for name, value in items)
+        return f"{indent}<{elem.tag}{attrs}"
+
+    def start(self, elem: ET.Element) -> None:
+        """Write the start tag of `elem`, its children are written next"""
+        self._f.write(f"\n{self._open_tag(elem, self._indent * self._depth)}>")
+        self._depth += 1
+
+    def end(self, elem: ET.Element) -> None:
+        """Write the end tag of an element opened with `start`"""
+        self._depth -= 1
+        self._f.write(f"\n{self._indent * self._depth}</{elem.tag}>")
+
+    def element(self, elem: ET.Element) -> None:
+        """Write `elem` and everything below it"""
+        lines = []
+        self._ragged = False
+        self._lines(elem, self._indent * self._depth, lines)
+        text = "\n".join(lines)
+        if self._ragged:
+            text = "\n".join(line for line in text.split('\n') if line.strip())
+        self._f.write("\n" + text)
+
+    def _lines(self, elem: ET.Element, indent: str, lines: list) -> None:
+        text = elem.text
+        if not len(elem):
+            if text:
+                if '\n' in text or '\r' in text:
+                    self._ragged = True
+                lines.append(f"{self._open_tag(elem, indent)}>{_escape_text(text)}</{elem.tag}>")
+            else:
+                lines.append(f"{self._open_tag(elem, indent)}/>")
+            return
+
+        lines.append(f"{self._open_tag(elem, indent)}>")
+        inner = indent + self._indent
+        # text around child elements gets lines of its own, blank if it is only whitespace
+        if text:
+            self._ragged = True
+            lines.append(inner + _escape_text(text))
+        for child in elem:
+            self._lines(child, inner, lines)
+            if child.tail:
+                self._ragged = True
+                lines.append(inner + _escape_text(child.tail))
+        lines.append(f"{indent}</{elem.tag}>")
+
+
+@contextmanager
+def atomic_output(output_file: str | Path):
+    """
+    Open a temporary file next to `output_file` for writing; it is renamed
+    to `output_file` when the block succeeds and removed when it fails, so
+    readers never see a partial file.
+    """
+    output_file = Path(output_file)
+    tmp = output_file.with_name(f".{output_file.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            yield f
+        os.replace(tmp, output_file)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def write_element(root: ET.Element, output_file: str | Path) -> Path:
+    """Write an element tree as an IP-XACT file, see IpxactWriter"""
+    with atomic_output(output_file) as f:
+        IpxactWriter(f).element(root)
+    return Path(output_file)
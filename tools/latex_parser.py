@@ -1,6 +1,465 @@
+import os
 import re
+import mmap
+import hashlib
+import time
+from dataclasses import dataclass
+from pathlib import Path
 
-def extract_table_with_label(latex_content: str, target_label: str) -> str | None:
+# Upper bound, in seconds, for indexing a single LaTeX document.
+DEFAULT_INDEX_TIME_LIMIT = 10.0
+
+_TABLE_ENVS = {'table', 'table*'}
+# Number of mandatory arguments that precede the tabular body
+# (the column spec is always the last one).
+_TABULAR_ENVS = {'tabular': 1, 'tabular*': 2, 'tabularx': 2}
+
+_INDEX_TOKEN_RE = re.compile(
+    r'%[^\n]*'
+    r'|\\(?:(?P<env>begin|end)\s*\{(?P<name>[^{}]*)\}'
+    r'|label\s*\{(?P<label>[^{}]*)\}'
+    r'|caption(?![a-zA-Z]))'
+)
+_BRACE_RE = re.compile(r'\\.|[{}]', re.DOTALL)
+_SPACE_RE = re.compile(r'\s*')
+
+# Byte-level patterns, run straight over the memory-mapped files
+_INCLUDE_RE = re.compile(rb'\\(?:input|include)\s*\{([^}]+)\}')
+_COMMENT_RE = re.compile(rb'(?<!\\)%')
+
+# Row boundaries and comments of a tabular body
+_ROW_END_RE = re.compile(r'\\\\\*?(?:[ \t]*\[[^\]\n]*\])?')
+_LATEX_COMMENT_RE = re.compile(r'(?<!\\)%[^\n]*')
+# Edges of the address map hierarchy
+_REF_RE = re.compile(r'\\ref\s*\{([^{}]*)\}')
+
+# Cell tokenizer: one alternative per token kind, dispatched on `lastgroup`.
+# Rules, simple `\multirow`/`\multicolumn` prefixes and formatting commands
+# with a plain argument are matched whole; anything else (nested braces,
+# unusual spacing) falls back to the generic command/brace tokens.
+_FORMAT_COMMANDS = {
+    'textbf', 'textit', 'textsl', 'textsc', 'texttt', 'textrm', 'textsf',
+    'textup', 'textmd', 'emph', 'underline', 'mbox', 'text',
+}
+# `\multirow[vpos]{rows}[struts]{width}[vmove]`, before its text argument;
+# the width may also be a bare `*` or `=`
+_MULTIROW_PREFIX = (r'\\multirow\s*(?:\[[^\]]*\]\s*)?\{(?P<rows>[^{}]*)\}\s*(?:\[[^\]]*\]\s*)?'
+                    r'(?:\{[^{}]*\}|[*=])\s*(?:\[[^\]]*\]\s*)?')
+_CELL_TOKEN_RE = re.compile(
+    r'(?P<text>[^\\{}&%]+)'
+    r'|(?P<cell>&)'
+    r'|(?P<row>\\\\\*?(?:\s*\[[^\]]*\])?)'
+    r'|(?P<rule>\\(?:hline|toprule|midrule|bottomrule)(?![a-zA-Z])|\\cline\{[^{}]*\})'
+    r'|\\(?:' + '|'.join(sorted(_FORMAT_COMMANDS)) + r')\{(?P<plain>[^\\{}&%]*)\}(?P<formatted>)'
+    r'|' + _MULTIROW_PREFIX + r'(?P<multirow>)'
+    r'|\\multicolumn\{(?P<cols>[^{}]*)\}\{[^{}]*\}(?P<multicolumn>)'
+    r'|\\(?P<name>[a-zA-Z]+)\*?(?P<command>)'
+    r'|\\(?P<char>.)(?P<escape>)'
+    r'|(?P<open>\{)|(?P<close>\})',
+    re.DOTALL
+)
+# A cell made of optional rules and at most one simple wrapper around plain
+# text, by far the most common shape; it needs no state machine
+_SIMPLE_CELL_RE = re.compile(
+    r'(?:\s+|\\(?:hline|toprule|midrule|bottomrule)(?![a-zA-Z])|\\cline\{[^{}]*\})*'
+    r'(?:(?:' + _MULTIROW_PREFIX + r'|\\multicolumn\{[^{}]*\}\{[^{}]*\}'
+    r'|\\(?:' + '|'.join(sorted(_FORMAT_COMMANDS)) + r'))'
+    r'\{(?P<wrapped>[^\\{}]*)\}|(?P<plain>[^\\{}]*))\s*'
+)
+# Row count of a `\multirow` whose arguments did not fit the patterns above
+_MULTIROW_ARG_RE = re.compile(r'\s*(?:\[[^\]]*\]\s*)?\{\s*([+-]?\d+)\s*\}')
+_DROP, _KEEP = False, True
+_DROP_ALL = (_DROP,)  # unknown command: drop every argument that follows it
+_UNWRAP = (_KEEP,)
+_COMMAND_ARGS = {
+    'multirow': (_DROP, _DROP, _KEEP),
+    'multicolumn': (_DROP, _DROP, _KEEP),
+    'cline': (_DROP,),
+    'fontsize': (_DROP, _DROP),
+    'ref': (_KEEP,),  # the label itself is what the REF column of a map holds
+}
+# `\_` becomes a space, the CSV reader relies on names like "Access Policy"
+_ESCAPES = {'_': ' ', '&': '&', '%': '%', '#': '#', '$': '$', '{': '{', '}': '}',
+            ' ': ' ', '\n': ' '}
+
+@dataclass(frozen=True)
+class TableEntry:
+    """Location and metadata of a labelled table inside a LaTeX document."""
+    label: str
+    body_start: int
+    body_end: int
+    caption: str
+    column_spec: str
+    table_start: int
+    table_end: int
+    line: int
+
+    @property
+    def span(self) -> tuple[int, int]:
+        """(start, end) offsets of the tabular body."""
+        return self.body_start, self.body_end
+
+class LatexTableIndex:
+    """
+    Index of every labelled table in a LaTeX document.
+
+    The document is tokenized once by `build_table_index`; afterwards every
+    lookup is a dictionary access plus a slice of the original content.
+    """
+
+    def __init__(self, latex_content: str, entries: dict[str, TableEntry]) -> None:
+        self.content = latex_content
+        self.entries = entries
+
+    def __contains__(self, label: str) -> bool:
+        return label in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def labels(self) -> list[str]:
+        """Labels in document order."""
+        return list(self.entries)
+
+    def get(self, label: str) -> TableEntry | None:
+        return self.entries.get(label)
+
+    def body(self, label: str) -> str | None:
+        """Inner content of the tabular environment of `label`, or None."""
+        entry = self.entries.get(label)
+        if entry is None:
+            return None
+        return self.content[entry.body_start:entry.body_end]
+
+def _match_group(text: str, pos: int) -> tuple[int, int] | None:
+    """
+    Match a balanced `{...}` group starting at `pos` (leading whitespace allowed).
+
+    Returns:
+        (content_start, content_end) of the group, or None if there is no
+        group at `pos` or it is never closed.
+    """
+    pos = _SPACE_RE.match(text, pos).end()
+    if pos >= len(text) or text[pos] != '{':
+        return None
+
+    depth = 0
+    for m in _BRACE_RE.finditer(text, pos):
+        token = m.group()
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+            if depth == 0:
+                return pos + 1, m.start()
+    return None
+
+def _skip_optional(text: str, pos: int) -> int:
+    """Skip an optional `[...]` argument starting at `pos`."""
+    start = _SPACE_RE.match(text, pos).end()
+    if start < len(text) and text[start] == '[':
+        end = text.find(']', start)
+        if end != -1:
+            return end + 1
+    return pos
+
+class _TableScope:
+    __slots__ = ('start', 'line', 'labels', 'caption', 'tabulars')
+
+    def __init__(self, start: int, line: int) -> None:
+        self.start = start
+        self.line = line
+        self.labels = []    # (label, position)
+        self.caption = ''
+        self.tabulars = []  # (begin position, column spec, body start, body end)
+
+def build_table_index(latex_content: str,
+                      time_limit: float | None = DEFAULT_INDEX_TIME_LIMIT) -> LatexTableIndex:
+    """
+    Tokenize a LaTeX document once and index all labelled tables.
+
+    Each `\\label` found inside a `table` environment is mapped to the
+    tabular that follows it in the same environment (or the last one before
+    it, for tables whose label is placed under the tabular). The scan is
+    linear in the size of the document and never backtracks.
+
+    Args:
+        latex_content (str): Full LaTeX document content as a string.
+        time_limit (float | None): Maximum time in seconds spent indexing
+                                   the document, None disables the bound.
+
+    Returns:
+        LatexTableIndex: Index of label -> TableEntry.
+
+    Raises:
+        TimeoutError: If indexing takes longer than `time_limit`.
+    """
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+
+    entries = {}
+    scopes = []        # open table environments
+    open_tabulars = [] # (begin position, column spec, body start)
+    pos = 0
+    line, line_pos = 1, 0
+
+    while True:
+        if deadline is not None and time.perf_counter() > deadline:
+            raise TimeoutError(
+                f"Indexing LaTeX tables exceeded {time_limit}s (stopped at offset {pos})"
+            )
+
+        m = _INDEX_TOKEN_RE.search(latex_content, pos)
+        if m is None:
+            break
+        pos = m.end()
+
+        if m.group().startswith('%'):
+            if m.start() and latex_content[m.start() - 1] == '\\':
+                pos = m.start() + 1  # escaped \%, not a comment
+            continue
+
+        env = m.group('env')
+        if env is not None:
+            name = m.group('name').strip()
+            if name in _TABLE_ENVS:
+                if env == 'begin':
+                    line += latex_content.count('\n', line_pos, m.start())
+                    line_pos = m.start()
+                    scopes.append(_TableScope(m.start(), line))
+                elif scopes:
+                    _close_scope(scopes.pop(), pos, entries)
+            elif name in _TABULAR_ENVS:
+                if env == 'begin':
+                    body_start = _skip_optional(latex_content, pos)
+                    spec = ''
+                    for _ in range(_TABULAR_ENVS[name]):
+                        group = _match_group(latex_content, body_start)
+                        if group is None:
+                            break
+                        spec = latex_content[group[0]:group[1]]
+                        body_start = group[1] + 1
+                    open_tabulars.append((m.start(), spec, body_start))
+                    pos = body_start
+                elif open_tabulars:
+                    begin, spec, body_start = open_tabulars.pop()
+                    if scopes:
+                        scopes[-1].tabulars.append((begin, spec, body_start, m.start()))
+            continue
+
+        label = m.group('label')
+        if label is not None:
+            if scopes:
+                scopes[-1].labels.append((label.strip(), m.start()))
+            continue
+
+        if scopes:  # \caption token
+            arg_pos = _skip_optional(latex_content, pos)
+            group = _match_group(latex_content, arg_pos)
+            if group is not None:
+                if not scopes[-1].caption:
+                    scopes[-1].caption = ' '.join(latex_content[group[0]:group[1]].split())
+                pos = group[1] + 1
+
+    return LatexTableIndex(latex_content, entries)
+
+def _close_scope(scope: _TableScope, table_end: int, entries: dict[str, TableEntry]) -> None:
+    """Turn the labels of a closed table environment into index entries."""
+    if not scope.tabulars:
+        return
+
+    for label, label_pos in scope.labels:
+        if label in entries:
+            continue  # first definition wins, as LaTeX itself would warn
+
+        tabular = next((t for t in scope.tabulars if t[0] > label_pos), scope.tabulars[-1])
+        _, spec, body_start, body_end = tabular
+        entries[label] = TableEntry(
+            label=label,
+            body_start=body_start,
+            body_end=body_end,
+            caption=scope.caption,
+            column_spec=spec,
+            table_start=scope.start,
+            table_end=table_end,
+            line=scope.line,
+        )
+
+class _LatexSource:
+    """A single .tex file of a spec, memory-mapped and tokenized on demand."""
+    __slots__ = ('path', 'data', 'includes', 'index', '_mmap')
+
+    def __init__(self, path: Path | None, data) -> None:
+        self.path = path
+        self.data = data
+        self.includes = None  # resolved \input/\include targets, on demand
+        self.index = None     # LatexTableIndex, on demand
+        self._mmap = None
+
+    @classmethod
+    def open(cls, path: Path) -> '_LatexSource':
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return cls(path, b'')
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        source = cls(path, data)
+        source._mmap = data
+        return source
+
+    def contains_label(self, label: str) -> bool:
+        return self.data.find(b'\\label{' + label.encode('utf-8') + b'}') != -1
+
+    def get_index(self) -> LatexTableIndex:
+        if self.index is None:
+            self.index = build_table_index(str(memoryview(self.data), 'utf-8'))
+        return self.index
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self.data = b''
+
+class LatexSpec:
+    """
+    A LaTeX spec made of a root document and the files it pulls in with
+    `\\input`/`\\include`.
+
+    Files are memory-mapped and only searched with a byte scan for the label
+    being looked up; a file is decoded and tokenized the first time a
+    requested table is found in it. Includes are followed recursively, in
+    document order, as the search reaches each file.
+    """
+
+    def __init__(self, root_path: str | Path | None = None) -> None:
+        self._root = Path(root_path).resolve() if root_path is not None else None
+        self._sources = {}   # path -> _LatexSource, opened on first visit
+        self._label_source = {}
+        if self._root is not None and not self._root.is_file():
+            raise FileNotFoundError(f"LaTeX file not found: {self._root}")
+
+    @classmethod
+    def from_string(cls, latex_content: str) -> 'LatexSpec':
+        """Wrap an in-memory document. `\\input` is not followed for it."""
+        spec = cls()
+        source = _LatexSource(None, b'')
+        source.includes = []
+        source.index = build_table_index(latex_content)
+        spec._sources[None] = source
+        return spec
+
+    def __enter__(self) -> 'LatexSpec':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for source in self._sources.values():
+            source.close()
+
+    def _open(self, path: Path | None) -> _LatexSource:
+        source = self._sources.get(path)
+        if source is None:
+            if not path.is_file():
+                raise FileNotFoundError(f"LaTeX file not found: {path}")
+            source = self._sources[path] = _LatexSource.open(path)
+        return source
+
+    def _resolve_includes(self, source: _LatexSource) -> list[Path]:
+        """
+        Targets of the `\\input`/`\\include` commands of `source`. As in
+        LaTeX, paths are relative to the directory of the root document.
+        """
+        if source.includes is None:
+            includes = []
+            data = source.data
+            for m in _INCLUDE_RE.finditer(data):
+                line_start = data.rfind(b'\n', 0, m.start()) + 1
+                if _COMMENT_RE.search(data[line_start:m.start()]):
+                    continue
+                target = self._root.parent / m.group(1).decode('utf-8').strip()
+                if not target.suffix:
+                    target = target.with_suffix('.tex')
+                includes.append(target.resolve())
+            source.includes = includes
+        return source.includes
+
+    def _iter_sources(self):
+        """Yield the sources in document order, opening included files lazily."""
+        stack = [self._root]
+        seen = set()
+        while stack:
+            path = stack.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            source = self._open(path)
+            yield source
+            stack.extend(reversed(self._resolve_includes(source)))
+
+    def files(self) -> list[Path]:
+        """All files of the spec (forces the include graph to be resolved)."""
+        return [source.path for source in self._iter_sources() if source.path is not None]
+
+    def content_hash(self) -> str:
+        """SHA-256 over the content of every file of the spec, in document order."""
+        digest = hashlib.sha256()
+        for source in self._iter_sources():
+            data = source.data if source.path is not None else source.index.content.encode('utf-8')
+            digest.update(b'%d\0' % len(data))
+            digest.update(data)
+        return digest.hexdigest()
+
+    def tokenized_files(self) -> list[Path]:
+        """Files that had to be tokenized so far."""
+        return [s.path for s in self._sources.values() if s.index is not None and s.path is not None]
+
+    def _find_source(self, label: str) -> _LatexSource | None:
+        if label in self._label_source:
+            return self._label_source[label]
+
+        found = None
+        for source in self._iter_sources():
+            if source.index is not None:
+                if label in source.index:
+                    found = source
+                    break
+            elif source.contains_label(label):
+                if label in source.get_index():
+                    found = source
+                    break
+
+        if found is None:
+            # Unusual spellings such as `\label {x}` escape the byte scan
+            for source in self._iter_sources():
+                if label in source.get_index():
+                    found = source
+                    break
+
+        self._label_source[label] = found
+        return found
+
+    def entry(self, label: str) -> tuple[Path | None, TableEntry] | None:
+        """File and index entry of the table labelled `label`, or None."""
+        source = self._find_source(label)
+        if source is None:
+            return None
+        return source.path, source.index.get(label)
+
+    def table(self, label: str) -> str:
+        """
+        Inner tabular content of the table labelled `label`.
+
+        Raises:
+            ValueError: If no file of the spec defines the label.
+        """
+        source = self._find_source(label)
+        if source is None:
+            raise ValueError(f"Tabela com label '{label}' não encontrada no LaTeX.")
+        return source.index.body(label)
+
+def extract_table_with_label(latex_content: str, target_label: str,
+                             index: LatexTableIndex | None = None) -> str | None:
     """
     Extract the content of a LaTeX table by its label.
 
@@ -8,25 +467,20 @@ def extract_table_with_label(latex_content: str, target_label: str) -> str | Non
         latex_content (str): Full LaTeX document content as a string.
         target_label  (str): The label identifier of the target table 
                             (e.g., 'tab:results').
+        index (LatexTableIndex | None): Index previously built for
+                            `latex_content`. Callers looking up several
+                            labels should build it once and pass it here.
 
     Returns:
         str | None: The inner tabular environment of the matched table as a string, 
                     or None if no table with the given label is found.
     """    
-    
-    pattern = (
-        r'\\begin{table}.*?'          
-        r'\\label{' + re.escape(target_label) + r'}.*?'  
-        r'\\begin{tabular}\{[^}]*\}' 
-        r'(.*?)'                     
-        r'\\end{tabular}.*?'         
-        r'\\end{table}'              
-    )
+    if index is None:
+        index = build_table_index(latex_content)
 
-    match = re.search(pattern, latex_content, re.DOTALL)
-
-    if match:
-        return match.group(1)
+    body = index.body(target_label)
+    if body is not None:
+        return body
 
     raise ValueError(f"Tabela com label '{target_label}' não encontrada no LaTeX.")
 
@@ -34,66 +488,358 @@ def extract_references_from_table(table_content: str) -> list[str]:
     """
     Extract reference identifiers from LaTeX table content.
 
+    Only `\\ref{...}` commands count as references; commented-out ones are
+    ignored.
+
     Args:
         table_content (str): The LaTeX content of a table (typically the tabular body).
 
     Returns:
-        list[str]: A de-duplicated list of references found within the table. 
+        list[str]: A de-duplicated list of references found within the table,
+                   in the order they first appear. 
     """
     
-    references = []
-    
-    ref_matches = re.findall(r'\\ref{([^}]+)}', table_content)
-    references.extend(ref_matches)
-    
-    text_refs = re.findall(r'tabela[_\s]*([A-Za-z0-9_-]+)', table_content, re.IGNORECASE)
-    references.extend([f"table:{ref}" for ref in text_refs])
-    
-    other_refs = re.findall(r'table[_\s]*([A-Za-z0-9_-]+)', table_content, re.IGNORECASE)
-    references.extend([f"table:{ref}" for ref in other_refs])
-    
-    return list(set(references))
+    if '%' in table_content:
+        table_content = _LATEX_COMMENT_RE.sub('', table_content)
+    return list(dict.fromkeys(m.strip() for m in _REF_RE.findall(table_content)))
+
+def _row_span(rows: str) -> int:
+    """Row count of a `\\multirow`, 1 when it cannot be read."""
+    try:
+        return int(rows)
+    except ValueError:
+        return 1
+
+def _tokenize_cells(text: str, spans: list | None = None) -> list[str]:
+    """
+    Run the token state machine over a row (or a single cell) of a tabular.
+
+    Args:
+        text (str): The LaTeX of the row or cell.
+        spans (list | None): If given, a `(cell index, rows)` pair is appended
+                             for every `\\multirow` found.
 
-def clean_table_content(table_content : str) -> list[str]:
+    Returns:
+        list[str]: The cleaned cells of `text`, whitespace-normalized.
     """
-    Clean and normalize LaTeX table content into a CSV row format.
+    cells = []      # finished cells
+    parts = []      # text of the current cell
+    groups = []     # (keep, pending) saved when a brace group opens
+    keep = True     # False inside arguments that are dropped
+    pending = ()    # argument modes still expected by the last command
+
+    for m in _CELL_TOKEN_RE.finditer(text):
+        kind = m.lastgroup
+
+        if kind == 'text':
+            # known commands may have blanks before their arguments
+            if pending is _DROP_ALL or not m.group().isspace():
+                pending = ()
+            if keep:
+                parts.append(m.group())
+        elif kind == 'cell':
+            pending = ()
+            if keep:
+                cells.append(' '.join(''.join(parts).split()))
+                parts = []
+        elif kind == 'formatted':
+            pending = ()
+            if keep:
+                parts.append(m.group('plain'))
+        elif kind == 'rule':
+            pending = ()
+        elif kind == 'multirow':
+            pending = _UNWRAP
+            if spans is not None and keep:
+                spans.append((len(cells), _row_span(m.group('rows'))))
+        elif kind == 'multicolumn':
+            pending = _UNWRAP
+        elif kind == 'command':
+            name = m.group('name')
+            pending = _UNWRAP if name in _FORMAT_COMMANDS else _COMMAND_ARGS.get(name, _DROP_ALL)
+            if name == 'multirow' and spans is not None and keep:
+                arg = _MULTIROW_ARG_RE.match(text, m.end())
+                if arg is not None:
+                    spans.append((len(cells), _row_span(arg.group(1))))
+        elif kind == 'open':
+            if pending:
+                groups.append((keep, pending if pending is _DROP_ALL else pending[1:]))
+                keep = keep and pending[0]
+                pending = ()
+            else:
+                groups.append((keep, ()))
+        elif kind == 'close':
+            if groups:
+                keep, pending = groups.pop()
+        elif kind == 'row':
+            # only reached for a `\\` inside a group, rows are split beforehand
+            pending = ()
+            if keep:
+                parts.append(' ')
+        elif kind == 'escape':
+            pending = ()
+            if keep:
+                parts.append(_ESCAPES.get(m.group('char'), ''))
+
+    cells.append(' '.join(''.join(parts).split()))
+    return cells
+
+def _split_cells(row: str, spans: list) -> list[str]:
+    """
+    Split a row on `&`, tokenizing only the cells that hold LaTeX markup.
+    A `(cell index, rows)` pair is appended to `spans` for each `\\multirow`.
+    """
+    if '\\' not in row and '{' not in row and '}' not in row:
+        return [' '.join(cell.split()) for cell in row.split('&')]
+
+    if '\\&' in row or '\\{' in row or '\\}' in row:
+        return _tokenize_cells(row, spans)
+
+    cells = row.split('&')
+    for i, cell in enumerate(cells):
+        if '\\' in cell or '{' in cell or '}' in cell:
+            m = _SIMPLE_CELL_RE.fullmatch(cell)
+            if m is not None:
+                text = m.group('wrapped')
+                cells[i] = ' '.join((m.group('plain') if text is None else text).split())
+                if m.group('rows') is not None:
+                    spans.append((i, _row_span(m.group('rows'))))
+            elif cell.count('{') != cell.count('}'):
+                # `&` inside a group: let the state machine see the whole row
+                del spans[:]
+                return _tokenize_cells(row, spans)
+            else:
+                cell_spans = []
+                cells[i] = _tokenize_cells(cell, cell_spans)[0]
+                spans.extend((i, rows) for _, rows in cell_spans)
+        else:
+            cells[i] = ' '.join(cell.split())
+    return cells
+
+def iter_table_rows(table_content: str, multirow_columns=None):
+    """
+    Tokenize LaTeX tabular content and lazily yield its cleaned rows.
+
+    Rows are located with one precompiled pattern; cells without markup are
+    only whitespace-normalized, the others go through a token state machine
+    that drops rule commands (`\\hline`, `\\cline{..}`, ...), unwraps
+    formatting commands (`\\textbf{\\texttt{..}}`, ...) at any nesting depth,
+    keeps only the content of `\\multirow`/`\\multicolumn` and removes any
+    other command together with its arguments. Every character is visited
+    a bounded number of times, so the cost is linear in the table size.
+    Comments are skipped.
+
+    The value of a `\\multirow{N}` cell is carried into the same column of
+    the next N-1 rows, which LaTeX leaves blank; other blank cells stay
+    empty. Only positive row counts are carried.
 
     Args:
         table_content (str): Raw LaTeX tabular environment content.
+        multirow_columns (Iterable[int] | None): Indexes of the columns whose
+                             `\\multirow` cells are carried down, None for all.
+
+    Yields:
+        list[str]: The cells of each non-empty row, whitespace-normalized.
+    """
+    if '%' in table_content:
+        table_content = _LATEX_COMMENT_RE.sub('', table_content)
+    if multirow_columns is not None:
+        multirow_columns = frozenset(multirow_columns)
+
+    carried = {}  # column -> [value, rows still covered]
+    carry = None  # row text left open by a `\\` inside a brace group
+    pos = 0
+    ends = _ROW_END_RE.finditer(table_content)
+    while pos is not None:
+        m = next(ends, None)
+        if m is None:
+            row, pos = table_content[pos:], None
+        else:
+            row, pos = table_content[pos:m.start()], m.end()
+
+        if carry is not None:
+            row = carry + ' ' + row
+            carry = None
+        if pos is not None and row.count('{') > row.count('}'):
+            carry = row
+            continue
+
+        spans = []
+        cells = _split_cells(row, spans)
+        if pos is None and not any(cells):
+            break  # text after the last `\\` is not a row of its own
+
+        if carried:
+            for col, state in list(carried.items()):
+                if col >= len(cells):
+                    cells.extend([''] * (col + 1 - len(cells)))
+                if not cells[col]:
+                    cells[col] = state[0]
+                state[1] -= 1
+                if not state[1]:
+                    del carried[col]
+
+        for col, rows in spans:
+            if rows > 1 and (multirow_columns is None or col in multirow_columns):
+                carried[col] = [cells[col], rows - 1]
+
+        if any(cells):
+            yield cells
+
+@dataclass(frozen=True)
+class AddressMapNode:
+    """
+    An entry of the address map hierarchy.
+
+    Map tables (the system map, subsystem maps) have children; the leaves
+    reference the register table of an IP. `base_address` is absolute: the
+    offsets of every enclosing map are already added to it.
+    """
+    name: str
+    label: str | None
+    base_address: int
+    description: str = ''
+    path: tuple[str, ...] = ()
+    children: tuple['AddressMapNode', ...] = ()
+    is_map: bool = False
+
+    def leaves(self):
+        """Yield the register table entries below this node, in document order."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.is_map:
+                stack.extend(reversed(node.children))
+            elif node.label is not None:
+                yield node
+
+def parse_address(text: str) -> int:
+    """
+    Parse an address cell such as `0x4000_0000`, `0x4000 0000` or `'h1000`.
+
+    Raises:
+        ValueError: If the cell is not a number.
+    """
+    value = re.sub(r'[\s_]', '', text)
+    if value.lower().startswith("'h"):
+        return int(value[2:], 16)
+    return int(value, 0)
+
+def _map_columns(header: list[str]) -> tuple[int, int, int | None] | None:
+    """(address, ref, description) columns of a map table header, None for other tables."""
+    address = ref = description = None
+    for i, cell in enumerate(header):
+        name = cell.strip().lower()
+        if name in ('ref', 'reference') and ref is None:
+            ref = i
+        elif ('address' in name or name == 'offset') and address is None:
+            address = i
+        elif name == 'description' and description is None:
+            description = i
+    if address is None or ref is None:
+        return None
+    return address, ref, description
+
+def _parse_map_table(label: str, table_content: str) -> list[tuple] | None:
+    """
+    Rows of a map table as (name, description, offset, ref label), or None
+    if `table_content` is not a map (it has no address and REF columns).
+    A row only references a table through a `\\ref{...}` in its REF cell.
+    """
+    rows = iter_table_rows(table_content)
+    header = next(rows, None)
+    columns = _map_columns(header) if header else None
+    if columns is None:
+        return None
+
+    address_col, ref_col, description_col = columns
+    references = set(extract_references_from_table(table_content))
+    entries = []
+    for cells in rows:
+        cells.extend([''] * (len(header) - len(cells)))
+        name = cells[0]
+        ref = cells[ref_col] if cells[ref_col] in references else None
+        if not name and ref is None:
+            continue
+        try:
+            offset = parse_address(cells[address_col]) if cells[address_col] else 0
+        except ValueError:
+            raise ValueError(f"Invalid address '{cells[address_col]}' for '{name}' "
+                             f"in table '{label}'") from None
+        description = cells[description_col] if description_col is not None else ''
+        entries.append((name, description, offset, ref))
+    return entries
+
+def walk_address_map(get_table, root_label: str, base_address: int = 0) -> AddressMapNode:
+    """
+    Walk the `\\ref` graph of the address map starting at `root_label`.
+
+    A referenced table whose header has an address and a REF column is a
+    map (e.g. a subsystem) and is walked in turn, with its offsets added to
+    the base address of the row that referenced it; any other table is a
+    register table and ends the walk. Each label is fetched and parsed once,
+    however many rows reference it, so a shared subsystem or IP appears
+    once per instance in the hierarchy without being extracted again.
+
+    Args:
+        get_table (Callable[[str], str]): Returns the tabular content of a
+                             label, e.g. `LatexSpec.table`.
+        root_label (str): Label of the top level map table.
+        base_address (int): Absolute address of the root map.
 
     Returns:
-        list[str]: A list of cleaned table rows as strings, ready for CSV export.
-                   Each string corresponds to a single row (split on '\\\\').
+        AddressMapNode: The root of the hierarchy.
+
+    Raises:
+        ValueError: If a table is missing, the root is not a map table or
+                    the references form a cycle.
     """
-    table_content = table_content.strip()
-    
-    # Remove LaTeX macros
-    table_content = re.sub(r'\\(?:hline|toprule|midrule|bottomrule|cline\{[^}]*\})', '', table_content)
-    
-    # Handle multirow and multicolumn commands
-    table_content = re.sub(r'\\multirow\{[^}]*\}\{[^}]*\}\{([^}]*)\}', r'\1', table_content)
-    table_content = re.sub(r'\\multicolumn\{[^}]*\}\{[^}]*\}\{([^}]*)\}', r'\1', table_content)
-    table_content = re.sub(r'\\(?:textbf|textit|emph)\{([^}]*)\}', r'\1', table_content)
-    table_content = re.sub(r'\\fontsize\{[^}]*\}\{[^}]*\}\\selectfont', '', table_content)
-    
-    # Split into rows by \\
-    rows = re.split(r'\\\\', table_content)
+    maps = {}    # label -> parsed map rows, None for register tables
+    active = []  # labels on the path being walked
+
+    def visit(label):
+        if label in maps:
+            return
+        if label in active:
+            cycle = ' -> '.join(active[active.index(label):] + [label])
+            raise ValueError(f"Cyclic table references: {cycle}")
+        active.append(label)
+        rows = _parse_map_table(label, get_table(label))
+        for row in rows or ():
+            if row[3] is not None:
+                visit(row[3])
+        active.pop()
+        maps[label] = rows
+
+    visit(root_label)
+    if maps[root_label] is None:
+        raise ValueError(f"Table '{root_label}' is not an address map (no address and REF columns).")
+
+    def build(name, label, base, description, path):
+        rows = maps[label] if label is not None else None
+        children = tuple(
+            build(child, ref, base + offset, text, path + (child,))
+            for child, text, offset, ref in rows or ()
+        )
+        return AddressMapNode(name, label, base, description, path, children, rows is not None)
 
-    return rows
+    return build(root_label, root_label, base_address, '', ())
 
-def get_main_table_label(latex_content: str, main_table_label: str) -> str:
+def get_main_table_label(latex_content: str, main_table_label: str,
+                         index: LatexTableIndex | None = None) -> str:
     """
     Extract the label of the main table from LaTeX content.
 
     Args:
         latex_content (str): Full LaTeX document content as a string.
         main_table_label (str): The label identifier of the main table to extract.
+        index (LatexTableIndex | None): Optional prebuilt index of `latex_content`.
 
     Returns:
         str: The label of the main table, or an empty string if not found.
     """
     
-    main_table_content = extract_table_with_label(latex_content, main_table_label)
+    main_table_content = extract_table_with_label(latex_content, main_table_label, index)
     
     if not main_table_content:
         print(f"Error: Could not find table with label '{main_table_label}'")
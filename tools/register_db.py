@@ -0,0 +1,347 @@
+import os
+import re
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+
+from tools.register_model import AddressBlock, Component, Field, Register
+
+# Bump when the schema changes, databases of an older version are rejected
+SCHEMA_VERSION = 3
+
+_SCHEMA = """
+CREATE TABLE component (
+    id          INTEGER PRIMARY KEY,
+    name        TEXT NOT NULL,
+    addr_width  INTEGER NOT NULL
+);
+CREATE TABLE block (
+    id            INTEGER PRIMARY KEY,
+    component_id  INTEGER NOT NULL REFERENCES component(id),
+    name          TEXT NOT NULL,
+    base_address  TEXT NOT NULL,
+    range         INTEGER NOT NULL
+);
+CREATE TABLE register (
+    id        INTEGER PRIMARY KEY,
+    block_id  INTEGER NOT NULL REFERENCES block(id),
+    name      TEXT NOT NULL,
+    path      TEXT NOT NULL,
+    offset    TEXT NOT NULL,
+    size      INTEGER NOT NULL,
+    address   INTEGER NOT NULL,
+    dim       INTEGER NOT NULL,
+    stride    INTEGER NOT NULL
+);
+CREATE TABLE field (
+    id           INTEGER PRIMARY KEY,
+    register_id  INTEGER NOT NULL REFERENCES register(id),
+    name         TEXT NOT NULL,
+    path         TEXT NOT NULL,
+    bit_offset   INTEGER NOT NULL,
+    bit_width    INTEGER NOT NULL,
+    access       TEXT NOT NULL,
+    volatile     INTEGER NOT NULL,
+    reset_value  TEXT NOT NULL,
+    description  TEXT NOT NULL,
+    enum         TEXT
+);
+CREATE TABLE enum (
+    component_id  INTEGER NOT NULL REFERENCES component(id),
+    name          TEXT NOT NULL,
+    position      INTEGER NOT NULL,
+    value         TEXT NOT NULL,
+    item          TEXT NOT NULL
+);
+"""
+
+# Created after the bulk insert, building them once is faster than updating them per row
+_INDEXES = """
+CREATE INDEX register_address ON register(address);
+CREATE INDEX register_path ON register(path);
+CREATE INDEX register_block ON register(block_id);
+CREATE INDEX field_path ON field(path);
+CREATE INDEX field_access ON field(access);
+CREATE INDEX field_register ON field(register_id);
+"""
+
+_FIELD_QUERY = """
+SELECT f.path, r.path, r.address, f.bit_offset, f.bit_width, f.access, f.volatile,
+       f.reset_value, f.description, f.enum
+FROM field f JOIN register r ON r.id = f.register_id
+"""
+
+# _FIELD_QUERY with the array dimension and stride of the register first
+_ELEMENT_FIELD_QUERY = """
+SELECT r.dim, r.stride, f.path, r.path, r.address, f.bit_offset, f.bit_width, f.access, f.volatile,
+       f.reset_value, f.description, f.enum
+FROM field f JOIN register r ON r.id = f.register_id
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class FieldInfo:
+    """
+    A field as returned by RegisterDB queries.
+
+    Attributes:
+        path: Hierarchical name, `block.register.field`.
+        register: Hierarchical name of the register, `block.register`.
+        address: Absolute address of the register.
+        bit_offset: LSB of the field in the register.
+        bit_width: Width in bits.
+        access: IP-XACT access type.
+        volatile: The field is also written by hardware.
+        reset_value: Reset value as written in the IP-XACT.
+        description: Field description.
+        enum: Name of the enum type of the field, if any.
+    """
+    path: str
+    register: str
+    address: int
+    bit_offset: int
+    bit_width: int
+    access: str
+    volatile: bool
+    reset_value: str
+    description: str
+    enum: str | None
+
+    @property
+    def msb(self) -> int:
+        return self.bit_offset + self.bit_width - 1
+
+    def __str__(self) -> str:
+        bits = f"[{self.msb}:{self.bit_offset}]" if self.bit_width > 1 else f"[{self.bit_offset}]"
+        return f"0x{self.address:08X}{bits} {self.path} ({self.access})"
+
+
+def _field_info(row) -> FieldInfo:
+    return FieldInfo(row[0], row[1], row[2], row[3], row[4], row[5], bool(row[6]), row[7], row[8], row[9])
+
+
+def export_component(component: Component, db_file: str | Path) -> Path:
+    """
+    Write the register model of a component to a new SQLite database.
+
+    The database is written next to `db_file` and renamed over it once
+    complete, so readers never see a partial file.
+
+    Args:
+        component: Component to export.
+        db_file: Path of the database, replaced if it exists.
+
+    Returns:
+        Path: `db_file`.
+    """
+    db_file = Path(db_file)
+    db_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = db_file.with_name(f".{db_file.name}.{os.getpid()}.tmp")
+    if tmp.exists():
+        tmp.unlink()
+
+    conn = sqlite3.connect(tmp)
+    try:
+        # nothing to recover on a crash, the file is discarded
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.executescript(_SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        component_id = conn.execute("INSERT INTO component (name, addr_width) VALUES (?, ?)",
+                                    (component.name, component.addr_width)).lastrowid
+        conn.executemany("INSERT INTO enum VALUES (?, ?, ?, ?, ?)",
+                         ((component_id, name, position, value, item)
+                          for name, values in component.enums.items()
+                          for position, (value, item) in enumerate(values.items())))
+
+        register_id = 0
+        for block in component.blocks:
+            block_id = conn.execute("INSERT INTO block (component_id, name, base_address, range) "
+                                    "VALUES (?, ?, ?, ?)",
+                                    (component_id, block.name, block.base_address, block.range)).lastrowid
+            register_rows = []
+            field_rows = []
+            for reg in block.registers:
+                register_id += 1
+                reg_path = f"{block.name}.{reg.name}"
+                register_rows.append((register_id, block_id, reg.name, reg_path,
+                                      reg.offset, reg.size, reg.address, reg.dim, reg.stride))
+                field_rows.extend((register_id, f.name, f"{reg_path}.{f.name}", f.bit_offset, f.bit_width,
+                                   f.access, f.volatile, f.reset_value, f.description, f.enum)
+                                  for f in reg.fields.values())
+            conn.executemany("INSERT INTO register VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", register_rows)
+            conn.executemany("INSERT INTO field (register_id, name, path, bit_offset, bit_width, access, "
+                             "volatile, reset_value, description, enum) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                             field_rows)
+
+        conn.executescript(_INDEXES)
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp, db_file)
+    return db_file
+
+
+def import_component(db_file: str | Path) -> Component:
+    """
+    Read back the register model written by `export_component`.
+
+    Args:
+        db_file: Path of the database.
+
+    Returns:
+        Component: The component of the database.
+    """
+    with RegisterDB(db_file) as db:
+        return db.component()
+
+
+class RegisterDB:
+    """
+    Read-only queries over a database written by `export_component`.
+
+    Lookups by address and by name use the indexes of the database and
+    do not load the rest of the map.
+    """
+
+    def __init__(self, db_file: str | Path) -> None:
+        db_file = Path(db_file)
+        if not db_file.is_file():
+            raise FileNotFoundError(f"Register database not found: {db_file}")
+        self.conn = sqlite3.connect(f"{db_file.resolve().as_uri()}?mode=ro", uri=True)
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self.conn.close()
+            raise ValueError(f"Register database {db_file} has schema version {version}, "
+                             f"expected {SCHEMA_VERSION}")
+        # registers are looked up in the window [address - max bytes + 1, address],
+        # the bytes of an array going from its first element to the end of its last one
+        self._max_bytes = max(1, self.conn.execute(
+            "SELECT MAX((dim - 1) * stride + size / 8) FROM register").fetchone()[0] or 1)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "RegisterDB":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def fields_at(self, address: int, msb: int | None = None, lsb: int | None = None) -> list[FieldInfo]:
+        """
+        Fields of the registers covering byte `address`; in a register
+        array, the fields of the element at that address, named
+        `block.register[i].field`.
+
+        Args:
+            address: Byte address.
+            msb: With `lsb`, only the fields overlapping bits [msb:lsb] of
+                 that byte address; alone, a single bit.
+            lsb: See `msb`.
+
+        Returns:
+            list[FieldInfo]: Matching fields in address and bit order.
+        """
+        rows = self.conn.execute(
+            _ELEMENT_FIELD_QUERY + "WHERE r.address BETWEEN ? AND ? AND (? - r.address) % r.stride < r.size / 8 "
+            "AND r.address + (r.dim - 1) * r.stride + r.size / 8 > ? "
+            "ORDER BY r.address, r.id, f.bit_offset",
+            (address - self._max_bytes + 1, address, address, address)).fetchall()
+        fields = []
+        for dim, stride, *row in rows:
+            if dim > 1:
+                # the element of the array at `address`
+                i = (address - row[2]) // stride
+                reg_path = f"{row[1]}[{i}]"
+                row[0] = reg_path + row[0][len(row[1]):]
+                row[1] = reg_path
+                row[2] += i * stride
+            fields.append(_field_info(row))
+        if msb is None:
+            return fields
+        if lsb is None:
+            lsb = msb
+        lsb, msb = min(lsb, msb), max(lsb, msb)
+        # bits of the request counted from the base of each register
+        return [f for f in fields
+                if f.bit_offset <= (address - f.address) * 8 + msb
+                and f.msb >= (address - f.address) * 8 + lsb]
+
+    def field(self, path: str) -> FieldInfo | None:
+        """Field of hierarchical name `block.register.field`, None if there is none"""
+        row = self.conn.execute(_FIELD_QUERY + "WHERE f.path = ?", (path,)).fetchone()
+        return _field_info(row) if row else None
+
+    def find(self, pattern: str) -> list[FieldInfo]:
+        """
+        Fields whose hierarchical name matches a glob pattern
+        (`uart.*`, `*.ctrl.en?`); case-sensitive like the names.
+        """
+        return [_field_info(row) for row in self.conn.execute(
+            _FIELD_QUERY + "WHERE f.path GLOB ? ORDER BY r.address, r.id, f.bit_offset", (pattern,))]
+
+    def fields_by_access(self, access: str) -> list[FieldInfo]:
+        """Fields of an IP-XACT access type ('read-only', 'write-only', ...)"""
+        return [_field_info(row) for row in self.conn.execute(
+            _FIELD_QUERY + "WHERE f.access = ? ORDER BY r.address, r.id, f.bit_offset", (access,))]
+
+    def registers(self, pattern: str = "*") -> list[tuple[str, int, int]]:
+        """(hierarchical name, address, size) of the registers matching a glob pattern, arrays by their first element"""
+        return self.conn.execute("SELECT path, address, size FROM register WHERE path GLOB ? "
+                                 "ORDER BY address, id", (pattern,)).fetchall()
+
+    def component(self) -> Component:
+        """The whole register model, as it was exported"""
+        name, addr_width = self.conn.execute("SELECT name, addr_width FROM component").fetchone()
+
+        enums = {}
+        for enum_name, value, item in self.conn.execute(
+                "SELECT name, value, item FROM enum ORDER BY rowid"):
+            enums.setdefault(enum_name, {})[value] = item
+
+        fields = {}
+        for row in self.conn.execute(
+                "SELECT register_id, name, bit_offset, bit_width, access, volatile, reset_value, "
+                "description, enum FROM field ORDER BY id"):
+            fields.setdefault(row[0], {})[row[1]] = Field(row[1], row[2], row[3], row[4], bool(row[5]),
+                                                         row[6], row[7], row[8])
+
+        registers = {}
+        for register_id, block_id, reg_name, offset, size, dim, stride in self.conn.execute(
+                "SELECT id, block_id, name, offset, size, dim, stride FROM register ORDER BY id"):
+            registers.setdefault(block_id, []).append((register_id, reg_name, offset, size, dim, stride))
+
+        blocks = []
+        for block_id, block_name, base_address, block_range in self.conn.execute(
+                "SELECT id, name, base_address, range FROM block ORDER BY id"):
+            blocks.append(AddressBlock(block_name, base_address, [
+                Register(reg_name, offset, size, base_address, fields.get(register_id, {}), dim, stride)
+                for register_id, reg_name, offset, size, dim, stride in registers.get(block_id, [])], block_range))
+
+        return Component(name, blocks, enums, addr_width)
+
+
+_LOCATION_RE = re.compile(r'^\s*(0x[0-9a-f_]+|\d+)\s*(?:\[\s*(\d+)\s*(?::\s*(\d+)\s*)?\])?\s*$', re.IGNORECASE)
+
+
+def parse_location(text: str) -> tuple[int, int | None, int | None]:
+    """
+    Parse an address with an optional bit range: `0x4000_1008[7:4]`,
+    `0x40001008[3]`, `1024`.
+
+    Returns:
+        tuple: (address, msb, lsb), msb and lsb None without a bit range.
+
+    Raises:
+        ValueError: If `text` is not an address.
+    """
+    m = _LOCATION_RE.match(text)
+    if not m:
+        raise ValueError(f"Invalid address '{text}', expected e.g. 0x4000_1008[7:4]")
+    msb = int(m.group(2)) if m.group(2) is not None else None
+    lsb = int(m.group(3)) if m.group(3) is not None else msb
+    return int(m.group(1).replace('_', ''), 0), msb, lsb
@@ -0,0 +1,226 @@
+import sys
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+# Register model shared by the IP-XACT reader/builder and the RTL emitters.
+# Everything the emitters ask about a field or a register more than once
+# (hardware input, storage, readback, bit select, absolute address) is
+# computed once when the object is created. Strings repeated across many
+# fields (access, reset value, bit select) are interned so that a map with
+# hundreds of thousands of fields holds one copy of each. A register
+# array is one Register with a dimension and a stride; its elements are
+# only created by the consumers that need them one at a time.
+
+@dataclass(slots=True)
+class Field:
+    """
+    A field of a register, as read from `<ipxact:field>`.
+
+    Attributes:
+        name: Field name.
+        bit_offset: LSB of the field in the register.
+        bit_width: Width in bits.
+        access: IP-XACT access type ('read-write', 'read-only', ...).
+        volatile: The field is also written by hardware.
+        reset_value: Reset value as written in the IP-XACT ("0x1F", "'h0").
+        description: Field description.
+        enum: Name of the SystemVerilog enum type of the field, if any.
+        mask: Bits of the field in the register.
+        hw_input: The field has a hardware input (`hwif_in`).
+        has_storage: The field has a flip-flop (not a plain read-only field).
+        readable: The field is read back and drives `hwif_out`.
+        sw_writable: The field is written by software.
+        bit_select: `[msb:lsb]` or `[bit]` of the field in the register.
+    """
+    name: str
+    bit_offset: int
+    bit_width: int
+    access: str = 'read-write'
+    volatile: bool = False
+    reset_value: str = "'h0"
+    description: str = ""
+    enum: str | None = None
+    mask: int = field(init=False)
+    hw_input: bool = field(init=False)
+    has_storage: bool = field(init=False)
+    readable: bool = field(init=False)
+    sw_writable: bool = field(init=False)
+    bit_select: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.access = sys.intern(self.access)
+        self.reset_value = sys.intern(self.reset_value)
+        self.mask = ((1 << self.bit_width) - 1) << self.bit_offset
+        self.hw_input = (self.volatile or
+                         self.access == 'read-only' or
+                         'master mode will be cleared' in self.description.lower())
+        self.has_storage = self.access != 'read-only' or self.volatile
+        self.readable = self.access != 'write-only'
+        self.sw_writable = self.access in ('read-write', 'write-only')
+        if self.bit_width > 1:
+            self.bit_select = sys.intern(f"[{self.bit_offset + self.bit_width - 1}:{self.bit_offset}]")
+        else:
+            self.bit_select = sys.intern(f"[{self.bit_offset}]")
+
+    def __reduce__(self):
+        """Pickle the constructor arguments only, the derived attributes are recomputed"""
+        return (Field, (self.name, self.bit_offset, self.bit_width, self.access, self.volatile,
+                        self.reset_value, self.description, self.enum))
+
+
+@dataclass(slots=True)
+class Register:
+    """
+    A register of an address block, or an array of `dim` identical
+    registers `stride` bytes apart (`<ipxact:array>`).
+
+    Attributes:
+        name: Register name.
+        offset: Address offset as written in the IP-XACT, of the first
+            element of an array.
+        size: Size in bits.
+        base_address: Base address of the address block, hex string.
+        fields: Fields by name.
+        dim: Number of elements, 1 for a plain register.
+        stride: Bytes between two elements, the register size by default.
+        abs_offset: `offset` as an integer.
+        index: Word index of the register in its block.
+        address: Absolute address, base address + offset.
+        hw_input_fields: Fields with a hardware input.
+        readable_fields: Fields read back by software.
+        span: Bytes from the first element to the end of the last one.
+    """
+    name: str
+    offset: str
+    size: int
+    base_address: str
+    fields: dict[str, Field]
+    dim: int = 1
+    stride: int | None = None
+    abs_offset: int = field(init=False)
+    index: int = field(init=False)
+    address: int = field(init=False)
+    hw_input_fields: tuple[Field, ...] = field(init=False)
+    readable_fields: tuple[Field, ...] = field(init=False)
+    span: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        if self.stride is None:
+            self.stride = self.size // 8
+        self.span = (self.dim - 1) * self.stride + self.size // 8
+        self.abs_offset = int(self.offset, 0)
+        self.index = self.abs_offset // (self.size // 8)  # word alignment (bytes)
+        self.address = int(self.base_address, 16) + int(self.offset, 16)
+        self.hw_input_fields = tuple(f for f in self.fields.values() if f.hw_input)
+        self.readable_fields = tuple(f for f in self.fields.values() if f.readable)
+
+    def __reduce__(self):
+        """Pickle the constructor arguments only, the derived attributes are recomputed"""
+        return (Register, (self.name, self.offset, self.size, self.base_address, self.fields,
+                           self.dim, self.stride))
+
+    def element(self, i: int) -> "Register":
+        """Element `i` of an array, a plain register named `name[i]`"""
+        if not 0 <= i < self.dim:
+            raise IndexError(f"{self.name}[{i}] is out of the {self.dim} elements of the array")
+        return Register(f"{self.name}[{i}]", f"0x{self.abs_offset + i * self.stride:04X}", self.size,
+                        self.base_address, self.fields)
+
+    def elements(self) -> Iterator["Register"]:
+        """The elements of an array one at a time, the register itself if it is not an array"""
+        if self.dim == 1:
+            yield self
+        else:
+            for i in range(self.dim):
+                yield self.element(i)
+
+
+@dataclass(slots=True)
+class AddressBlock:
+    """
+    An address block and its registers, in IP-XACT order.
+
+    Attributes:
+        name: Block name.
+        base_address: Base address, hex string.
+        registers: Registers in IP-XACT order.
+        range: Size of the block in bytes, `<ipxact:range>`; by default
+            the one create_address_block writes (the end of the last
+            register or array, 0x1000 at least).
+    """
+    name: str
+    base_address: str
+    registers: list[Register]
+    range: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.range is None:
+            self.range = max([0x1000] + [reg.abs_offset + reg.span for reg in self.registers])
+
+
+@dataclass(slots=True)
+class Component:
+    """
+    A component: its address blocks and the enum types of its fields.
+
+    Attributes:
+        name: Component name, also the name of the generated module.
+        blocks: Address blocks in IP-XACT order.
+        enums: Enum type name -> {value: item name}.
+        registers: Registers of every block by name; a register named like
+            one of an earlier block replaces it but keeps its position.
+        hw_input_regs: Registers with at least one hardware input field.
+        data_width: MSB of the data bus (widest register - 1).
+        addr_width: Width of the address compared by the decoder.
+    """
+    name: str
+    blocks: list[AddressBlock]
+    enums: dict[str, dict[str, str]]
+    registers: dict[str, Register] = field(init=False)
+    hw_input_regs: list[Register] = field(init=False)
+    data_width: int = field(init=False)
+    addr_width: int = 32  # will probably have an addr_width as a parameter in the future
+
+    def __post_init__(self) -> None:
+        self.registers = {}
+        for block in self.blocks:
+            for reg in block.registers:
+                self.registers[reg.name] = reg
+        self.hw_input_regs = [reg for reg in self.registers.values() if reg.hw_input_fields]
+        self.data_width = max(reg.size for reg in self.registers.values()) - 1 if self.registers else 31
+
+    @property
+    def num_regs(self) -> int:
+        """Number of registers, each element of an array counted"""
+        return sum(reg.dim for reg in self.registers.values())
+
+
+def enum_signature(values: dict[str, str]) -> tuple[tuple[str, str], ...]:
+    """Identity of an enum type: its (value, item name) pairs in value order"""
+    return tuple(sorted(values.items()))
+
+
+def enum_type(values: dict[str, str], reg_name: str, field_name: str,
+              enum_cache: dict, enum_definitions: dict) -> str:
+    """
+    Name of the enum type of a field, shared by every field of the
+    component with the same set of values.
+
+    Args:
+        values: {value: item name} of the field.
+        reg_name: Register of the field, the type is named after the
+            first field that uses it.
+        field_name: Name of the field.
+        enum_cache: Signature of the values -> type name.
+        enum_definitions: Type name -> values, filled with new types.
+
+    Returns:
+        str: Name of the enum type.
+    """
+    signature = enum_signature(values)
+    name = enum_cache.get(signature)
+    if name is None:
+        name = f"{reg_name}_{field_name}_e"
+        enum_definitions[name] = values
+        enum_cache[signature] = name
+    return name
@@ -0,0 +1,130 @@
+import os
+import json
+import shutil
+import filecmp
+import hashlib
+import importlib
+from functools import lru_cache
+from pathlib import Path
+
+# Bump when a stage starts producing different output for the same inputs
+# for a reason its source_key does not see (a dependency, the layout of
+# the entries), so entries written by older versions are not restored.
+CACHE_VERSION = 2
+
+@lru_cache(maxsize=None)
+def source_key(*modules: str) -> str:
+    """
+    Hex SHA-256 of the source files of modules, given by import name.
+
+    Pass it to stage_key with the modules a stage runs, so that an entry
+    written by an older version of the generator code is not restored.
+    Computed once per process.
+    """
+    digest = hashlib.sha256()
+    for name in modules:
+        source = Path(importlib.import_module(name).__file__).read_bytes()
+        digest.update(b'%s\0%d\0' % (name.encode('utf-8'), len(source)))
+        digest.update(source)
+    return digest.hexdigest()
+
+def stage_key(stage: str, *inputs) -> str:
+    """
+    Content hash identifying one run of a pipeline stage.
+
+    Args:
+        stage (str): Name of the stage.
+        *inputs: What the output of the stage depends on: keys of the
+                 stages it reads from, bytes, or JSON-serializable
+                 parameters (bus width, protocol, ...).
+
+    Returns:
+        str: Hex SHA-256 of the stage name, the cache version and `inputs`.
+    """
+    digest = hashlib.sha256(f"{stage}\0{CACHE_VERSION}".encode('utf-8'))
+    for value in inputs:
+        if not isinstance(value, (bytes, bytearray, memoryview)):
+            value = json.dumps(value, sort_keys=True).encode('utf-8')
+        digest.update(b'\0%d\0' % len(value))
+        digest.update(value)
+    return digest.hexdigest()
+
+class StageCache:
+    """
+    Outputs of pipeline stages stored by `stage_key`.
+
+    Each entry is a directory `<root>/<stage>/<key>` holding the files the
+    stage produced. Entries are written to a temporary directory and
+    renamed into place, so an interrupted run never leaves a partial entry.
+    Only the `keep` most recently written or restored entries of a stage
+    are kept, older ones are removed when a new one is committed.
+    """
+
+    def __init__(self, root: str | Path, keep: int = 1) -> None:
+        self.root = Path(root)
+        self.keep = keep
+
+    def path(self, stage: str, key: str) -> Path:
+        return self.root / stage / key
+
+    def has(self, stage: str, key: str) -> bool:
+        return self.path(stage, key).is_dir()
+
+    def files(self, stage: str, key: str) -> list[Path] | None:
+        """Files of an entry, None if there is no entry for `key`."""
+        entry = self.path(stage, key)
+        if not entry.is_dir():
+            return None
+        return sorted(p for p in entry.iterdir() if p.is_file())
+
+    def restore(self, stage: str, key: str, output_dir: str | Path) -> list[Path] | None:
+        """
+        Copy the files of an entry to `output_dir`. Files that already hold
+        the same content are left untouched, so their mtime only changes
+        when their content does.
+
+        Returns:
+            list[Path] | None: The files of the entry in `output_dir`, None on a cache miss.
+        """
+        files = self.files(stage, key)
+        if files is None:
+            return None
+        os.utime(self.path(stage, key))
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        restored = []
+        for src in files:
+            dst = output_dir / src.name
+            if not (dst.is_file() and filecmp.cmp(src, dst, shallow=False)):
+                shutil.copyfile(src, dst)
+            restored.append(dst)
+        return restored
+
+    def begin(self, stage: str, key: str) -> Path:
+        """Empty directory where the outputs of a new entry are written before `commit`."""
+        tmp = self.path(stage, key).with_name(f".{key}.{os.getpid()}.tmp")
+        if tmp.exists():
+            shutil.rmtree(tmp)
+        tmp.mkdir(parents=True)
+        return tmp
+
+    def commit(self, stage: str, key: str, tmp: Path) -> Path:
+        """
+        Publish a directory returned by `begin` as the entry of `key`,
+        replacing any previous one, and prune the older entries of `stage`.
+        """
+        entry = self.path(stage, key)
+        if entry.exists():
+            shutil.rmtree(entry)
+        os.replace(tmp, entry)
+        self.prune(stage, key)
+        return entry
+
+    def prune(self, stage: str, key: str) -> None:
+        """Remove the entries of `stage` but `key` and the `keep` - 1 most recently used others."""
+        # temporary directories of runs in progress start with a dot
+        others = [p for p in (self.root / stage).iterdir()
+                  if p.is_dir() and not p.name.startswith('.') and p.name != key]
+        others.sort(key=lambda p: p.stat().st_mtime_ns, reverse=True)
+        for old in others[self.keep - 1:]:
+            shutil.rmtree(old, ignore_errors=True)